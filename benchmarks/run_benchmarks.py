@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+import argparse
+from importlib.util import find_spec
+import glob
+import json
+import platform
+import re
+import sys
+import os
+import time
+
+script_dir = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+import lark
+
+from gecco_translator.ast import ASTTransformer, Contraction
+from gecco_translator.parse import get_parser
+from gecco_translator.manifest import grammar_version
+from gecco_translator.generate import GeneratorSettings, generate_export
+from gecco_translator.translators import (
+    to_tex,
+    to_sequant,
+    get_required_symmetrizations,
+)
+from gecco_translator.translators import formatting
+from gecco_translator import __version__
+
+
+def bundled_inputs() -> Dict[str, str]:
+    """Returns the export files shipped with the test suite, keyed by a stable name"""
+    tests_dir = os.path.realpath(os.path.join(script_dir, "..", "tests"))
+    inputs: Dict[str, str] = {}
+    for path in sorted(glob.glob(os.path.join(tests_dir, "*", "*.EXPORT"))):
+        name = os.path.relpath(path, tests_dir)
+        with open(path, "r") as export_file:
+            inputs[name] = export_file.read()
+
+    return inputs
+
+
+def scale_export(content: str, factor: int) -> str:
+    """Creates a larger export by repeating all contractions of the given export factor times (with renumbered
+    contraction IDs)"""
+    body = content[: content.rindex("[END]")]
+    blocks = re.split(r"^(?=\[CONTR\] #)", body, flags=re.MULTILINE)
+    blocks = [x for x in blocks if len(x) > 0]
+
+    scaled: List[str] = []
+    for i in range(factor * len(blocks)):
+        block = blocks[i % len(blocks)]
+        scaled.append(
+            re.sub(r"^\[CONTR\] #\s*\d+", "[CONTR] #{:9d}".format(i + 1), block)
+        )
+
+    return "".join(scaled) + "[END]\n"
+
+
+def measure(
+    function: Callable[[], Any],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Tuple[float, Any]:
+    """Executes function repeat times and returns the fastest observed wall time together with the result. If given,
+    setup is called (untimed) before every run."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+
+    return (best, result)
+
+
+def benchmark_input(content: str, repeat: int) -> Dict[str, float]:
+    parser = get_parser()
+    timings: Dict[str, float] = {}
+
+    timings["parse"], raw_tree = measure(lambda: parser.parse(content), repeat)
+    timings["transform"], contractions = measure(
+        lambda: ASTTransformer().transform(raw_tree), repeat
+    )
+
+    contraction_list: List[Contraction] = contractions
+    timings["symmetry"], _ = measure(
+        lambda: [get_required_symmetrizations(x) for x in contraction_list], repeat
+    )
+
+    # The formatting caches are process-global: the regular timings start from empty caches, while the "_warm"
+    # timings show the effect of caches that are already filled (e.g. by a previous translation)
+    for name, translator in [("to_tex", to_tex), ("to_sequant", to_sequant)]:
+        timings[name], _ = measure(
+            lambda: translator(contraction_list),
+            repeat,
+            setup=formatting.clear_caches,
+        )
+        timings[name + "_warm"], _ = measure(
+            lambda: translator(contraction_list), repeat
+        )
+
+    return timings
+
+
+def run_benchmarks(
+    scale_factors: List[int], synthetic_sizes: List[int], repeat: int, verbose: bool
+) -> Dict:
+    inputs = bundled_inputs()
+
+    cases: Dict[str, str] = dict(inputs)
+    for factor in scale_factors:
+        cases["scaled_x{}/multi_reference/icMRCC_RES2.EXPORT".format(factor)] = (
+            scale_export(inputs["multi_reference/icMRCC_RES2.EXPORT"], factor)
+        )
+
+    for n_contractions in synthetic_sizes:
+        cases["synthetic/n{}".format(n_contractions)] = generate_export(
+            GeneratorSettings(
+                n_contractions=n_contractions,
+                active_fraction=0.2,
+                n_results=4,
+                seed=0,
+            )
+        )
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, content in cases.items():
+        timings = benchmark_input(content, repeat=repeat)
+        results[name] = {
+            "size": len(content),
+            "n_contractions": content.count("[CONTR] #"),
+            "timings": timings,
+        }
+
+        if verbose:
+            print(
+                "{:<50} {}".format(
+                    name,
+                    " ".join(
+                        "{}={:.4f}s".format(stage, value)
+                        for stage, value in timings.items()
+                    ),
+                ),
+                file=sys.stderr,
+            )
+
+    return {
+        "metadata": {
+            "translator_version": __version__,
+            "grammar_version": grammar_version(),
+            "lark_version": lark.__version__,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def find_regressions(
+    current: Dict, baseline: Dict, threshold: float, min_difference: float
+) -> List[str]:
+    """Compares the current benchmark results to the given baseline and returns a description of every measurement
+    that got slower by more than the given relative threshold (and by at least min_difference seconds)
+    """
+    regressions: List[str] = []
+
+    for name, entry in current["results"].items():
+        if not name in baseline["results"]:
+            continue
+
+        reference = baseline["results"][name]["timings"]
+        for stage, value in entry["timings"].items():
+            if not stage in reference:
+                continue
+
+            allowed = reference[stage] * (1 + threshold)
+            if value > allowed and value - reference[stage] >= min_difference:
+                regressions.append(
+                    "{} [{}]: {:.4f}s vs. {:.4f}s in baseline (+{:.1f}%)".format(
+                        name,
+                        stage,
+                        value,
+                        reference[stage],
+                        100 * (value / reference[stage] - 1),
+                    )
+                )
+
+    return regressions
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description="Benchmarks parsing, transformation, symmetry analysis and translation of GeCCo export files"
+    )
+    argument_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="How often to repeat every measurement (the fastest run is reported)",
+    )
+    argument_parser.add_argument(
+        "--scale",
+        type=int,
+        nargs="*",
+        default=[4, 16],
+        help="Factors by which the largest bundled export is scaled up to create synthetic inputs",
+    )
+    argument_parser.add_argument(
+        "--synthetic",
+        type=int,
+        nargs="*",
+        default=[500, 2000],
+        help="Sizes (number of contractions) of the generated synthetic exports to benchmark",
+    )
+    argument_parser.add_argument(
+        "--output", metavar="PATH", help="Write the results in JSON format to this file"
+    )
+    argument_parser.add_argument(
+        "--baseline",
+        metavar="PATH",
+        help="Compare the results against this previously saved result file",
+    )
+    argument_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Maximum allowed relative slowdown compared to the baseline (default: 0.25, i.e. 25%%)",
+    )
+    argument_parser.add_argument(
+        "--min-difference",
+        type=float,
+        default=0.005,
+        help="Slowdowns of less than this many seconds are never considered regressions (guards against noise)",
+    )
+    argument_parser.add_argument(
+        "--quiet", action="store_true", help="Don't print results while benchmarking"
+    )
+
+    args = argument_parser.parse_args()
+
+    results = run_benchmarks(
+        scale_factors=args.scale,
+        synthetic_sizes=args.synthetic,
+        repeat=args.repeat,
+        verbose=not args.quiet,
+    )
+
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = find_regressions(
+            current=results,
+            baseline=baseline,
+            threshold=args.threshold,
+            min_difference=args.min_difference,
+        )
+
+        if len(regressions) > 0:
+            print("Performance regressions detected:", file=sys.stderr)
+            for current in regressions:
+                print("  " + current, file=sys.stderr)
+            sys.exit(1)
+
+        print("No performance regressions detected", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
 #!/usr/bin/env python3
 
-from typing import List
+from typing import (
+    Any,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Callable,
+    Optional,
+    TextIO,
+)
 
 import argparse
+from contextlib import contextmanager
 from importlib.util import find_spec
+import json
 import sys
 import os
 
@@ -11,38 +23,784 @@ if find_spec("gecco_translator") is None:
     script_dir = os.path.dirname(os.path.realpath(__file__))
     sys.path.append(os.path.join(script_dir, "..", "packages"))
 
-from gecco_translator.ast import Contraction
-from gecco_translator.parse import parse
-from gecco_translator.translators import to_tex, to_sequant
+from gecco_translator.parse import (
+    iter_contractions,
+    iter_blocks,
+    select_blocks,
+)
+from gecco_translator.block_cache import BlockCache, parse_blocks_cached
+from gecco_translator.headers import read_block_header
+from gecco_translator.compression import open_export, strip_compression_extension
+from gecco_translator.filters import (
+    ContractionFilter,
+    parse_id_ranges,
+    parse_result_signature,
+)
+from gecco_translator.diff import diff_blocks, format_diff
+from gecco_translator.filters import filter_records
+from gecco_translator.serialization import (
+    records_to_jsonl,
+    write_columnar_records,
+    serialized_format,
+    iter_serialized_records,
+)
+from gecco_translator.topology import (
+    TopologyStatistics,
+    block_topology,
+    topology_classes,
+    topology_aliases,
+)
+from gecco_translator.screening import Screening, ScreeningReport, parse_dimensions
+from gecco_translator.sharding import (
+    write_shards,
+    verify_shards,
+    index_file_name,
+    term_formatters,
+)
+from gecco_translator.workload import WorkloadStatistics
+from gecco_translator.manifest import BuildManifest, hash_file, grammar_version
+from gecco_translator.translators import (
+    records_to_tex,
+    records_to_sequant,
+    write_translation_records,
+)
+from gecco_translator.translators.symmetry import (
+    ContractionRecord,
+    as_records,
+    determine_required_symmetrizations,
+    get_required_symmetrizations,
+)
+from gecco_translator import profiling, __version__
+
+translators: Dict[str, Callable[[List[ContractionRecord]], str]] = {
+    "tex": records_to_tex,
+    "sequant": records_to_sequant,
+    "jsonl": records_to_jsonl,
+}
+
+# Formats that produce binary output and can thus only be written to files
+binary_writers: Dict[str, Callable[[Iterable[ContractionRecord], BinaryIO], None]] = {
+    "columnar": write_columnar_records,
+}
+
+file_extensions: Dict[str, str] = {
+    "tex": "tex",
+    "sequant": "sequant",
+    "jsonl": "jsonl",
+    "columnar": "columnar",
+}
+
+
+def translate(
+    records: List[ContractionRecord], format: str, factorize: bool = False
+) -> str:
+    if not format in translators:
+        raise RuntimeError("Unsupported target format '{}'".format(format))
+
+    if format == "tex" and factorize:
+        return records_to_tex(records, factorize=True)
+
+    return translators[format](records)
+
+
+def output_path(output_dir: str, export_file: str, format: str) -> str:
+    base_name = os.path.splitext(
+        os.path.basename(strip_compression_extension(export_file))
+    )[0]
+    return os.path.join(output_dir, "{}.{}".format(base_name, file_extensions[format]))
+
+
+def argument_type(parse: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Wraps the given parsing function for use as an argparse type, so that its errors are reported as usage
+    errors"""
+
+    def parse_argument(value: str) -> Any:
+        try:
+            return parse(value)
+        except ValueError as error:
+            raise argparse.ArgumentTypeError(str(error))
+
+    return parse_argument
+
+
+def build_filter(args: argparse.Namespace) -> Optional[ContractionFilter]:
+    if all(
+        x is None
+        for x in [args.result, args.tensor, args.ids, args.result_spaces, args.topology]
+    ):
+        return None
+
+    return ContractionFilter(
+        results=set(args.result) if args.result is not None else None,
+        tensors=set(args.tensor) if args.tensor is not None else None,
+        id_ranges=args.ids,
+        result_signatures=(
+            set(args.result_spaces) if args.result_spaces is not None else None
+        ),
+        topologies=set(args.topology) if args.topology is not None else None,
+    )
+
+
+# The reports of the most recent screening of every input file
+screening_reports: Dict[str, ScreeningReport] = {}
+
+
+def build_screening(args: argparse.Namespace) -> Optional[Screening]:
+    if args.dims is None and args.min_factor is None:
+        return None
+
+    return Screening(
+        dimensions=args.dims if args.dims is not None else {},
+        min_factor=args.min_factor if args.min_factor is not None else 0.0,
+    )
+
+
+# The block caches used during this run keyed by their directory
+block_caches: Dict[str, BlockCache] = {}
+
+
+def get_block_cache(args: argparse.Namespace) -> Optional[BlockCache]:
+    if args.block_cache is None:
+        return None
+
+    if not args.block_cache in block_caches:
+        block_caches[args.block_cache] = BlockCache(args.block_cache)
+
+    return block_caches[args.block_cache]
+
+
+def output_options(args: argparse.Namespace) -> str:
+    """Returns a canonical representation of all options (apart from the format) that influence the output"""
+    options = {
+        "result": args.result,
+        "tensor": args.tensor,
+        "ids": args.ids,
+        "result_spaces": args.result_spaces,
+        "topology": args.topology,
+        "factorize": args.factorize or None,
+        "dims": args.dims,
+        "min_factor": args.min_factor,
+    }
+    return json.dumps(
+        {key: value for key, value in options.items() if value is not None},
+        sort_keys=True,
+    )
+
+
+@contextmanager
+def open_records(
+    path: str, args: argparse.Namespace
+) -> Iterator[Iterable[ContractionRecord]]:
+    """Lazily reads the contractions from the given export file or from a file that was previously written in one
+    of the structured formats (which doesn't have to be parsed again). Contractions read from a structured file
+    or from the block cache come with their stored symmetrizations, freshly parsed ones are paired with unknown (None)
+    symmetrizations.
+    """
+    contraction_filter = build_filter(args)
+    screening = build_screening(args)
+    if screening is not None:
+        screening_reports[path] = screening.report
+
+    if serialized_format(path) is not None:
+        records = iter_serialized_records(path)
+        if contraction_filter is not None:
+            records = filter_records(records, contraction_filter)
+        if screening is not None:
+            records = screening.screen_records(records)
+        yield records
+    else:
+        cache = get_block_cache(args)
+        with open_export(path) as stream:
+            if cache is not None:
+                yield parse_blocks_cached(
+                    select_blocks(stream, contraction_filter, screening),
+                    cache=cache,
+                    batch_size=args.max_in_flight,
+                )
+            else:
+                yield as_records(
+                    iter_contractions(
+                        stream,
+                        batch_size=args.max_in_flight,
+                        contraction_filter=contraction_filter,
+                        screening=screening,
+                    )
+                )
+
+
+def load_records(path: str, args: argparse.Namespace) -> List[ContractionRecord]:
+    with open_records(path, args) as records:
+        return list(records)
+
+
+def topology_statistics(path: str, args: argparse.Namespace) -> TopologyStatistics:
+    """Determines the topology statistics of the contractions in the given file that are selected by the filters
+    and survive the screening. For export files, only the header and arcs of every block are read."""
+    statistics = TopologyStatistics()
+
+    if serialized_format(path) is not None:
+        with open_records(path, args) as records:
+            for current, _ in records:
+                statistics.add_contraction(current)
+        return statistics
+
+    with open_export(path) as stream:
+        for block in select_blocks(stream, build_filter(args), build_screening(args)):
+            statistics.add(read_block_header(block).result, block_topology(block))
+
+    return statistics
+
+
+def stream_translation(
+    path: str, format: str, out: TextIO, args: argparse.Namespace
+) -> None:
+    """Translates the given file in bounded-memory mode, i.e. without ever holding more than the configured number
+    of contractions in memory"""
+    with open_records(path, args) as records:
+        write_translation_records(
+            records=records,
+            format=format,
+            out=out,
+            factorize=args.factorize,
+            max_buffered_terms=args.max_buffered_terms,
+        )
+
+    out.write("\n")
+
+
+def write_binary(
+    path: str, format: str, out_path: str, args: argparse.Namespace
+) -> None:
+    with open_records(path, args) as records:
+        with open(out_path, "wb") as out_file:
+            binary_writers[format](records, out_file)
+
+
+def translate_to_stdout(
+    export_files: List[str], formats: List[str], args: argparse.Namespace
+):
+    for current_file in export_files:
+        if args.bounded_memory:
+            for current_format in formats:
+                stream_translation(current_file, current_format, sys.stdout, args)
+            continue
+
+        records = load_records(current_file, args)
+
+        for current_format in formats:
+            print(
+                translate(
+                    records=records,
+                    format=current_format,
+                    factorize=args.factorize,
+                )
+            )
+
+
+def translate_to_directory(
+    export_files: List[str],
+    formats: List[str],
+    output_dir: str,
+    manifest_path: Optional[str],
+    args: argparse.Namespace,
+):
+    os.makedirs(output_dir, exist_ok=True)
+
+    options = output_options(args)
+
+    # This script assembles the output files as well, so changing it also invalidates them
+    manifest = (
+        BuildManifest(manifest_path, extra_sources=[os.path.realpath(__file__)])
+        if manifest_path is not None
+        else None
+    )
+
+    # Outputs are opened for writing before their input is read, so an output must never be one of the inputs
+    # (e.g. when retranslating a previously written jsonl file into the same directory)
+    input_paths: Dict[str, str] = {os.path.realpath(x): x for x in export_files}
+
+    seen_outputs: Dict[str, str] = {}
+    skipped: List[str] = []
+    rebuilt: List[str] = []
+
+    for current_file in export_files:
+        input_path = os.path.abspath(current_file)
+
+        stale_outputs: Dict[str, str] = {}
+        input_hash = hash_file(input_path) if manifest is not None else ""
+        for current_format in formats:
+            out_path = os.path.abspath(
+                output_path(output_dir, current_file, current_format)
+            )
+            if args.shard_by_result:
+                # The shards are written into a directory of their own, which is represented by its index file
+                out_path = os.path.join(out_path + ".shards", index_file_name)
+
+            if out_path in seen_outputs:
+                raise RuntimeError(
+                    "'{}' and '{}' would both be translated to '{}'".format(
+                        seen_outputs[out_path], current_file, out_path
+                    )
+                )
+            seen_outputs[out_path] = current_file
+
+            if os.path.realpath(out_path) in input_paths:
+                raise RuntimeError(
+                    "Translating '{}' would overwrite the input file '{}'".format(
+                        current_file, input_paths[os.path.realpath(out_path)]
+                    )
+                )
+
+            if manifest is not None:
+                reason = manifest.stale_reason(
+                    output_path=out_path,
+                    input_path=input_path,
+                    input_hash=input_hash,
+                    format=current_format,
+                    options=options,
+                )
+                if reason is None and args.shard_by_result:
+                    # The index doesn't change if individual shards are modified or deleted
+                    reason = verify_shards(os.path.dirname(out_path))
+                if reason is None:
+                    skipped.append(out_path)
+                    continue
+
+                rebuilt.append("{} ({})".format(out_path, reason))
+
+            stale_outputs[current_format] = out_path
+
+        if len(stale_outputs) == 0:
+            continue
+
+        for current_format in [x for x in stale_outputs if x in binary_writers]:
+            out_path = stale_outputs.pop(current_format)
+            write_binary(input_path, current_format, out_path, args)
+
+            if manifest is not None:
+                manifest.record(
+                    output_path=out_path,
+                    input_path=input_path,
+                    input_hash=input_hash,
+                    format=current_format,
+                    options=options,
+                )
+
+        if len(stale_outputs) == 0:
+            continue
+
+        if args.bounded_memory:
+            for current_format, out_path in stale_outputs.items():
+                if args.shard_by_result:
+                    with open_records(input_path, args) as record_stream:
+                        write_shards(
+                            records=record_stream,
+                            directory=os.path.dirname(out_path),
+                            format=current_format,
+                            max_workers=args.shard_workers,
+                            max_buffered_terms=args.max_buffered_terms,
+                        )
+                else:
+                    with open(out_path, "w") as out_file:
+                        stream_translation(input_path, current_format, out_file, args)
+
+                if manifest is not None:
+                    manifest.record(
+                        output_path=out_path,
+                        input_path=input_path,
+                        input_hash=input_hash,
+                        format=current_format,
+                        options=options,
+                    )
+            continue
+
+        records = load_records(input_path, args)
+
+        for current_format, out_path in stale_outputs.items():
+            if args.shard_by_result:
+                write_shards(
+                    records=records,
+                    directory=os.path.dirname(out_path),
+                    format=current_format,
+                    max_workers=args.shard_workers,
+                )
+            else:
+                translation = translate(
+                    records=records,
+                    format=current_format,
+                    factorize=args.factorize,
+                )
+
+                with profiling.stage("writing"):
+                    with open(out_path, "w") as out_file:
+                        out_file.write(translation)
+                        out_file.write("\n")
+
+            if manifest is not None:
+                manifest.record(
+                    output_path=out_path,
+                    input_path=input_path,
+                    input_hash=input_hash,
+                    format=current_format,
+                    options=options,
+                )
+
+    if manifest is not None:
+        manifest.save()
+
+        for current in rebuilt:
+            print("Rebuilt {}".format(current), file=sys.stderr)
+        print(
+            "Skipped {} up-to-date output(s)".format(len(skipped)),
+            file=sys.stderr,
+        )
+        for current in skipped:
+            print("  {}".format(current), file=sys.stderr)
+
+
+def diff_main(argv: List[str]):
+    argument_parser = argparse.ArgumentParser(
+        prog="{} diff".format(os.path.basename(sys.argv[0])),
+        description="Semantically compares two GeCCo export files and reports added, removed and changed terms",
+    )
+    argument_parser.add_argument("old_file", help="Path to the old export file")
+    argument_parser.add_argument("new_file", help="Path to the new export file")
+    argument_parser.add_argument(
+        "--format",
+        choices=["tex", "sequant"],
+        default="tex",
+        help="The format in which terms are reported",
+    )
+    argument_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1e-10,
+        help="Factors differing by less than this are considered equal",
+    )
+
+    args = argument_parser.parse_args(argv)
+
+    # Only blocks that differ between both files are parsed
+    with open_export(args.old_file) as old_stream, open_export(
+        args.new_file
+    ) as new_stream:
+        diff = diff_blocks(
+            old=iter_blocks(old_stream),
+            new=iter_blocks(new_stream),
+            tolerance=args.tolerance,
+        )
+
+    print(format_diff(diff, format=args.format))
+
+    # Mimic the exit status of the diff utility
+    sys.exit(0 if diff.is_empty() else 1)
+
+
+def workload_statistics(path: str, symmetrizers: bool) -> WorkloadStatistics:
+    """Determines the workload statistics of the given file. Unless the symmetrizer sizes are requested, only the
+    header of every block of an export file is read."""
+    statistics = WorkloadStatistics(symmetrizers=symmetrizers)
+
+    if serialized_format(path) is not None:
+        # Symmetrizations stored in the file don't have to be determined again
+        for current, known in iter_serialized_records(path):
+            statistics.add(current)
+            if symmetrizers:
+                statistics.add_symmetrizations(
+                    *get_required_symmetrizations(current, known)
+                )
+        return statistics
+
+    with open_export(path) as stream:
+        if symmetrizers:
+            for current in iter_contractions(stream):
+                statistics.add(current)
+                statistics.add_symmetrizations(
+                    *determine_required_symmetrizations(current)
+                )
+        else:
+            for block in iter_blocks(stream):
+                statistics.add_header(read_block_header(block))
+
+    return statistics
+
+
+def stats_main(argv: List[str]):
+    argument_parser = argparse.ArgumentParser(
+        prog="{} stats".format(os.path.basename(sys.argv[0])),
+        description="Reports statistics about the workload described by GeCCo export files (term counts per result, tensor and index-space histograms, factors) in a single streaming pass that only reads the header of every term",
+    )
+    argument_parser.add_argument(
+        "export_files",
+        metavar="export_file",
+        nargs="+",
+        help="Path to the export file (or a file written in one of the structured formats)",
+    )
+    argument_parser.add_argument(
+        "--format",
+        choices=["table", "json"],
+        default="table",
+        help="The format in which the statistics are reported",
+    )
+    argument_parser.add_argument(
+        "--symmetrizers",
+        action="store_true",
+        help="Also report the sizes of the required symmetrizers (requires parsing and analyzing every term)",
+    )
+
+    args = argument_parser.parse_args(argv)
+
+    results: Dict[str, WorkloadStatistics] = {
+        path: workload_statistics(path, symmetrizers=args.symmetrizers)
+        for path in args.export_files
+    }
+
+    if args.format == "json":
+        json.dump(
+            {path: x.to_json() for path, x in results.items()}, sys.stdout, indent=2
+        )
+        print()
+    else:
+        print(
+            "\n\n".join(
+                "{}\n{}".format(path, x.report()) for path, x in results.items()
+            )
+        )
+
+
+commands: Dict[str, Callable[[List[str]], None]] = {
+    "diff": diff_main,
+    "stats": stats_main,
+}
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in commands:
+        return commands[sys.argv[1]](sys.argv[2:])
+
     argument_parser = argparse.ArgumentParser(
-        description="A script capable of parsing an export file generated via GeCCo and translating it to different formats"
+        description="A script capable of parsing an export file generated via GeCCo and translating it to different formats",
+        epilog="Further commands: {} (use '<command> --help' for details)".format(
+            ", ".join(commands.keys())
+        ),
     )
     argument_parser.add_argument(
-        "export_file", help="Path to the GeCCo export file that shall be translated"
+        "export_files",
+        metavar="export_file",
+        nargs="+",
+        help="Path to the GeCCo export file(s) that shall be translated (may be compressed with gzip, bz2 or xz). Files previously written in the jsonl or columnar format are read without parsing.",
     )
     argument_parser.add_argument(
         "--format",
-        choices=["tex", "sequant"],
-        default="tex",
-        help="The desired output format",
+        choices=list(translators.keys()) + list(binary_writers.keys()),
+        action="append",
+        help="The desired output format (may be given multiple times; defaults to tex)",
+    )
+    argument_parser.add_argument(
+        "--output-dir",
+        help="Write the translations into this directory (one file per export file and format) instead of printing them",
+    )
+    argument_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only retranslate export files whose contents or translation settings changed since the last run (requires --output-dir)",
+    )
+    argument_parser.add_argument(
+        "--manifest",
+        help="Path to the manifest file used in incremental mode (defaults to a file inside the output directory)",
+    )
+    argument_parser.add_argument(
+        "--shard-by-result",
+        action="store_true",
+        help="Write the terms of every result tensor into a separate file, together with an index file listing all shards (requires --output-dir)",
+    )
+    argument_parser.add_argument(
+        "--shard-workers",
+        type=int,
+        metavar="N",
+        help="The number of threads used to write the shards (defaults to a number based on the CPU count)",
+    )
+    argument_parser.add_argument(
+        "--result",
+        metavar="NAME",
+        action="append",
+        help="Only translate contractions contributing to a result tensor of this name (may be given multiple times)",
+    )
+    argument_parser.add_argument(
+        "--tensor",
+        metavar="NAME",
+        action="append",
+        help="Only translate contractions containing a tensor of this name (may be given multiple times)",
+    )
+    argument_parser.add_argument(
+        "--ids",
+        metavar="RANGES",
+        type=argument_type(parse_id_ranges),
+        help="Only translate contractions with these IDs (e.g. '1-10,15')",
+    )
+    argument_parser.add_argument(
+        "--result-spaces",
+        metavar="SIGNATURE",
+        action="append",
+        type=argument_type(parse_result_signature),
+        help="Only translate contractions whose result has this index-space signature, e.g. 'PP,HH' (may be given multiple times)",
+    )
+    argument_parser.add_argument(
+        "--topology",
+        choices=topology_classes + list(topology_aliases.keys()),
+        action="append",
+        help="Only translate contractions of this topology class, e.g. 'connected' to prune disconnected terms (may be given multiple times)",
+    )
+    argument_parser.add_argument(
+        "--factorize",
+        action="store_true",
+        help="Write disconnected terms as products of their connected parts (TeX output only)",
+    )
+    argument_parser.add_argument(
+        "--topology-stats",
+        action="store_true",
+        help="Print the number of connected, linked and unlinked terms per result tensor to stderr",
+    )
+    argument_parser.add_argument(
+        "--dims",
+        metavar="SPACES",
+        type=argument_type(parse_dimensions),
+        help="Dimensions of the index spaces, e.g. 'H=10,P=100,V=0'. Terms involving an empty space are dropped before they are parsed.",
+    )
+    argument_parser.add_argument(
+        "--min-factor",
+        type=float,
+        metavar="THRESHOLD",
+        help="Drop terms whose factor is smaller than this in magnitude",
+    )
+    argument_parser.add_argument(
+        "--block-cache",
+        metavar="DIR",
+        help="Directory of a cache of parsed contraction blocks. Only blocks that are not in the cache yet (e.g. the terms that changed since a previous version of the export) are parsed and analyzed.",
+    )
+    argument_parser.add_argument(
+        "--bounded-memory",
+        action="store_true",
+        help="Stream the export through parsing, translation and output instead of keeping all contractions in memory",
+    )
+    argument_parser.add_argument(
+        "--max-buffered-terms",
+        type=int,
+        default=65536,
+        metavar="N",
+        help="The maximum number of formatted terms held in memory in bounded-memory mode while grouping terms by their result tensor (for SeQuant output and --shard-by-result). Further terms are spilled to temporary files (default: 65536)",
+    )
+    argument_parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=64,
+        metavar="N",
+        help="The maximum number of contractions held in memory at once in bounded-memory mode (default: 64)",
+    )
+    argument_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Measure the time and the net change in allocated memory blocks of the individual translation stages and print a report to stderr",
+    )
+    argument_parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="Write the profiling data in JSON format to the given file (implies --profile)",
+    )
+    argument_parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also determine the peak memory usage of every stage via tracemalloc (implies --profile; slow)",
     )
 
     args = argument_parser.parse_args()
 
-    with open(args.export_file, "r") as export_file:
-        contents = export_file.read()
+    if args.max_in_flight < 1:
+        argument_parser.error("--max-in-flight must be at least 1")
+    if args.max_buffered_terms < 1:
+        argument_parser.error("--max-buffered-terms must be at least 1")
+    if args.shard_workers is not None and args.shard_workers < 1:
+        argument_parser.error("--shard-workers must be at least 1")
 
-    contractions: List[Contraction] = parse(contents)
+    if args.profile or args.profile_json is not None or args.trace_memory:
+        with profiling.profile(
+            profiling.Profiler(trace_memory=args.trace_memory)
+        ) as profiler:
+            profiler.metadata = {
+                "translator_version": __version__,
+                "grammar_version": grammar_version(),
+                "export_files": args.export_files,
+                "formats": args.format if args.format is not None else ["tex"],
+            }
+            run(args=args, argument_parser=argument_parser)
 
-    if args.format == "tex":
-        print(to_tex(contractions=contractions))
-    elif args.format == "sequant":
-        print(to_sequant(contractions=contractions))
+        print(profiler.report(), file=sys.stderr)
+        if args.profile_json is not None:
+            with open(args.profile_json, "w") as json_file:
+                json_file.write(profiler.to_json())
     else:
-        raise RuntimeError("Unsupported target format '{}'".format(args.format))
+        run(args=args, argument_parser=argument_parser)
+
+
+def run(args: argparse.Namespace, argument_parser: argparse.ArgumentParser):
+    formats: List[str] = args.format if args.format is not None else ["tex"]
+    # Remove duplicates while retaining order
+    formats = list(dict.fromkeys(formats))
+
+    if args.shard_by_result and any(not x in term_formatters for x in formats):
+        argument_parser.error(
+            "--shard-by-result only supports the formats {}".format(
+                ", ".join(term_formatters.keys())
+            )
+        )
+
+    if args.factorize and args.shard_by_result:
+        argument_parser.error("--factorize can't be combined with --shard-by-result")
+
+    if args.topology_stats:
+        for current_file in args.export_files:
+            print("Topology of {}:".format(current_file), file=sys.stderr)
+            print(topology_statistics(current_file, args).report(), file=sys.stderr)
+
+    if args.output_dir is None:
+        if args.incremental or args.manifest is not None:
+            argument_parser.error("--incremental and --manifest require --output-dir")
+        if args.shard_by_result:
+            argument_parser.error("--shard-by-result requires --output-dir")
+
+        if any(x in binary_writers for x in formats):
+            argument_parser.error(
+                "Binary formats ({}) require --output-dir".format(
+                    ", ".join(binary_writers.keys())
+                )
+            )
+
+        translate_to_stdout(export_files=args.export_files, formats=formats, args=args)
+    else:
+        manifest_path: Optional[str] = None
+        if args.incremental:
+            manifest_path = (
+                args.manifest
+                if args.manifest is not None
+                else os.path.join(args.output_dir, ".gecco_translator_manifest.json")
+            )
+        elif args.manifest is not None:
+            argument_parser.error("--manifest requires --incremental")
+
+        translate_to_directory(
+            export_files=args.export_files,
+            formats=formats,
+            output_dir=args.output_dir,
+            manifest_path=manifest_path,
+            args=args,
+        )
+
+    for cache in block_caches.values():
+        print(cache.summary(), file=sys.stderr)
+
+    for path, report in screening_reports.items():
+        print("Screening of {}:".format(path), file=sys.stderr)
+        print(report.summary(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import argparse
+from importlib.util import find_spec
+import sys
+import os
+
+if find_spec("gecco_translator") is None:
+    script_dir = os.path.dirname(os.path.realpath(__file__))
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.generate import GeneratorSettings, write_export, generate_export
+from gecco_translator.parse import parse
+
+
+def main():
+    defaults = GeneratorSettings()
+
+    argument_parser = argparse.ArgumentParser(
+        description="Generates synthetic (but valid) GeCCo export files of arbitrary size for scalability testing"
+    )
+    argument_parser.add_argument(
+        "--contractions",
+        type=int,
+        default=defaults.n_contractions,
+        help="The number of contractions (terms) to generate",
+    )
+    argument_parser.add_argument(
+        "--min-vertices",
+        type=int,
+        default=defaults.min_vertices,
+        help="The minimum number of vertices per term",
+    )
+    argument_parser.add_argument(
+        "--max-vertices",
+        type=int,
+        default=defaults.max_vertices,
+        help="The maximum number of vertices per term",
+    )
+    argument_parser.add_argument(
+        "--max-rank",
+        type=int,
+        default=defaults.max_rank,
+        help="The maximum number of creators (and annihilators) per vertex",
+    )
+    argument_parser.add_argument(
+        "--active-fraction",
+        type=float,
+        default=defaults.active_fraction,
+        help="The probability for an index to belong to the active space",
+    )
+    argument_parser.add_argument(
+        "--results",
+        type=int,
+        default=defaults.n_results,
+        help="The number of distinct result tensors",
+    )
+    argument_parser.add_argument(
+        "--disconnected-fraction",
+        type=float,
+        default=defaults.disconnected_fraction,
+        help="The probability for a term to not be explicitly constructed as a connected term",
+    )
+    argument_parser.add_argument(
+        "--seed",
+        type=int,
+        default=defaults.seed,
+        help="The seed for the random number generator (the output is deterministic for a given seed)",
+    )
+    argument_parser.add_argument(
+        "--output", help="Path to the file to write to (defaults to stdout)"
+    )
+    argument_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Parse the generated export before writing it out (requires keeping it in memory)",
+    )
+
+    args = argument_parser.parse_args()
+
+    if args.max_rank < 1:
+        argument_parser.error("--max-rank must be at least 1")
+    if args.min_vertices < 1 or args.max_vertices < args.min_vertices:
+        argument_parser.error("Require 1 <= --min-vertices <= --max-vertices")
+
+    settings = GeneratorSettings(
+        n_contractions=args.contractions,
+        min_vertices=args.min_vertices,
+        max_vertices=args.max_vertices,
+        max_rank=args.max_rank,
+        active_fraction=args.active_fraction,
+        n_results=args.results,
+        disconnected_fraction=args.disconnected_fraction,
+        seed=args.seed,
+    )
+
+    if args.verify:
+        contents = generate_export(settings)
+        parse(contents)
+
+        if args.output is None:
+            sys.stdout.write(contents)
+        else:
+            with open(args.output, "w") as output_file:
+                output_file.write(contents)
+    elif args.output is None:
+        write_export(sys.stdout, settings)
+    else:
+        with open(args.output, "w") as output_file:
+            write_export(output_file, settings)
+
+
+if __name__ == "__main__":
+    main()
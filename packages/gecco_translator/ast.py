@@ -63,13 +63,6 @@ class Arc:
     contracted_spaces: IndexSpaces
 
 
-@dataclass
-class ExternalArc:
-    origin_vertex_idx: int
-    result_super_vertex: int
-    indices: IndexSpaces
-
-
 @dataclass
 class Contraction:
     id: int
@@ -77,7 +70,8 @@ class Contraction:
     result: TensorElement
     tensors: List[TensorElement]
     contractions: List[Arc]
-    external_contractions: List[ExternalArc]
+    # External lines are represented as arcs from a vertex of the term (first) to a vertex of the result (second)
+    external_contractions: List[Arc]
     contraction_indices: List[Index]
     external_indices: List[Index]
 
@@ -157,7 +151,7 @@ class ASTTransformer(Transformer):
             Tuple[int, int],
             List[OperatorVertex],
             List[Arc],
-            List[ExternalArc],
+            List[Arc],
             List[Index],
             List[Index],
         ],
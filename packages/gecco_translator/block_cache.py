@@ -0,0 +1,170 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+import dataclasses
+import hashlib
+import os
+import pickle
+
+from . import ast, parse
+from .ast import Contraction
+from .parse import get_parser, parse_contractions, block_start_tag, end_tag
+from .manifest import grammar_version, source_version
+from .translators import symmetry
+from .translators.symmetry import (
+    ContractionRecord,
+    Symmetrizations,
+    get_required_symmetrizations,
+)
+from gecco_translator import profiling
+
+BLOCK_CACHE_FORMAT_VERSION = 1
+
+# The modules that determine the contents of the cache entries (the parsed contractions and their symmetrizations)
+cached_modules = [ast, parse, symmetry]
+
+
+def block_id(block: str) -> int:
+    """Reads the (0-based) ID of the contraction described by the given block"""
+    return int(block[len(block_start_tag) : block.index("\n")]) - 1
+
+
+def block_hash(block: str, salt: bytes = b"") -> str:
+    """Hashes the text of the given block without its leading "[CONTR] #" line, so that blocks that only differ in
+    their ID have the same hash"""
+    hasher = hashlib.sha256(salt)
+    hasher.update(block[block.index("\n") + 1 :].encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+class BlockCache:
+    """A content-addressed on-disk cache of parsed contraction blocks. Blocks are identified by the hash of their
+    text without the leading "[CONTR] #" line, so that blocks that only moved within an export (changing their ID)
+    are still found. Every entry holds the parsed contraction together with its required symmetrizations. Entries
+    are pickled, so the cache directory must only be shared with trusted parties."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        # Entries become invalid whenever the grammar, the AST or the symmetry analysis might have changed
+        self._salt = "{}\n{}\n{}\n".format(
+            BLOCK_CACHE_FORMAT_VERSION,
+            source_version(cached_modules),
+            grammar_version(),
+        ).encode("utf-8")
+
+    def key(self, block: str) -> str:
+        return block_hash(block, salt=self._salt)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".pickle")
+
+    def lookup(self, key: str) -> Optional[Tuple[Contraction, Symmetrizations]]:
+        """Returns the entry of the given key or None if there is no (usable) entry. The cache is best-effort, so
+        entries that can't be read (e.g. because a write was interrupted or the entry stems from incompatible
+        sources) are treated as misses and removed."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                contraction, symmetrizations = pickle.load(entry_file)
+            if not isinstance(contraction, Contraction) or len(symmetrizations) != 2:
+                raise ValueError("Malformed block cache entry")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (
+            pickle.UnpicklingError,
+            EOFError,
+            AttributeError,
+            ImportError,
+            IndexError,
+            TypeError,
+            ValueError,
+        ):
+            self.misses += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        self.hits += 1
+        return contraction, symmetrizations
+
+    def store(
+        self, key: str, contraction: Contraction, symmetrizations: Symmetrizations
+    ) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so that concurrent readers never see an incomplete entry
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as entry_file:
+            pickle.dump(
+                (contraction, symmetrizations),
+                entry_file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, path)
+
+    def summary(self) -> str:
+        return "Block cache: {} hit(s), {} miss(es)".format(self.hits, self.misses)
+
+
+def resolve_pending(
+    pending: List[Tuple[str, str, Optional[ContractionRecord]]], cache: BlockCache
+) -> List[ContractionRecord]:
+    """Parses the pending blocks that were not found in the cache (all at once), adds them to the cache and returns
+    the contractions of all pending blocks in order, together with their symmetrizations
+    """
+    misses = [(key, block) for key, block, cached in pending if cached is None]
+    parsed: List[ContractionRecord] = []
+    if len(misses) > 0:
+        with profiling.stage("grammar compilation"):
+            parser = get_parser()
+
+        contractions = parse_contractions(
+            parser, "".join([x for _, x in misses] + [end_tag + "\n"])
+        )
+        assert len(contractions) == len(misses)
+
+        for (key, _), contraction in zip(misses, contractions):
+            symmetrizations = get_required_symmetrizations(contraction)
+            cache.store(key, contraction, symmetrizations)
+            parsed.append((contraction, symmetrizations))
+
+    parsed_iter = iter(parsed)
+
+    return [x if x is not None else next(parsed_iter) for _, _, x in pending]
+
+
+def parse_blocks_cached(
+    blocks: Iterable[str], cache: BlockCache, batch_size: int = 64
+) -> Iterator[ContractionRecord]:
+    """Like parse.parse_blocks, but only parses (and determines the symmetrizations of) blocks that are not in the
+    given cache yet. Newly parsed blocks are added to the cache. Every contraction is yielded together with its
+    symmetrizations (so that they don't have to be determined again), in the order of their blocks. At most
+    batch_size blocks are held back at a time."""
+    # Blocks in order together with their key and (if cached) their record
+    pending: List[Tuple[str, str, Optional[ContractionRecord]]] = []
+
+    for block in blocks:
+        key = cache.key(block)
+        with profiling.stage("block cache lookup"):
+            entry = cache.lookup(key)
+
+        cached: Optional[ContractionRecord] = None
+        if entry is not None:
+            contraction, symmetrizations = entry
+            # The cached contraction might stem from a block with a different ID
+            cached = (
+                dataclasses.replace(contraction, id=block_id(block)),
+                symmetrizations,
+            )
+
+        pending.append((key, block, cached))
+        if len(pending) >= batch_size:
+            yield from resolve_pending(pending, cache)
+            pending = []
+
+    yield from resolve_pending(pending, cache)
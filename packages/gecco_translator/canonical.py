@@ -0,0 +1,130 @@
+from typing import Dict, List, Sequence, Set, Tuple
+from itertools import permutations, product
+import hashlib
+import math
+
+from .ast import Contraction, Index, IndexGroup, TensorElement
+
+# Maximum number of tensor orderings that are tried in order to find the canonical form of a contraction
+max_orderings = 5040
+
+# An index label is (space, id) as two indices with the same label denote the same index
+Label = Tuple[int, int]
+
+
+def index_label(index: Index) -> Label:
+    return (index.space, index.id)
+
+
+def result_labels(contraction: Contraction) -> Set[Label]:
+    return set(
+        index_label(x)
+        for group in contraction.result.vertex_indices
+        for x in group.creators + group.annihilators
+    )
+
+
+def slot_key(index: Index, externals: Set[Label]) -> Tuple:
+    # External indices keep their label while dummy indices are only characterized by their space
+    label = index_label(index)
+    if label in externals:
+        return ("x", index.space, index.id)
+
+    return ("d", index.space)
+
+
+def group_key(group: IndexGroup, externals: Set[Label]) -> Tuple:
+    return (
+        tuple(slot_key(x, externals) for x in group.creators),
+        tuple(slot_key(x, externals) for x in group.annihilators),
+    )
+
+
+def invariant_tensor_key(tensor: TensorElement, externals: Set[Label]) -> Tuple:
+    """A key describing the tensor that doesn't depend on the labels of the dummy indices"""
+    return (
+        tensor.name,
+        tensor.transposed,
+        tuple(group_key(x, externals) for x in tensor.vertex_indices),
+    )
+
+
+def relabeled_key(tensors: Sequence[TensorElement], externals: Set[Label]) -> Tuple:
+    """Builds a key for the given (ordered) tensors in which dummy indices are labeled by their first appearance"""
+    dummy_labels: Dict[Label, int] = {}
+
+    def relabel(index: Index) -> Tuple:
+        label = index_label(index)
+        if label in externals:
+            return ("x", index.space, index.id)
+        if not label in dummy_labels:
+            dummy_labels[label] = len(dummy_labels)
+        return ("d", index.space, dummy_labels[label])
+
+    return tuple(
+        (
+            tensor.name,
+            tensor.transposed,
+            tuple(
+                (
+                    tuple(relabel(x) for x in group.creators),
+                    tuple(relabel(x) for x in group.annihilators),
+                )
+                for group in tensor.vertex_indices
+            ),
+        )
+        for tensor in tensors
+    )
+
+
+def canonical_key(contraction: Contraction) -> Tuple:
+    """Computes a key identifying the given contraction irrespective of its ID, its factor, the order of its tensors
+    and the labels of its dummy (contracted) indices. Equivalent contractions yield the same key.
+    """
+    externals = result_labels(contraction)
+
+    keyed = sorted(
+        ((invariant_tensor_key(x, externals), x) for x in contraction.tensors),
+        key=lambda x: x[0],
+    )
+
+    # Tensors with identical invariant keys can only be told apart by the way they are connected, so all relative
+    # orders of such tensors have to be considered and the smallest resulting key is chosen
+    tied_groups: List[List[TensorElement]] = []
+    for i, (key, tensor) in enumerate(keyed):
+        if i > 0 and keyed[i - 1][0] == key:
+            tied_groups[-1].append(tensor)
+        else:
+            tied_groups.append([tensor])
+
+    n_orderings = math.prod(math.factorial(len(x)) for x in tied_groups)
+
+    # For (unrealistically) many identical tensors, fall back to the given relative order of the tied tensors
+    if n_orderings == 1 or n_orderings > max_orderings:
+        tensors_key = relabeled_key([x[1] for x in keyed], externals)
+    else:
+        tensors_key = min(
+            relabeled_key([x for group in ordering for x in group], externals)
+            for ordering in product(*(permutations(x) for x in tied_groups))
+        )
+
+    result_key = (
+        contraction.result.name,
+        contraction.result.transposed,
+        tuple(
+            (
+                tuple(index_label(x) for x in group.creators),
+                tuple(index_label(x) for x in group.annihilators),
+            )
+            for group in contraction.result.vertex_indices
+        ),
+    )
+
+    return (result_key, tensors_key)
+
+
+def canonical_hash(contraction: Contraction) -> str:
+    """Returns a hex digest of the canonical key of the given contraction"""
+    return hashlib.blake2b(
+        repr(canonical_key(contraction)).encode("utf-8"), digest_size=16
+    ).hexdigest()
@@ -0,0 +1,78 @@
+from typing import BinaryIO, Dict, Optional, TextIO
+import bz2
+import gzip
+import io
+import lzma
+
+# Magic bytes at the beginning of files compressed in the respective format
+magic_bytes: Dict[str, bytes] = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+}
+
+# File name extensions of compressed files (that are not part of the actual file name)
+compression_extensions = [".gz", ".bz2", ".xz"]
+
+
+def detect_compression(header: bytes) -> Optional[str]:
+    """Determines the compression format based on the first bytes of a file. Returns None for uncompressed data."""
+    for format, magic in magic_bytes.items():
+        if header.startswith(magic):
+            return format
+
+    return None
+
+
+class _ExportStream(io.TextIOWrapper):
+    """A text stream that additionally closes the raw stream underneath it when it is closed (the decompressors don't
+    close the file objects they are given)"""
+
+    def __init__(self, buffer: BinaryIO, raw: BinaryIO):
+        super().__init__(buffer)  # type: ignore
+        self._raw = raw
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def open_export_stream(stream: BinaryIO) -> TextIO:
+    """Wraps the given binary stream into a text stream, transparently decompressing its contents if they are
+    compressed with gzip, bz2 or xz. Decompression happens on the fly while reading from the returned stream.
+    Closing the returned stream also closes the given one.
+    """
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)  # type: ignore
+
+    # peek may return more or (for very short streams) fewer bytes than requested
+    header: bytes = stream.peek(6)[:6]  # type: ignore
+    format = detect_compression(header)
+
+    decompressed: BinaryIO
+    if format == "gzip":
+        decompressed = gzip.GzipFile(fileobj=stream, mode="rb")  # type: ignore
+    elif format == "bz2":
+        decompressed = bz2.BZ2File(stream, mode="rb")  # type: ignore
+    elif format == "xz":
+        decompressed = lzma.LZMAFile(stream, mode="rb")  # type: ignore
+    else:
+        assert format is None
+        decompressed = stream
+
+    return _ExportStream(decompressed, stream)
+
+
+def open_export(path: str) -> TextIO:
+    """Opens the export file at the given path for reading, transparently decompressing it if necessary"""
+    return open_export_stream(open(path, "rb"))
+
+
+def strip_compression_extension(path: str) -> str:
+    for extension in compression_extensions:
+        if path.endswith(extension):
+            return path[: -len(extension)]
+
+    return path
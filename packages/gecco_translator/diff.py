@@ -0,0 +1,204 @@
+from typing import Counter, Dict, Iterable, List, Set, Tuple
+from dataclasses import astuple, dataclass, field, replace
+import collections
+
+from .ast import Contraction
+from .block_cache import block_hash
+from .canonical import canonical_hash
+from .headers import read_block_header
+from .parse import parse_blocks
+from .translators.tex import contraction_to_tex
+from .translators.sequant import contraction_to_sequant, tensor_to_sequant
+
+
+@dataclass
+class FactorChange:
+    old: Contraction
+    new: Contraction
+
+
+@dataclass
+class ExportDiff:
+    added: List[Contraction] = field(default_factory=list)
+    removed: List[Contraction] = field(default_factory=list)
+    changed: List[FactorChange] = field(default_factory=list)
+    n_unchanged: int = 0
+
+    def is_empty(self) -> bool:
+        return (
+            len(self.added) == 0 and len(self.removed) == 0 and len(self.changed) == 0
+        )
+
+
+def group_terms(contractions: Iterable[Contraction]) -> Dict[str, Contraction]:
+    """Groups the given contractions by their canonical hash. Equivalent contractions are merged into a single
+    representative whose factor is the sum of the individual factors."""
+    grouped: Dict[str, Contraction] = {}
+    for current in contractions:
+        key = canonical_hash(current)
+        if key in grouped:
+            grouped[key] = replace(
+                grouped[key], factor=grouped[key].factor + current.factor
+            )
+        else:
+            grouped[key] = current
+
+    return grouped
+
+
+def diff_contractions(
+    old: Iterable[Contraction], new: Iterable[Contraction], tolerance: float = 1e-10
+) -> ExportDiff:
+    """Semantically compares two sets of contractions. Terms are matched via their canonical hash, so that
+    contraction IDs, the order of terms and tensors and the labels of dummy indices don't matter.
+    """
+    # Terms that cancel each other are considered to be absent
+    old_terms = {
+        key: x for key, x in group_terms(old).items() if abs(x.factor) > tolerance
+    }
+    new_terms = {
+        key: x for key, x in group_terms(new).items() if abs(x.factor) > tolerance
+    }
+
+    diff = ExportDiff()
+
+    for key, current in old_terms.items():
+        counterpart = new_terms.get(key)
+        if counterpart is None:
+            diff.removed.append(current)
+        elif abs(current.factor - counterpart.factor) > tolerance:
+            diff.changed.append(FactorChange(old=current, new=counterpart))
+        else:
+            diff.n_unchanged += 1
+
+    for key, current in new_terms.items():
+        if not key in old_terms:
+            diff.added.append(current)
+
+    return diff
+
+
+def block_signature(block: str) -> Tuple:
+    """A key derived from the header of the given block that is identical for all equivalent contractions (but not
+    only for those): the result and the multiset of vertices, including their index spaces"""
+    header = read_block_header(block)
+
+    return (
+        header.result,
+        header.result_transposed,
+        tuple(astuple(x) for x in header.result_spaces),
+        tuple(sorted(astuple(x) for x in header.vertices)),
+    )
+
+
+def diff_blocks(
+    old: Iterable[str],
+    new: Iterable[str],
+    tolerance: float = 1e-10,
+    batch_size: int = 64,
+) -> ExportDiff:
+    """Like diff_contractions, but compares the contraction blocks of two exports (as produced by parse.iter_blocks).
+    Blocks whose text is identical apart from their ID are paired up without being parsed. Only the remaining blocks
+    and those paired blocks that might be equivalent to one of them (as their block signatures match) are parsed and
+    compared semantically, which yields the same added, removed and changed terms as comparing all contractions.
+    """
+    old_blocks = list(old)
+    new_blocks = list(new)
+    old_hashes = [block_hash(x) for x in old_blocks]
+    new_hashes = [block_hash(x) for x in new_blocks]
+
+    old_counts = collections.Counter(old_hashes)
+    new_counts = collections.Counter(new_hashes)
+    n_paired = {key: min(n, new_counts[key]) for key, n in old_counts.items()}
+
+    def paired(hashes: List[str]) -> List[bool]:
+        # The first n_paired occurrences of every text are paired with those in the other export
+        seen: Counter[str] = collections.Counter()
+        result: List[bool] = []
+        for key in hashes:
+            result.append(seen[key] < n_paired.get(key, 0))
+            seen[key] += 1
+        return result
+
+    old_paired = paired(old_hashes)
+    new_paired = paired(new_hashes)
+
+    unpaired_signatures: Set[Tuple] = set(
+        block_signature(x)
+        for blocks, is_paired in [(old_blocks, old_paired), (new_blocks, new_paired)]
+        for x, current in zip(blocks, is_paired)
+        if not current
+    )
+
+    def selected(blocks: List[str], is_paired: List[bool]) -> List[bool]:
+        return [
+            not current or block_signature(x) in unpaired_signatures
+            for x, current in zip(blocks, is_paired)
+        ]
+
+    old_selected = selected(old_blocks, old_paired)
+    new_selected = selected(new_blocks, new_paired)
+
+    def parse_selected(blocks: List[str], is_selected: List[bool]) -> List[Contraction]:
+        remaining = [x for x, current in zip(blocks, is_selected) if current]
+        if len(remaining) == 0:
+            return []
+        return list(parse_blocks(remaining, batch_size=batch_size))
+
+    diff = diff_contractions(
+        old=parse_selected(old_blocks, old_selected),
+        new=parse_selected(new_blocks, new_selected),
+        tolerance=tolerance,
+    )
+
+    # The paired blocks that weren't parsed are unchanged. Blocks with identical texts are merged into a single term
+    # (as they are when comparing contractions), while equivalent blocks with different texts are counted separately.
+    diff.n_unchanged += len(
+        set(
+            key
+            for key, is_paired, is_selected in zip(
+                old_hashes, old_paired, old_selected
+            )
+            if is_paired and not is_selected
+        )
+    )
+
+    return diff
+
+
+def format_term(contraction: Contraction, format: str) -> str:
+    if format == "tex":
+        return contraction_to_tex(contraction).strip()
+    elif format == "sequant":
+        return "{} <- {}".format(
+            tensor_to_sequant(contraction.result),
+            contraction_to_sequant(contraction).strip(),
+        )
+    else:
+        raise RuntimeError("Unsupported target format '{}'".format(format))
+
+
+def format_diff(diff: ExportDiff, format: str = "tex") -> str:
+    """Creates a human-readable representation of the given diff in which every term is given in the selected
+    format. Added terms are prefixed with '+', removed ones with '-' and terms with a changed factor with '~'.
+    """
+    lines: List[str] = []
+
+    for current in diff.removed:
+        lines.append("- " + format_term(current, format))
+    for current in diff.added:
+        lines.append("+ " + format_term(current, format))
+    for current in diff.changed:
+        lines.append(
+            "~ {}    (factor {:g} -> {:g})".format(
+                format_term(current.new, format), current.old.factor, current.new.factor
+            )
+        )
+
+    lines.append(
+        "{} added, {} removed, {} changed, {} unchanged".format(
+            len(diff.added), len(diff.removed), len(diff.changed), diff.n_unchanged
+        )
+    )
+
+    return "\n".join(lines)
@@ -0,0 +1,168 @@
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass
+
+from .ast import Contraction, TensorElement
+from .headers import BlockHeader, read_block_header
+from .topology import block_topology, contraction_topology, expand_topology_classes
+from .translators.symmetry import ContractionRecord
+
+space_names = ["H", "P", "V"]
+
+
+def space_signature(groups: Iterable[Tuple[str, str]]) -> str:
+    """Builds a normalized index-space signature like "PP,HH" (or "P,H;,P" for tensors consisting of multiple
+    vertices) from the given (creator spaces, annihilator spaces) pairs. The order of spaces within a group is
+    irrelevant."""
+    return ";".join(
+        "{},{}".format("".join(sorted(creators)), "".join(sorted(annihilators)))
+        for creators, annihilators in groups
+    )
+
+
+def tensor_signature(tensor: TensorElement) -> str:
+    return space_signature(
+        (
+            "".join(space_names[x.space] for x in group.creators),
+            "".join(space_names[x.space] for x in group.annihilators),
+        )
+        for group in tensor.vertex_indices
+    )
+
+
+def parse_id_ranges(spec: str) -> List[Tuple[int, int]]:
+    """Parses a specification of contraction IDs like "1-10,15,20-25" (as they appear in the export file, i.e.
+    1-based) into a list of inclusive, 0-based ranges"""
+    ranges: List[Tuple[int, int]] = []
+    for current in spec.split(","):
+        parts = [x.strip() for x in current.split("-")]
+        if len(parts) > 2 or not all(x.isdigit() for x in parts):
+            raise ValueError("Invalid ID range '{}'".format(current.strip()))
+
+        first, last = int(parts[0]), int(parts[-1])
+        if first < 1 or last < first:
+            raise ValueError("Invalid ID range '{}'".format(current.strip()))
+
+        ranges.append((first - 1, last - 1))
+
+    return ranges
+
+
+def parse_result_signature(spec: str) -> str:
+    """Parses an index-space signature like "PP,HH" (or "P,H;,P" for tensors consisting of multiple vertices) and
+    returns it in normalized form (see space_signature)"""
+    groups: List[Tuple[str, str]] = []
+    for current in spec.split(";"):
+        parts = current.strip().split(",")
+        if len(parts) != 2 or not all(
+            x in space_names for part in parts for x in part.strip()
+        ):
+            raise ValueError("Invalid index-space signature '{}'".format(spec))
+
+        groups.append((parts[0].strip(), parts[1].strip()))
+
+    return space_signature(groups)
+
+
+@dataclass
+class ContractionFilter:
+    """Selects contractions based on their result tensor, the tensors they contain, their ID, the index-space
+    signature of their result and their topology class. Criteria that are None are not checked. A contraction matches
+    if it fulfills all given criteria, where a list-valued criterion is fulfilled if any of its entries matches.
+    """
+
+    results: Optional[Set[str]] = None
+    tensors: Optional[Set[str]] = None
+    # Inclusive, 0-based ranges of contraction IDs
+    id_ranges: Optional[List[Tuple[int, int]]] = None
+    result_signatures: Optional[Set[str]] = None
+    # Topology classes (or aliases thereof) as defined in the topology module
+    topologies: Optional[Set[str]] = None
+
+    def __post_init__(self):
+        if self.topologies is not None:
+            self.topologies = set(expand_topology_classes(self.topologies))
+        if self.result_signatures is not None:
+            # Normalize the signature (e.g. "HP,PP" and "PH,PP" are the same)
+            self.result_signatures = set(
+                parse_result_signature(x) for x in self.result_signatures
+            )
+
+    def _matches(
+        self, id: int, result: str, tensors: Iterable[str], signature: str
+    ) -> bool:
+        if self.results is not None and not result in self.results:
+            return False
+        if self.id_ranges is not None and not any(
+            first <= id <= last for first, last in self.id_ranges
+        ):
+            return False
+        if self.tensors is not None and not any(x in self.tensors for x in tensors):
+            return False
+        if (
+            self.result_signatures is not None
+            and not signature in self.result_signatures
+        ):
+            return False
+
+        return True
+
+    def matches_header(self, header: BlockHeader) -> bool:
+        return self._matches(
+            id=header.id,
+            result=header.result,
+            tensors=(x.name for x in header.vertices),
+            signature=space_signature(
+                (x.creator_spaces, x.annihilator_spaces) for x in header.result_spaces
+            ),
+        )
+
+    def matches_block(self, block: str) -> bool:
+        if not self.matches_header(read_block_header(block)):
+            return False
+
+        # The topology can be determined from the arcs, which aren't part of the header
+        return (
+            self.topologies is None
+            or block_topology(block).classification in self.topologies
+        )
+
+    def matches(self, contraction: Contraction) -> bool:
+        if not self._matches(
+            id=contraction.id,
+            result=contraction.result.name,
+            tensors=(x.name for x in contraction.tensors),
+            signature=tensor_signature(contraction.result),
+        ):
+            return False
+
+        return (
+            self.topologies is None
+            or contraction_topology(contraction).classification in self.topologies
+        )
+
+
+def filter_blocks(
+    blocks: Iterable[str], contraction_filter: ContractionFilter
+) -> Iterator[str]:
+    """Only passes on those contraction blocks whose header matches the given filter. This allows to skip
+    irrelevant contractions before they are parsed."""
+    for current in blocks:
+        if contraction_filter.matches_block(current):
+            yield current
+
+
+def filter_contractions(
+    contractions: Iterable[Contraction], contraction_filter: ContractionFilter
+) -> Iterator[Contraction]:
+    for current in contractions:
+        if contraction_filter.matches(current):
+            yield current
+
+
+def filter_records(
+    records: Iterable[ContractionRecord], contraction_filter: ContractionFilter
+) -> Iterator[ContractionRecord]:
+    """Like filter_contractions, but for contractions that are paired with their symmetrizations"""
+    for current in records:
+        if contraction_filter.matches(current[0]):
+            yield current
@@ -0,0 +1,288 @@
+from typing import List, TextIO, Tuple
+from dataclasses import dataclass, field
+import io
+import random
+
+
+@dataclass
+class GeneratorSettings:
+    """Settings that control the shape of synthetically generated export files"""
+
+    # Total number of contractions (terms) in the generated file
+    n_contractions: int = 100
+    # Number of vertices (operators) that are contracted in a single term
+    min_vertices: int = 1
+    max_vertices: int = 4
+    # Maximum number of creators (and annihilators) per vertex
+    max_rank: int = 2
+    # Probability for an index to belong to the active space (0 for single-reference-like exports)
+    active_fraction: float = 0.0
+    # Number of distinct result tensors the terms are distributed over
+    n_results: int = 1
+    # Probability for a term to not be explicitly constructed as a connected term
+    disconnected_fraction: float = 0.1
+    operator_names: List[str] = field(
+        default_factory=lambda: ["H", "T1", "T2", "L1", "L2", "GAM0"]
+    )
+    seed: int = 0
+
+
+@dataclass
+class _Slot:
+    space: str
+    external: bool
+    # For internal indices this is the (0-based) index of the arc the index belongs to
+    arc: int = -1
+    id: int = -1
+
+
+@dataclass
+class _Vertex:
+    name: str
+    creators: List[_Slot] = field(default_factory=list)
+    annihilators: List[_Slot] = field(default_factory=list)
+
+
+@dataclass
+class _ResultSpec:
+    name: str
+    creators: List[str]
+    annihilators: List[str]
+
+
+# Numeric representation of the index spaces as used in the contraction and result strings
+space_ids = {"H": 1, "P": 2, "V": 3}
+
+
+def draw_space(rng: random.Random, settings: GeneratorSettings) -> str:
+    if rng.random() < settings.active_fraction:
+        return "V"
+
+    return rng.choice(["H", "P"])
+
+
+def make_result_specs(
+    rng: random.Random, settings: GeneratorSettings
+) -> List[_ResultSpec]:
+    # The symmetrization handling of the translators only supports up to two external creators/annihilators
+    max_result_rank = min(2, settings.max_rank * settings.min_vertices)
+
+    specs: List[_ResultSpec] = []
+    for i in range(settings.n_results):
+        rank = rng.randint(0, max_result_rank)
+        specs.append(
+            _ResultSpec(
+                name="O{}".format(i + 1),
+                creators=[draw_space(rng, settings) for _ in range(rank)],
+                annihilators=[draw_space(rng, settings) for _ in range(rank)],
+            )
+        )
+
+    return specs
+
+
+def format_spaces(creators: List[str], annihilators: List[str]) -> str:
+    return "[{},{}]".format("".join(creators), "".join(annihilators))
+
+
+def format_row(values: List) -> str:
+    return "  " + "".join("{:>4}".format(x) for x in values)
+
+
+def generate_contraction(
+    rng: random.Random,
+    settings: GeneratorSettings,
+    result: _ResultSpec,
+    contraction_id: int,
+) -> str:
+    """Generates the textual representation of a single, randomly generated contraction block"""
+    n_vertices = rng.randint(settings.min_vertices, settings.max_vertices)
+    vertices = [
+        _Vertex(name=rng.choice(settings.operator_names)) for _ in range(n_vertices)
+    ]
+
+    def candidates(creator: bool) -> List[int]:
+        return [
+            i
+            for i, x in enumerate(vertices)
+            if len(x.creators if creator else x.annihilators) < settings.max_rank
+        ]
+
+    # Distribute the external indices (those that appear on the result tensor) over the vertices
+    external_slots: Tuple[List[_Slot], List[_Slot]] = ([], [])
+    for creator, spaces in [(True, result.creators), (False, result.annihilators)]:
+        for space in spaces:
+            vertex = vertices[rng.choice(candidates(creator))]
+            slot = _Slot(space=space, external=True)
+            (vertex.creators if creator else vertex.annihilators).append(slot)
+            external_slots[0 if creator else 1].append(slot)
+
+    # Every contraction line connects a creator of one vertex with an annihilator of another vertex
+    lines: List[Tuple[int, int, _Slot, _Slot]] = []
+
+    def add_line(creator_vertex: int, annihilator_vertex: int) -> None:
+        space = draw_space(rng, settings)
+        creator = _Slot(space=space, external=False)
+        annihilator = _Slot(space=space, external=False)
+        vertices[creator_vertex].creators.append(creator)
+        vertices[annihilator_vertex].annihilators.append(annihilator)
+        lines.append((creator_vertex, annihilator_vertex, creator, annihilator))
+
+    if rng.random() >= settings.disconnected_fraction:
+        # Connect every vertex to one of the previous ones (if possible)
+        for i in range(1, n_vertices):
+            partners = list(range(i))
+            rng.shuffle(partners)
+            for j in partners:
+                first, second = (i, j) if rng.random() < 0.5 else (j, i)
+                if first in candidates(True) and second in candidates(False):
+                    add_line(first, second)
+                    break
+                if second in candidates(True) and first in candidates(False):
+                    add_line(second, first)
+                    break
+
+    if n_vertices > 1:
+        n_extra_lines = rng.randint(0, n_vertices * settings.max_rank // 2)
+        for _ in range(4 * n_extra_lines):
+            if n_extra_lines == 0:
+                break
+            first, second = rng.sample(range(n_vertices), 2)
+            if first in candidates(True) and second in candidates(False):
+                add_line(first, second)
+                n_extra_lines -= 1
+
+    # Assign index IDs (separately for every space): external indices first, then contracted ones
+    next_id = {space: 1 for space in space_ids}
+    for slot in external_slots[0] + external_slots[1]:
+        slot.id = next_id[slot.space]
+        next_id[slot.space] += 1
+
+    # Group the lines into arcs (one per pair of vertices)
+    arc_pairs: List[Tuple[int, int]] = []
+    arc_spaces: List[Tuple[List[str], List[str]]] = []
+    for creator_vertex, annihilator_vertex, creator, annihilator in lines:
+        pair = (
+            min(creator_vertex, annihilator_vertex),
+            max(creator_vertex, annihilator_vertex),
+        )
+        if not pair in arc_pairs:
+            arc_pairs.append(pair)
+            arc_spaces.append(([], []))
+        arc_idx = arc_pairs.index(pair)
+        # Arcs list the creators of their first vertex (contracted with annihilators of the second vertex) and
+        # the annihilators of the first vertex (contracted with creators of the second vertex)
+        arc_spaces[arc_idx][0 if creator_vertex == pair[0] else 1].append(creator.space)
+
+        for slot in [creator, annihilator]:
+            slot.id = next_id[creator.space]
+            slot.arc = arc_idx
+        next_id[creator.space] += 1
+
+    factor = rng.choice([1.0, 0.5, 0.25, 0.125, 1.0 / 6, 1.0 / 12, 2.0])
+    sign = rng.choice([1, -1])
+
+    block: List[str] = []
+    block.append("[CONTR] #{:9d}".format(contraction_id))
+    block.append("  /RESULT/")
+    block.append(
+        "{:>12}  F {}".format(
+            result.name, format_spaces(result.creators, result.annihilators)
+        )
+    )
+    block.append("  /FACTOR/ {:24.14f}{:4d}{:25.14f}".format(1.0, sign, factor))
+    block.append("  /#VERTICES/ {:4d} {:4d}".format(n_vertices, n_vertices))
+    block.append(
+        "  /SVERTEX/" + "".join("{:>4}".format(i + 1) for i in range(n_vertices))
+    )
+    xarcs = [
+        i
+        for i, x in enumerate(vertices)
+        if any(s.external for s in x.creators + x.annihilators)
+    ]
+    block.append("  /#ARCS/ {:5d}{:5d}".format(len(arc_pairs), len(xarcs)))
+    block.append("  /VERTICES/")
+    for vertex in vertices:
+        block.append(
+            "{:>11}  F {}".format(
+                vertex.name,
+                format_spaces(
+                    [x.space for x in vertex.creators],
+                    [x.space for x in vertex.annihilators],
+                ),
+            )
+        )
+    block.append("  /ARCS/")
+    for pair, (creators, annihilators) in zip(arc_pairs, arc_spaces):
+        block.append(
+            "{:>10}{:>3}  {}".format(
+                pair[0] + 1, pair[1] + 1, format_spaces(creators, annihilators)
+            )
+        )
+    block.append("  /XARCS/")
+    for vertex_idx in xarcs:
+        vertex = vertices[vertex_idx]
+        block.append(
+            "{:>10}{:>3}  {}".format(
+                vertex_idx + 1,
+                1,
+                format_spaces(
+                    [x.space for x in vertex.creators if x.external],
+                    [x.space for x in vertex.annihilators if x.external],
+                ),
+            )
+        )
+
+    block.append("  /CONTR_STRING/")
+    rows: List[List] = [[] for _ in range(6)]
+    for vertex_idx, vertex in enumerate(vertices):
+        for idx_type, slots in [(1, vertex.creators), (2, vertex.annihilators)]:
+            for slot in slots:
+                rows[0].append(vertex_idx + 1)
+                rows[1].append(idx_type)
+                rows[2].append(space_ids[slot.space])
+                rows[3].append("T" if slot.external else "F")
+                # External indices reference the result vertex instead of an arc
+                rows[4].append(1 if slot.external else slot.arc + 1)
+                rows[5].append(slot.id)
+    block.extend(format_row(x) if len(x) > 0 else "" for x in rows)
+
+    block.append("  /RESULT_STRING/")
+    rows = [[] for _ in range(5)]
+    for idx_type, slots in [(1, external_slots[0]), (2, external_slots[1])]:
+        for slot in slots:
+            rows[0].append(1)
+            rows[1].append(idx_type)
+            rows[2].append(space_ids[slot.space])
+            rows[3].append(1)
+            rows[4].append(slot.id)
+    block.extend(format_row(x) if len(x) > 0 else "" for x in rows)
+
+    return "\n".join(block) + "\n"
+
+
+def write_export(stream: TextIO, settings: GeneratorSettings) -> None:
+    """Writes a synthetic export file shaped according to the given settings to the given stream. The output is
+    fully determined by the settings (including the seed). The file is written block by block, so that arbitrarily
+    large exports can be generated without keeping them in memory."""
+    rng = random.Random(settings.seed)
+    results = make_result_specs(rng, settings)
+
+    for i in range(settings.n_contractions):
+        stream.write(
+            generate_contraction(
+                rng=rng,
+                settings=settings,
+                result=rng.choice(results),
+                contraction_id=i + 1,
+            )
+        )
+
+    stream.write("[END]\n")
+
+
+def generate_export(settings: GeneratorSettings) -> str:
+    """Returns a synthetic export file shaped according to the given settings as a string"""
+    buffer = io.StringIO()
+    write_export(buffer, settings)
+    return buffer.getvalue()
@@ -0,0 +1,104 @@
+from typing import List
+from dataclasses import dataclass
+
+
+@dataclass
+class VertexHeader:
+    name: str
+    transposed: bool
+    # Index spaces as given in the export, e.g. "[HH,PP]" (for transposed operators creators and annihilators are
+    # already exchanged)
+    creator_spaces: str
+    annihilator_spaces: str
+
+
+@dataclass
+class BlockHeader:
+    """The cheaply accessible information at the beginning of a contraction block, i.e. everything that precedes
+    the description of the arcs and the (expensive to process) contraction and result strings
+    """
+
+    # 0-based like Contraction.id
+    id: int
+    factor: float
+    result: str
+    result_transposed: bool
+    # One entry per result vertex
+    result_spaces: List[VertexHeader]
+    super_vertices: List[int]
+    vertices: List[VertexHeader]
+
+
+def split_spaces(spec: str) -> List[List[str]]:
+    """Splits a space specification like "[HH,PP]" or "[,;P,H]" into its (creators, annihilators) pairs"""
+    spec = spec.strip()
+    assert spec.startswith("[") and spec.endswith("]")
+
+    groups: List[List[str]] = []
+    for current in spec[1:-1].split(";"):
+        creators, annihilators = current.split(",")
+        groups.append([creators.strip(), annihilators.strip()])
+
+    return groups
+
+
+def read_vertex_header(line: str) -> VertexHeader:
+    name, transposed, spaces = line.split(maxsplit=2)
+    assert transposed in ["T", "F"]
+    creators, annihilators = split_spaces(spaces)[0]
+    if transposed == "T":
+        creators, annihilators = annihilators, creators
+
+    return VertexHeader(
+        name=name,
+        transposed=transposed == "T",
+        creator_spaces=creators,
+        annihilator_spaces=annihilators,
+    )
+
+
+def read_block_header(block: str) -> BlockHeader:
+    """Extracts the header information from the text of a single contraction block (as produced by
+    parse.iter_blocks) using plain string operations only"""
+    end = block.find("/ARCS/")
+    lines = block[: end if end >= 0 else len(block)].split("\n")
+
+    assert lines[0].startswith("[CONTR] #")
+    contr_id = int(lines[0][len("[CONTR] #") :]) - 1
+
+    assert lines[1].strip() == "/RESULT/"
+    result_name, result_transposed, result_spec = lines[2].split(maxsplit=2)
+    assert result_transposed in ["T", "F"]
+    result_spaces: List[VertexHeader] = []
+    for creators, annihilators in split_spaces(result_spec):
+        if result_transposed == "T":
+            creators, annihilators = annihilators, creators
+        result_spaces.append(
+            VertexHeader(
+                name=result_name,
+                transposed=result_transposed == "T",
+                creator_spaces=creators,
+                annihilator_spaces=annihilators,
+            )
+        )
+
+    factor_parts = lines[3].split()
+    assert factor_parts[0] == "/FACTOR/"
+    factor = float(factor_parts[1]) * int(factor_parts[2]) * float(factor_parts[3])
+
+    super_vertex_parts = lines[5].split()
+    assert super_vertex_parts[0] == "/SVERTEX/"
+    super_vertices = [int(x) - 1 for x in super_vertex_parts[1:]]
+
+    assert lines[7].strip() == "/VERTICES/"
+    vertices = [read_vertex_header(x) for x in lines[8:] if len(x.strip()) > 0]
+
+    return BlockHeader(
+        id=contr_id,
+        factor=factor,
+        result=result_name,
+        result_transposed=result_transposed == "T",
+        result_spaces=result_spaces,
+        super_vertices=super_vertices,
+        vertices=vertices,
+    )
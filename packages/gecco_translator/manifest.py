@@ -0,0 +1,164 @@
+from typing import Dict, Iterable, List, Optional
+from dataclasses import dataclass, asdict
+from types import ModuleType
+import hashlib
+import json
+import os
+
+from .parse import read_grammar
+
+MANIFEST_FORMAT_VERSION = 2
+
+
+@dataclass
+class ManifestEntry:
+    input_path: str
+    input_hash: str
+    format: str
+    # Hash of the translator's sources (see translator_version)
+    translator_version: str
+    grammar_version: str
+    output_hash: str
+    # Canonical representation of further options that influence the generated output
+    options: str = ""
+
+
+def hash_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """Computes the SHA-256 hash of the given file's contents without loading the entire file into memory"""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def grammar_version() -> str:
+    """Returns a version identifier for the currently used grammar (the hash of its contents)"""
+    return hash_bytes(read_grammar().encode("utf-8"))
+
+
+def hash_files(paths: Iterable[str]) -> str:
+    """Computes a combined hash of the contents of the given files (in the given order)"""
+    hasher = hashlib.sha256()
+    for current in paths:
+        hasher.update(hash_file(current).encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+def source_version(modules: Iterable[ModuleType]) -> str:
+    """Returns a version identifier for the given modules (the hash of their source files), which changes whenever
+    any of them is modified"""
+    paths: List[str] = []
+    for current in modules:
+        assert current.__file__ is not None
+        paths.append(current.__file__)
+
+    return hash_files(paths)
+
+
+def translator_version(extra_sources: Iterable[str] = ()) -> str:
+    """Returns a version identifier for the translator (the hash of all source files of this package together with
+    the given extra source files, e.g. the script driving the translation). As any of them might influence the
+    generated output (parsing, filtering, translation, serialization or the assembly of the output files), it
+    changes whenever any of them is modified."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    paths: List[str] = []
+    for directory, subdirectories, files in os.walk(package_dir):
+        subdirectories.sort()
+        paths.extend(
+            os.path.join(directory, x) for x in sorted(files) if x.endswith(".py")
+        )
+
+    paths.extend(extra_sources)
+
+    return hash_files(paths)
+
+
+class BuildManifest:
+    """Keeps track of the outputs generated from GeCCo export files together with all inputs and settings that went
+    into generating them. This allows to skip the translation of files whose inputs and settings are unchanged.
+    Outputs become stale whenever a source file of the package or one of the given extra source files changes.
+    """
+
+    def __init__(self, path: str, extra_sources: Iterable[str] = ()):
+        self.path = path
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.translator_version: str = translator_version(extra_sources)
+        self.grammar_version: str = grammar_version()
+
+        if os.path.exists(path):
+            with open(path, "r") as manifest_file:
+                contents = json.load(manifest_file)
+
+            if contents.get("version") == MANIFEST_FORMAT_VERSION:
+                for output_path, entry in contents["outputs"].items():
+                    self.entries[output_path] = ManifestEntry(**entry)
+
+    def stale_reason(
+        self,
+        output_path: str,
+        input_path: str,
+        input_hash: str,
+        format: str,
+        options: str = "",
+    ) -> Optional[str]:
+        """Checks whether the given output has to be regenerated. Returns None if the output is up to date and a
+        human-readable reason why it is stale otherwise."""
+        entry = self.entries.get(output_path)
+        if entry is None:
+            return "not built before"
+        if not os.path.exists(output_path):
+            return "output missing"
+        if entry.input_path != input_path:
+            return "generated from a different input"
+        if entry.input_hash != input_hash:
+            return "input changed"
+        if entry.format != format:
+            return "format changed"
+        if entry.options != options:
+            return "options changed"
+        if entry.translator_version != self.translator_version:
+            return "translator changed"
+        if entry.grammar_version != self.grammar_version:
+            return "grammar changed"
+        if entry.output_hash != hash_file(output_path):
+            return "output modified"
+
+        return None
+
+    def record(
+        self,
+        output_path: str,
+        input_path: str,
+        input_hash: str,
+        format: str,
+        options: str = "",
+    ) -> None:
+        """Records that the given output has been (re)generated from the given input using the current settings"""
+        self.entries[output_path] = ManifestEntry(
+            input_path=input_path,
+            input_hash=input_hash,
+            format=format,
+            translator_version=self.translator_version,
+            grammar_version=self.grammar_version,
+            output_hash=hash_file(output_path),
+            options=options,
+        )
+
+    def save(self) -> None:
+        contents = {
+            "version": MANIFEST_FORMAT_VERSION,
+            "outputs": {path: asdict(entry) for path, entry in self.entries.items()},
+        }
+
+        # Write to a temporary file first so that an interrupted run can't leave a corrupted manifest behind
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as manifest_file:
+            json.dump(contents, manifest_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
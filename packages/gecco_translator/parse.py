@@ -1,9 +1,17 @@
-from typing import List
+from typing import Iterable, Iterator, List, Optional, TextIO
+from functools import lru_cache
+import inspect
 import os
+import sys
+import time
 
-from lark import Lark
+from lark import Lark, Tree
 
 from .ast import Contraction, ASTTransformer
+from .compression import open_export
+from .filters import ContractionFilter, filter_blocks
+from .screening import Screening
+from . import profiling
 
 
 def read_grammar() -> str:
@@ -18,12 +26,171 @@ def read_grammar() -> str:
     return grammar
 
 
+@lru_cache(maxsize=None)
 def get_parser(paring_algorithm: str = "lalr") -> Lark:
-    """Constructs a Lark parser object configured to use the selected parsing algorithm"""
+    """Constructs a Lark parser object configured to use the selected parsing algorithm. The parser is only
+    constructed once and then reused for subsequent calls."""
     return Lark(read_grammar(), parser=paring_algorithm)
 
 
+@lru_cache(maxsize=None)
+def supports_lexer_thread() -> bool:
+    """Whether Lark's interactive parser exposes its lexer thread (which isn't part of Lark's public API)"""
+    try:
+        from lark.parsers.lalr_interactive_parser import InteractiveParser
+    except ImportError:
+        return False
+
+    return "lexer_thread" in inspect.signature(InteractiveParser.__init__).parameters
+
+
+def parse_tree_profiled(parser: Lark, content: str) -> Tree:
+    """Parses the given content into a raw parse tree while separately measuring the time spent in the lexer (which
+    is interleaved with the parser) and reporting it to the active profiler. This relies on the lexer thread of
+    Lark's interactive parser; if that isn't available, the lexing is attributed to the enclosing stage instead.
+    """
+    profiler = profiling.active_profiler()
+    assert profiler is not None
+
+    # Only LALR parsers can be used interactively
+    if parser.options.parser != "lalr" or not supports_lexer_thread():
+        return parser.parse(content)
+
+    interactive = parser.parse_interactive(content)
+
+    lexing_time = 0.0
+    lexing_blocks = 0
+    n_tokens = 0
+
+    tokens = interactive.lexer_thread.lex(interactive.parser_state)
+    last_token = None
+    while True:
+        lexing_start = time.perf_counter()
+        blocks_start = sys.getallocatedblocks()
+        token = next(tokens, None)
+        lexing_blocks += sys.getallocatedblocks() - blocks_start
+        lexing_time += time.perf_counter() - lexing_start
+        if token is None:
+            break
+
+        interactive.feed_token(token)
+        last_token = token
+        n_tokens += 1
+
+    tree = interactive.feed_eof(last_token)
+
+    profiler.record(
+        name="lexing", wall_time=lexing_time, block_delta=lexing_blocks, calls=n_tokens
+    )
+
+    return tree
+
+
+def parse_contractions(parser: Lark, content: str) -> List[Contraction]:
+    if profiling.active_profiler() is None:
+        raw_tree = parser.parse(content)
+    else:
+        with profiling.stage("parsing"):
+            raw_tree = parse_tree_profiled(parser, content)
+
+    with profiling.stage("transformation"):
+        return ASTTransformer().transform(raw_tree)
+
+
 def parse(content: str) -> List[Contraction]:
     """Parses the given content in GeCCo export format and returns the parsed list of contractions"""
-    raw_tree = get_parser().parse(content)
-    return ASTTransformer().transform(raw_tree)
+    with profiling.stage("grammar compilation"):
+        parser = get_parser()
+
+    return parse_contractions(parser, content)
+
+
+block_start_tag = "[CONTR] #"
+end_tag = "[END]"
+
+
+def iter_blocks(stream: TextIO) -> Iterator[str]:
+    """Splits the content of the given stream into the text blocks describing the individual contractions without
+    ever reading more than a single block into memory"""
+    block: List[str] = []
+
+    for line in stream:
+        is_block_start = line.startswith(block_start_tag)
+        if is_block_start or line.startswith(end_tag):
+            if len(block) > 0:
+                yield "".join(block)
+                block = []
+
+            if not is_block_start:
+                return
+        elif len(block) == 0:
+            if len(line.strip()) > 0:
+                raise ValueError(
+                    "Expected '{}' or '{}' but got '{}'".format(
+                        block_start_tag, end_tag, line.rstrip()
+                    )
+                )
+            continue
+
+        block.append(line)
+
+    raise ValueError("Export is missing the terminating '{}' tag".format(end_tag))
+
+
+def parse_blocks(blocks: Iterable[str], batch_size: int = 64) -> Iterator[Contraction]:
+    """Parses the given contraction blocks (as produced by iter_blocks) in batches of (at most) batch_size blocks
+    and yields the resulting contractions one by one"""
+    with profiling.stage("grammar compilation"):
+        parser = get_parser()
+
+    batch: List[str] = []
+    for current in blocks:
+        batch.append(current)
+
+        if len(batch) >= batch_size:
+            batch.append(end_tag + "\n")
+            yield from parse_contractions(parser, "".join(batch))
+            batch = []
+
+    if len(batch) > 0:
+        batch.append(end_tag + "\n")
+        yield from parse_contractions(parser, "".join(batch))
+
+
+def select_blocks(
+    stream: TextIO,
+    contraction_filter: Optional[ContractionFilter] = None,
+    screening: Optional[Screening] = None,
+) -> Iterator[str]:
+    """Yields the blocks of the GeCCo export read from the given stream that match the given filter (if any) and
+    survive the screening (if any, applied to the blocks selected by the filter)"""
+    blocks = iter_blocks(stream)
+    if contraction_filter is not None:
+        blocks = filter_blocks(blocks, contraction_filter)
+    if screening is not None:
+        blocks = screening.screen_blocks(blocks)
+
+    return blocks
+
+
+def iter_contractions(
+    stream: TextIO,
+    batch_size: int = 64,
+    contraction_filter: Optional[ContractionFilter] = None,
+    screening: Optional[Screening] = None,
+) -> Iterator[Contraction]:
+    """Parses the GeCCo export read from the given stream block by block, yielding the contractions as they are
+    parsed. Thus, the export is never held in memory as a whole. If a filter is given, it is applied to the header
+    of every block and only matching blocks are parsed at all. The same holds for the screening.
+    """
+    return parse_blocks(
+        select_blocks(stream, contraction_filter, screening), batch_size=batch_size
+    )
+
+
+def parse_file(
+    path: str, contraction_filter: Optional[ContractionFilter] = None
+) -> List[Contraction]:
+    """Parses the (possibly gzip, bz2 or xz compressed) export file at the given path"""
+    with open_export(path) as stream:
+        return list(iter_contractions(stream, contraction_filter=contraction_filter))
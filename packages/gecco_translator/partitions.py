@@ -0,0 +1,103 @@
+from typing import Dict, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar
+import os
+import pickle
+import tempfile
+
+from gecco_translator import profiling
+
+Key = TypeVar("Key", bound=Hashable)
+
+
+class SpillingPartitions(Generic[Key]):
+    """Groups strings (e.g. formatted terms) by a key, retaining the order of the keys' first appearance and the
+    order of the strings within every group. If a maximum number of buffered strings is given, the buffered strings
+    are appended to one temporary file per group whenever that number is exceeded, so that memory usage doesn't
+    grow with the number of strings. Use as a context manager to remove the temporary files afterwards.
+    """
+
+    def __init__(self, max_buffered: Optional[int] = None):
+        if max_buffered is not None and max_buffered < 1:
+            raise ValueError("max_buffered must be at least 1")
+
+        self.max_buffered = max_buffered
+        self.n_spills = 0
+        self._partitions: Dict[Key, int] = {}
+        self._buffers: List[List[str]] = []
+        self._spilled: List[bool] = []
+        self._n_buffered = 0
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+
+    def __enter__(self) -> "SpillingPartitions[Key]":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def directory(self) -> Optional[str]:
+        """The directory holding the temporary files (None if nothing has been spilled yet)"""
+        return self._directory.name if self._directory is not None else None
+
+    def close(self) -> None:
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+    def _path(self, partition: int) -> str:
+        assert self._directory is not None
+        return os.path.join(self._directory.name, "{}.partition".format(partition))
+
+    def append(self, key: Key, value: str) -> None:
+        if not key in self._partitions:
+            self._partitions[key] = len(self._buffers)
+            self._buffers.append([])
+            self._spilled.append(False)
+
+        self._buffers[self._partitions[key]].append(value)
+        self._n_buffered += 1
+
+        if self.max_buffered is not None and self._n_buffered > self.max_buffered:
+            self.spill()
+
+    def spill(self) -> None:
+        """Moves all buffered strings to the temporary files of their partitions"""
+        with profiling.stage("spilling"):
+            if self._directory is None:
+                self._directory = tempfile.TemporaryDirectory(
+                    prefix="gecco_partitions_"
+                )
+
+            for partition, buffer in enumerate(self._buffers):
+                if len(buffer) == 0:
+                    continue
+
+                # Every spill appends one chunk to the file, which is read back chunk by chunk
+                with open(self._path(partition), "ab") as partition_file:
+                    pickle.dump(
+                        buffer, partition_file, protocol=pickle.HIGHEST_PROTOCOL
+                    )
+
+                self._buffers[partition] = []
+                self._spilled[partition] = True
+
+            self._n_buffered = 0
+            self.n_spills += 1
+
+    def _iter_partition(self, partition: int) -> Iterator[str]:
+        if self._spilled[partition]:
+            with open(self._path(partition), "rb") as partition_file:
+                while True:
+                    try:
+                        chunk = pickle.load(partition_file)
+                    except EOFError:
+                        break
+
+                    yield from chunk
+
+        yield from self._buffers[partition]
+
+    def items(self) -> Iterator[Tuple[Key, Iterator[str]]]:
+        """Yields every key (in order of first appearance) together with an iterator over its strings. Only a single
+        spilled chunk is read into memory at a time."""
+        for key, partition in self._partitions.items():
+            yield key, self._iter_partition(partition)
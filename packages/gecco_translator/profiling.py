@@ -0,0 +1,335 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+import heapq
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+from .ast import Contraction
+
+
+@dataclass
+class StageRecord:
+    name: str
+    calls: int = 0
+    # Time spent in this stage itself (time spent in nested stages is attributed to those)
+    wall_time: float = 0.0
+    # Net change in the number of memory blocks allocated by the Python interpreter (blocks allocated minus blocks
+    # freed, so this is not a count of allocations and may be negative)
+    block_delta: int = 0
+    # Highest amount of memory (in bytes) traced by tracemalloc while the stage was active (only if enabled)
+    peak_memory: int = 0
+
+
+@dataclass
+class TermRecord:
+    contraction_id: int
+    result: str
+    n_tensors: int
+    n_indices: int
+    n_external_indices: int
+    symmetrization_size: int = 1
+    wall_time: float = 0.0
+
+
+@dataclass
+class _OpenStage:
+    record: StageRecord
+    start_time: float
+    start_blocks: int
+    child_time: float = 0.0
+    child_block_delta: int = 0
+    peak_memory: int = 0
+
+
+class Profiler:
+    """Records wall time and the net change in allocated memory blocks for the different stages of a translation
+    as well as counters for the individual contractions (terms) that are processed. Use the profile() context
+    manager to make a profiler the active one. If given, callback will be invoked with the stage's name and its
+    measured wall time and block delta whenever a stage is left. If trace_memory is set, the peak memory usage of
+    every stage is determined via tracemalloc (which considerably slows down the execution). Only the n_slowest
+    slowest terms are kept (together with aggregates over all terms), so that profiling doesn't need memory
+    proportional to the number of terms.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[str, float, int], None]] = None,
+        trace_memory: bool = False,
+        n_slowest: int = 10,
+    ) -> None:
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.peak_memory = 0
+        self.stages: Dict[str, StageRecord] = {}
+        self.n_slowest = n_slowest
+        self.n_terms = 0
+        self.max_symmetrization_size = 0
+        # Min-heap of the slowest terms so far, keyed by their wall time (and their number to break ties)
+        self._slowest: List[Tuple[float, int, TermRecord]] = []
+        self.metadata: Dict[str, Any] = {}
+        self._stack: List[_OpenStage] = []
+        self._current_term: Optional[TermRecord] = None
+
+    def _get_record(self, name: str) -> StageRecord:
+        if not name in self.stages:
+            self.stages[name] = StageRecord(name=name)
+
+        return self.stages[name]
+
+    def _collect_peak_memory(self) -> int:
+        """Returns the peak of the traced memory since the last call and resets it"""
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return 0
+
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.peak_memory = max(self.peak_memory, peak)
+
+        return peak
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        record = self._get_record(name)
+
+        # The peak reached so far belongs to the enclosing stage
+        peak = self._collect_peak_memory()
+        if len(self._stack) > 0:
+            self._stack[-1].peak_memory = max(self._stack[-1].peak_memory, peak)
+
+        current = _OpenStage(
+            record=record,
+            start_time=time.perf_counter(),
+            start_blocks=sys.getallocatedblocks(),
+        )
+        self._stack.append(current)
+
+        try:
+            yield record
+        finally:
+            elapsed = time.perf_counter() - current.start_time
+            blocks = sys.getallocatedblocks() - current.start_blocks
+            current.peak_memory = max(current.peak_memory, self._collect_peak_memory())
+            record.peak_memory = max(record.peak_memory, current.peak_memory)
+            self._stack.pop()
+
+            self._add(
+                name=name,
+                wall_time=elapsed - current.child_time,
+                block_delta=blocks - current.child_block_delta,
+                calls=1,
+            )
+
+            if len(self._stack) > 0:
+                self._stack[-1].child_time += elapsed
+                self._stack[-1].child_block_delta += blocks
+                self._stack[-1].peak_memory = max(
+                    self._stack[-1].peak_memory, current.peak_memory
+                )
+
+    def record(
+        self, name: str, wall_time: float, block_delta: int = 0, calls: int = 1
+    ) -> None:
+        """Adds an externally measured duration to the given stage. If this happens inside of another stage, the
+        duration is considered to be part of that enclosing stage and is thus no longer attributed to it.
+        """
+        if len(self._stack) > 0:
+            self._stack[-1].child_time += wall_time
+            self._stack[-1].child_block_delta += block_delta
+
+        self._add(
+            name=name,
+            wall_time=wall_time,
+            block_delta=block_delta,
+            calls=calls,
+        )
+
+    def _add(self, name: str, wall_time: float, block_delta: int, calls: int) -> None:
+        record = self._get_record(name)
+        record.calls += calls
+        record.wall_time += wall_time
+        record.block_delta += block_delta
+
+        if self.callback is not None:
+            self.callback(name, wall_time, block_delta)
+
+    @contextmanager
+    def term(self, contraction: Contraction) -> Iterator[TermRecord]:
+        record = TermRecord(
+            contraction_id=contraction.id,
+            result=contraction.result.name,
+            n_tensors=len(contraction.tensors),
+            n_indices=len(contraction.contraction_indices)
+            + len(contraction.external_indices),
+            n_external_indices=len(contraction.external_indices),
+        )
+        self._current_term = record
+        start = time.perf_counter()
+
+        try:
+            yield record
+        finally:
+            record.wall_time = time.perf_counter() - start
+            self._current_term = None
+            self._add_term(record)
+
+    def _add_term(self, record: TermRecord) -> None:
+        self.n_terms += 1
+        self.max_symmetrization_size = max(
+            self.max_symmetrization_size, record.symmetrization_size
+        )
+
+        entry = (record.wall_time, self.n_terms, record)
+        if len(self._slowest) < self.n_slowest:
+            heapq.heappush(self._slowest, entry)
+        elif self.n_slowest > 0:
+            heapq.heappushpop(self._slowest, entry)
+
+    def note_symmetrizations(
+        self, creator_symms: List[Set[Any]], annihilator_symms: List[Set[Any]]
+    ) -> None:
+        """Records the size (number of index permutations) of the symmetrizer required for the current term"""
+        if self._current_term is None:
+            return
+
+        self._current_term.symmetrization_size = math.prod(
+            [math.factorial(len(x)) for x in creator_symms + annihilator_symms]
+        )
+
+    def slowest_terms(self, n: Optional[int] = None) -> List[TermRecord]:
+        """Returns the n (at most n_slowest) slowest terms, starting with the slowest one"""
+        n = self.n_slowest if n is None else min(n, self.n_slowest)
+        return [x[2] for x in heapq.nlargest(n, self._slowest)]
+
+    def to_dict(self, n_slowest: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            "metadata": self.metadata,
+            "total_time": sum(x.wall_time for x in self.stages.values()),
+            "peak_memory": self.peak_memory if self.trace_memory else None,
+            "stages": [asdict(x) for x in self.stages.values()],
+            "n_terms": self.n_terms,
+            "max_symmetrization_size": self.max_symmetrization_size,
+            "slowest_terms": [asdict(x) for x in self.slowest_terms(n_slowest)],
+        }
+
+    def to_json(self, n_slowest: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(n_slowest=n_slowest), indent=2)
+
+    def report(self, n_slowest: Optional[int] = None) -> str:
+        """Creates a human-readable summary of the recorded data"""
+        total_time = sum(x.wall_time for x in self.stages.values())
+
+        header = "{:<24} {:>8} {:>12} {:>7} {:>14}".format(
+            "Stage", "Calls", "Time [s]", "Share", "Block delta"
+        )
+        if self.trace_memory:
+            header += " {:>12}".format("Peak [MiB]")
+        lines = [header]
+        for current in sorted(
+            self.stages.values(), key=lambda x: x.wall_time, reverse=True
+        ):
+            line = "{:<24} {:>8} {:>12.6f} {:>6.1f}% {:>14}".format(
+                current.name,
+                current.calls,
+                current.wall_time,
+                100 * current.wall_time / total_time if total_time > 0 else 0,
+                current.block_delta,
+            )
+            if self.trace_memory:
+                line += " {:>12.2f}".format(current.peak_memory / 2**20)
+            lines.append(line)
+        total = "{:<24} {:>8} {:>12.6f}".format("Total", "", total_time)
+        if self.trace_memory:
+            total += " {:>7} {:>14} {:>12.2f}".format("", "", self.peak_memory / 2**20)
+        lines.append(total)
+
+        if self.n_terms > 0:
+            lines.append("")
+            lines.append("Slowest of {} terms:".format(self.n_terms))
+            lines.append(
+                "{:>8} {:<16} {:>8} {:>8} {:>9} {:>6} {:>12}".format(
+                    "Id",
+                    "Result",
+                    "Tensors",
+                    "Indices",
+                    "External",
+                    "Symm.",
+                    "Time [s]",
+                )
+            )
+            for current in self.slowest_terms(n_slowest):
+                lines.append(
+                    "{:>8} {:<16} {:>8} {:>8} {:>9} {:>6} {:>12.6f}".format(
+                        current.contraction_id + 1,
+                        current.result,
+                        current.n_tensors,
+                        current.n_indices,
+                        current.n_external_indices,
+                        current.symmetrization_size,
+                        current.wall_time,
+                    )
+                )
+
+        return "\n".join(lines)
+
+
+_active_profiler: Optional[Profiler] = None
+
+
+def active_profiler() -> Optional[Profiler]:
+    return _active_profiler
+
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """Makes the given (or a newly created) profiler the active one for the duration of the with-block. All
+    instrumented library functions called inside the block report to this profiler."""
+    global _active_profiler
+
+    if profiler is None:
+        profiler = Profiler()
+
+    start_tracing = profiler.trace_memory and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+
+    previous = _active_profiler
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous
+
+        if start_tracing:
+            profiler._collect_peak_memory()
+            tracemalloc.stop()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Optional[StageRecord]]:
+    """Records the enclosed code as the given stage, if a profiler is active (otherwise this is a no-op)"""
+    if _active_profiler is None:
+        yield None
+    else:
+        with _active_profiler.stage(name) as record:
+            yield record
+
+
+@contextmanager
+def term(contraction: Contraction) -> Iterator[Optional[TermRecord]]:
+    """Records counters for the processing of the given contraction, if a profiler is active"""
+    if _active_profiler is None:
+        yield None
+    else:
+        with _active_profiler.term(contraction) as record:
+            yield record
+
+
+def note_symmetrizations(
+    creator_symms: List[Set[Any]], annihilator_symms: List[Set[Any]]
+) -> None:
+    if _active_profiler is not None:
+        _active_profiler.note_symmetrizations(creator_symms, annihilator_symms)
@@ -0,0 +1,235 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+from dataclasses import dataclass, field
+import math
+
+from .ast import ASTTransformer, Contraction
+from .headers import BlockHeader, read_block_header
+from .filters import space_names
+from .translators.symmetry import ContractionRecord
+
+
+def parse_dimensions(spec: str) -> Dict[int, int]:
+    """Parses a specification of index space dimensions like "H=10,P=100,V=0" into a map from space ID to
+    dimension"""
+    dimensions: Dict[int, int] = {}
+    for current in spec.split(","):
+        name, value = current.split("=")
+        name = name.strip().upper()
+        if not name in ASTTransformer.name_to_id:
+            raise ValueError("Unknown index space '{}'".format(name))
+
+        dimension = int(value)
+        if dimension < 0:
+            raise ValueError("The dimension of space '{}' is negative".format(name))
+
+        dimensions[ASTTransformer.name_to_id[name]] = dimension
+
+    return dimensions
+
+
+@dataclass
+class TermSummary:
+    """The properties of a term that screening is based on"""
+
+    id: int
+    result: str
+    factor: float
+    n_tensors: int
+    # Number of distinct indices per space ID
+    index_counts: Dict[int, int]
+
+
+def header_summary(header: BlockHeader) -> TermSummary:
+    """Summarizes the term described by the given block header. As every contracted index appears on two vertices
+    and every external index appears on one vertex and on the result, the number of distinct indices of a space is
+    half the number of slots of that space."""
+    slots: Dict[int, int] = {}
+    for vertex in header.vertices + header.result_spaces:
+        for space in vertex.creator_spaces + vertex.annihilator_spaces:
+            space_id = ASTTransformer.name_to_id[space]
+            slots[space_id] = slots.get(space_id, 0) + 1
+
+    return TermSummary(
+        id=header.id,
+        result=header.result,
+        factor=header.factor,
+        n_tensors=len(set(header.super_vertices)),
+        index_counts={space: count // 2 for space, count in slots.items()},
+    )
+
+
+def contraction_summary(contraction: Contraction) -> TermSummary:
+    labels = set(
+        (x.space, x.id)
+        for tensor in contraction.tensors + [contraction.result]
+        for group in tensor.vertex_indices
+        for x in group.creators + group.annihilators
+    )
+
+    index_counts: Dict[int, int] = {}
+    for space, _ in labels:
+        index_counts[space] = index_counts.get(space, 0) + 1
+
+    return TermSummary(
+        id=contraction.id,
+        result=contraction.result.name,
+        factor=contraction.factor,
+        n_tensors=len(contraction.tensors),
+        index_counts=index_counts,
+    )
+
+
+# The reasons for which terms are pruned
+EMPTY_SPACE = "empty space"
+SMALL_FACTOR = "small factor"
+
+
+@dataclass
+class PrunedTerm:
+    id: int
+    result: str
+    # EMPTY_SPACE or SMALL_FACTOR
+    kind: str
+    reason: str
+    # None if the cost can't be estimated (due to missing dimensions) or is meaningless (terms involving an empty
+    # space don't cost anything in the first place)
+    estimated_flops: Optional[int]
+
+
+@dataclass
+class ScreeningReport:
+    """Running totals of the screening decisions. Only the first max_samples pruned terms are kept (for the
+    summary), so that the memory used by the report doesn't grow with the number of screened terms."""
+
+    n_screened: int = 0
+    # Number of pruned terms per kind (EMPTY_SPACE or SMALL_FACTOR)
+    n_pruned_by_kind: Dict[str, int] = field(default_factory=dict)
+    # Estimated costs of the pruned and of the kept terms (only terms whose cost could be estimated)
+    pruned_flops: int = 0
+    kept_flops: int = 0
+    pruned: List[PrunedTerm] = field(default_factory=list)
+    max_samples: int = 20
+
+    @property
+    def n_pruned(self) -> int:
+        return sum(self.n_pruned_by_kind.values())
+
+    def count(self, kind: str) -> int:
+        return self.n_pruned_by_kind.get(kind, 0)
+
+    def add_pruned(self, term: PrunedTerm) -> None:
+        self.n_pruned_by_kind[term.kind] = self.count(term.kind) + 1
+        if term.estimated_flops is not None:
+            self.pruned_flops += term.estimated_flops
+        if len(self.pruned) < self.max_samples:
+            self.pruned.append(term)
+
+    def summary(self, max_terms: int = 20) -> str:
+        lines = [
+            "Pruned {} of {} terms ({} involving empty spaces, {} with small factors)".format(
+                self.n_pruned,
+                self.n_screened,
+                self.count(EMPTY_SPACE),
+                self.count(SMALL_FACTOR),
+            )
+        ]
+        if self.count(SMALL_FACTOR) > 0:
+            lines.append(
+                "Estimated FLOPs saved by factor screening: {:.3e} of {:.3e}".format(
+                    self.pruned_flops, self.pruned_flops + self.kept_flops
+                )
+            )
+        listed = self.pruned[:max_terms]
+        for current in listed:
+            lines.append(
+                "  #{:<8} {:<16} {:>12} {}".format(
+                    current.id + 1,
+                    current.result,
+                    (
+                        "{:.3e}".format(current.estimated_flops)
+                        if current.estimated_flops is not None
+                        else "-"
+                    ),
+                    current.reason,
+                )
+            )
+        if self.n_pruned > len(listed):
+            lines.append("  ... and {} more".format(self.n_pruned - len(listed)))
+
+        return "\n".join(lines)
+
+
+class Screening:
+    """Drops terms that are identically zero because they contain an index of an empty space (dimension 0) as well
+    as terms whose factor is smaller (in magnitude) than min_factor. Spaces without a given dimension are never
+    considered empty. Screening works on block headers, so that pruned terms are never parsed (let alone analyzed
+    or translated). All decisions are recorded in the report."""
+
+    def __init__(self, dimensions: Dict[int, int], min_factor: float = 0.0):
+        self.dimensions = dimensions
+        self.min_factor = min_factor
+        self.report = ScreeningReport()
+
+    def estimated_flops(self, term: TermSummary) -> Optional[int]:
+        """Estimates the cost of evaluating the term as a single loop nest over all of its distinct indices with one
+        multiplication per tensor in the innermost loop"""
+        if any(not x in self.dimensions for x in term.index_counts):
+            return None
+
+        return max(term.n_tensors, 1) * math.prod(
+            self.dimensions[space] ** count
+            for space, count in term.index_counts.items()
+        )
+
+    def keep(self, term: TermSummary) -> bool:
+        self.report.n_screened += 1
+        flops = self.estimated_flops(term)
+
+        empty_spaces = [x for x in term.index_counts if self.dimensions.get(x, -1) == 0]
+        if len(empty_spaces) > 0:
+            self.report.add_pruned(
+                PrunedTerm(
+                    id=term.id,
+                    result=term.result,
+                    kind=EMPTY_SPACE,
+                    reason="involves the empty space(s) {}".format(
+                        ", ".join(space_names[x] for x in sorted(empty_spaces))
+                    ),
+                    estimated_flops=None,
+                )
+            )
+            return False
+
+        if abs(term.factor) < self.min_factor:
+            self.report.add_pruned(
+                PrunedTerm(
+                    id=term.id,
+                    result=term.result,
+                    kind=SMALL_FACTOR,
+                    reason="factor {} below threshold".format(term.factor),
+                    estimated_flops=flops,
+                )
+            )
+            return False
+
+        self.report.kept_flops += flops if flops is not None else 0
+        return True
+
+    def screen_blocks(self, blocks: Iterable[str]) -> Iterator[str]:
+        for current in blocks:
+            if self.keep(header_summary(read_block_header(current))):
+                yield current
+
+    def screen_contractions(
+        self, contractions: Iterable[Contraction]
+    ) -> Iterator[Contraction]:
+        for current in contractions:
+            if self.keep(contraction_summary(current)):
+                yield current
+
+    def screen_records(
+        self, records: Iterable[ContractionRecord]
+    ) -> Iterator[ContractionRecord]:
+        for current in records:
+            if self.keep(contraction_summary(current[0])):
+                yield current
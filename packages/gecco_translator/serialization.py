@@ -0,0 +1,713 @@
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
+from array import array
+import bisect
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+from .ast import (
+    Arc,
+    Contraction,
+    Index,
+    IndexGroup,
+    IndexSpaces,
+    TensorElement,
+)
+from .translators.symmetry import (
+    ContractionRecord,
+    Symmetrizations,
+    as_records,
+    get_required_symmetrizations,
+)
+from .compression import open_export, strip_compression_extension
+from gecco_translator import profiling
+
+# File name extensions of the structured formats that can be read back in instead of an export file
+serialized_extensions: Dict[str, str] = {
+    ".jsonl": "jsonl",
+    ".columnar": "columnar",
+}
+
+columnar_magic = b"GCCOLUMN"
+COLUMNAR_FORMAT_VERSION = 2
+
+
+def encode_index(index: Index) -> List[int]:
+    return [index.id, index.space, index.vertex, index.type]
+
+
+def decode_index(values: List[int]) -> Index:
+    return Index(id=values[0], space=values[1], vertex=values[2], type=values[3])
+
+
+def encode_spaces(spaces: IndexSpaces) -> Dict[str, Any]:
+    return {"creators": spaces.creators, "annihilators": spaces.annihilators}
+
+
+def decode_spaces(values: Dict[str, Any]) -> IndexSpaces:
+    return IndexSpaces(
+        creators=list(values["creators"]), annihilators=list(values["annihilators"])
+    )
+
+
+def encode_arc(arc: Arc) -> Dict[str, Any]:
+    return {
+        "first_vertex_idx": arc.first_vertex_idx,
+        "second_vertex_idx": arc.second_vertex_idx,
+        "contracted_spaces": encode_spaces(arc.contracted_spaces),
+    }
+
+
+def decode_arc(values: Dict[str, Any]) -> Arc:
+    return Arc(
+        first_vertex_idx=values["first_vertex_idx"],
+        second_vertex_idx=values["second_vertex_idx"],
+        contracted_spaces=decode_spaces(values["contracted_spaces"]),
+    )
+
+
+def encode_tensor(tensor: TensorElement) -> Dict[str, Any]:
+    return {
+        "name": tensor.name,
+        "transposed": tensor.transposed,
+        "vertex_indices": [
+            {
+                "creators": [encode_index(x) for x in group.creators],
+                "annihilators": [encode_index(x) for x in group.annihilators],
+            }
+            for group in tensor.vertex_indices
+        ],
+    }
+
+
+def decode_tensor(values: Dict[str, Any]) -> TensorElement:
+    return TensorElement(
+        name=values["name"],
+        transposed=values["transposed"],
+        vertex_indices=[
+            IndexGroup(
+                creators=[decode_index(x) for x in group["creators"]],
+                annihilators=[decode_index(x) for x in group["annihilators"]],
+            )
+            for group in values["vertex_indices"]
+        ],
+    )
+
+
+def sorted_symmetrization(symmetrization: Set[Index]) -> List[Index]:
+    # Sets have no defined order, but the serialized form should be deterministic
+    return sorted(symmetrization, key=lambda x: (x.space, x.id, x.type, x.vertex))
+
+
+def encode_contraction(
+    contraction: Contraction, symmetrizations: Optional[Symmetrizations] = None
+) -> Dict[str, Any]:
+    """Converts the given contraction (and optionally its required symmetrizations) into a structure consisting of
+    JSON-compatible types only"""
+    values: Dict[str, Any] = {
+        "id": contraction.id,
+        "factor": contraction.factor,
+        "result": encode_tensor(contraction.result),
+        "tensors": [encode_tensor(x) for x in contraction.tensors],
+        "contractions": [encode_arc(x) for x in contraction.contractions],
+        "external_contractions": [
+            encode_arc(x) for x in contraction.external_contractions
+        ],
+        "contraction_indices": [
+            encode_index(x) for x in contraction.contraction_indices
+        ],
+        "external_indices": [encode_index(x) for x in contraction.external_indices],
+    }
+
+    if symmetrizations is not None:
+        creator_symms, annihilator_symms = symmetrizations
+        values["symmetrizations"] = {
+            "creators": [
+                [encode_index(x) for x in sorted_symmetrization(current)]
+                for current in creator_symms
+            ],
+            "annihilators": [
+                [encode_index(x) for x in sorted_symmetrization(current)]
+                for current in annihilator_symms
+            ],
+        }
+
+    return values
+
+
+def decode_contraction(values: Dict[str, Any]) -> Contraction:
+    return Contraction(
+        id=values["id"],
+        factor=values["factor"],
+        result=decode_tensor(values["result"]),
+        tensors=[decode_tensor(x) for x in values["tensors"]],
+        contractions=[decode_arc(x) for x in values["contractions"]],
+        external_contractions=[decode_arc(x) for x in values["external_contractions"]],
+        contraction_indices=[decode_index(x) for x in values["contraction_indices"]],
+        external_indices=[decode_index(x) for x in values["external_indices"]],
+    )
+
+
+def decode_symmetrizations(values: Dict[str, Any]) -> Optional[Symmetrizations]:
+    if not "symmetrizations" in values:
+        return None
+
+    return (
+        [
+            set(decode_index(x) for x in current)
+            for current in values["symmetrizations"]["creators"]
+        ],
+        [
+            set(decode_index(x) for x in current)
+            for current in values["symmetrizations"]["annihilators"]
+        ],
+    )
+
+
+def contraction_to_json(
+    contraction: Contraction, symmetrizations: Optional[Symmetrizations] = None
+) -> str:
+    """Encodes the given contraction (including its required symmetrizations, which are determined unless they are
+    given) as a single line of JSON"""
+    return json.dumps(
+        encode_contraction(
+            contraction, get_required_symmetrizations(contraction, symmetrizations)
+        ),
+        separators=(",", ":"),
+    )
+
+
+def write_jsonl_records(records: Iterable[ContractionRecord], out: TextIO) -> None:
+    """Like write_jsonl, but reuses the symmetrizations of the given records that are known already"""
+    first = True
+    for current, symmetrizations in records:
+        with profiling.stage("jsonl emission"), profiling.term(current):
+            line = contraction_to_json(current, symmetrizations)
+
+        with profiling.stage("writing"):
+            if not first:
+                out.write("\n")
+            out.write(line)
+        first = False
+
+
+def write_jsonl(contractions: Iterable[Contraction], out: TextIO) -> None:
+    """Writes the given contractions (including their required symmetrizations) to out, one JSON object per line"""
+    write_jsonl_records(as_records(contractions), out)
+
+
+def records_to_jsonl(records: List[ContractionRecord]) -> str:
+    buffer = io.StringIO()
+    write_jsonl_records(records, buffer)
+    return buffer.getvalue()
+
+
+def to_jsonl(contractions: List[Contraction]) -> str:
+    return records_to_jsonl(list(as_records(contractions)))
+
+
+def iter_jsonl_records(
+    stream: TextIO,
+) -> Iterator[Tuple[Contraction, Optional[Symmetrizations]]]:
+    for line in stream:
+        if len(line.strip()) == 0:
+            continue
+
+        values = json.loads(line)
+        yield (decode_contraction(values), decode_symmetrizations(values))
+
+
+def iter_jsonl(stream: TextIO) -> Iterator[Contraction]:
+    """Lazily reads the contractions from a JSON Lines stream as written by write_jsonl"""
+    for contraction, _ in iter_jsonl_records(stream):
+        yield contraction
+
+
+class _IndexColumns:
+    """The columns of a table of Index objects"""
+
+    def __init__(self, prefix: str, columns: Dict[str, array]):
+        self.id = columns.setdefault(prefix + "_id", array("i"))
+        self.space = columns.setdefault(prefix + "_space", array("b"))
+        self.vertex = columns.setdefault(prefix + "_vertex", array("i"))
+        self.type = columns.setdefault(prefix + "_type", array("b"))
+
+    def extend(self, indices: Iterable[Index]) -> None:
+        for x in indices:
+            self.id.append(x.id)
+            self.space.append(x.space)
+            self.vertex.append(x.vertex)
+            self.type.append(x.type)
+
+
+class _ArcColumns:
+    """The columns of a table of Arc objects (the contracted spaces are stored creators first)"""
+
+    def __init__(self, prefix: str, columns: Dict[str, array]):
+        self.first = columns.setdefault(prefix + "_first", array("i"))
+        self.second = columns.setdefault(prefix + "_second", array("i"))
+        self.space_offsets = columns.setdefault(
+            prefix + "_space_offsets", array("q", [0])
+        )
+        self.n_creators = columns.setdefault(prefix + "_n_creators", array("i"))
+        self.space = columns.setdefault(prefix + "_space", array("b"))
+
+    def extend(self, arcs: Iterable[Arc]) -> None:
+        for x in arcs:
+            self.first.append(x.first_vertex_idx)
+            self.second.append(x.second_vertex_idx)
+            self.n_creators.append(len(x.contracted_spaces.creators))
+            self.space.extend(x.contracted_spaces.creators)
+            self.space.extend(x.contracted_spaces.annihilators)
+            self.space_offsets.append(len(self.space))
+
+
+class ColumnarWriter:
+    """Writes contractions in a column-oriented layout in which every (nested) list of the contraction model is
+    stored as a flat column plus an offsets column (Arrow-style). Contractions are collected in compact typed
+    arrays and written out as a row group (with offsets relative to the group) as soon as row_group_size
+    contractions have been added, so that memory usage is bounded by the size of a single row group. The layout of
+    all row groups is stored in a footer that is written by close()."""
+
+    def __init__(self, out: BinaryIO, row_group_size: int = 4096):
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be at least 1")
+
+        self.out = out
+        self.row_group_size = row_group_size
+        self.strings: Dict[str, int] = {}
+        self.row_groups: List[Dict[str, Any]] = []
+        self.n_contractions = 0
+        self._position = len(columnar_magic)
+        out.write(columnar_magic)
+
+        self._reset()
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _reset(self) -> None:
+        self.columns: Dict[str, array] = {}
+
+        def column(name: str, typecode: str, offsets: bool = False) -> array:
+            self.columns[name] = array(typecode, [0] if offsets else [])
+            return self.columns[name]
+
+        # One row per contraction. The first entry of every tensor range is the result tensor.
+        self.id = column("id", "q")
+        self.factor = column("factor", "d")
+        self.tensor_offsets = column("tensor_offsets", "q", offsets=True)
+        self.arc_offsets = column("arc_offsets", "q", offsets=True)
+        self.xarc_offsets = column("xarc_offsets", "q", offsets=True)
+        self.index_offsets = column("index_offsets", "q", offsets=True)
+        self.n_contraction_indices = column("n_contraction_indices", "i")
+        self.symmetrization_offsets = column(
+            "symmetrization_offsets", "q", offsets=True
+        )
+        # One row per tensor
+        self.tensor_name = column("tensor_name", "i")
+        self.tensor_transposed = column("tensor_transposed", "b")
+        self.tensor_group_offsets = column("tensor_group_offsets", "q", offsets=True)
+        # One row per index group (creators first)
+        self.group_index_offsets = column("group_index_offsets", "q", offsets=True)
+        self.group_n_creators = column("group_n_creators", "i")
+        self.group_indices = _IndexColumns("group_index", self.columns)
+        # One row per arc and per external arc
+        self.arcs = _ArcColumns("arc", self.columns)
+        self.xarcs = _ArcColumns("xarc", self.columns)
+        # Contraction indices followed by external indices of every contraction
+        self.indices = _IndexColumns("index", self.columns)
+        # One row per symmetrization (kind 0: creators, 1: annihilators)
+        self.symmetrization_kind = column("symmetrization_kind", "b")
+        self.symmetrization_index_offsets = column(
+            "symmetrization_index_offsets", "q", offsets=True
+        )
+        self.symmetrization_indices = _IndexColumns(
+            "symmetrization_index", self.columns
+        )
+
+    def _string_id(self, value: str) -> int:
+        if not value in self.strings:
+            self.strings[value] = len(self.strings)
+
+        return self.strings[value]
+
+    def _add_tensor(self, tensor: TensorElement) -> None:
+        self.tensor_name.append(self._string_id(tensor.name))
+        self.tensor_transposed.append(1 if tensor.transposed else 0)
+        for group in tensor.vertex_indices:
+            self.group_n_creators.append(len(group.creators))
+            self.group_indices.extend(group.creators)
+            self.group_indices.extend(group.annihilators)
+            self.group_index_offsets.append(len(self.group_indices.id))
+        self.tensor_group_offsets.append(len(self.group_n_creators))
+
+    def add(self, contraction: Contraction, symmetrizations: Symmetrizations) -> None:
+        self.id.append(contraction.id)
+        self.factor.append(contraction.factor)
+
+        for tensor in [contraction.result] + contraction.tensors:
+            self._add_tensor(tensor)
+        self.tensor_offsets.append(len(self.tensor_name))
+
+        self.arcs.extend(contraction.contractions)
+        self.arc_offsets.append(len(self.arcs.first))
+        self.xarcs.extend(contraction.external_contractions)
+        self.xarc_offsets.append(len(self.xarcs.first))
+
+        self.n_contraction_indices.append(len(contraction.contraction_indices))
+        self.indices.extend(contraction.contraction_indices)
+        self.indices.extend(contraction.external_indices)
+        self.index_offsets.append(len(self.indices.id))
+
+        for kind, symms in enumerate(symmetrizations):
+            for current in symms:
+                self.symmetrization_kind.append(kind)
+                self.symmetrization_indices.extend(sorted_symmetrization(current))
+                self.symmetrization_index_offsets.append(
+                    len(self.symmetrization_indices.id)
+                )
+        self.symmetrization_offsets.append(len(self.symmetrization_kind))
+
+        if len(self.id) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the contractions collected so far as a row group. Every column starts at an 8-byte aligned
+        offset."""
+        if len(self.id) == 0:
+            return
+
+        with profiling.stage("writing"):
+            layout: Dict[str, Dict[str, Any]] = {}
+            for name, values in self.columns.items():
+                data = values.tobytes()
+                layout[name] = {
+                    "type": values.typecode,
+                    "offset": self._position,
+                    "length": len(values),
+                }
+                self.out.write(data)
+                self.out.write(b"\0" * (-len(data) % 8))
+                self._position += len(data) + (-len(data) % 8)
+
+            self.row_groups.append({"n_contractions": len(self.id), "columns": layout})
+            self.n_contractions += len(self.id)
+            self._reset()
+
+    def close(self) -> None:
+        """Writes the remaining contractions and the footer. The file ends with the JSON-encoded footer, its length
+        and the magic string."""
+        self.flush()
+
+        footer = json.dumps(
+            {
+                "version": COLUMNAR_FORMAT_VERSION,
+                "byteorder": sys.byteorder,
+                "n_contractions": self.n_contractions,
+                "strings": list(self.strings.keys()),
+                "row_groups": self.row_groups,
+            }
+        ).encode("utf-8")
+
+        self.out.write(footer)
+        self.out.write(struct.pack("<Q", len(footer)))
+        self.out.write(columnar_magic)
+
+
+def write_columnar_records(
+    records: Iterable[ContractionRecord], out: BinaryIO, row_group_size: int = 4096
+) -> None:
+    """Like write_columnar, but reuses the symmetrizations of the given records that are known already"""
+    with ColumnarWriter(out, row_group_size=row_group_size) as writer:
+        for current, symmetrizations in records:
+            with profiling.stage("columnar emission"), profiling.term(current):
+                writer.add(
+                    current, get_required_symmetrizations(current, symmetrizations)
+                )
+
+
+def write_columnar(
+    contractions: Iterable[Contraction], out: BinaryIO, row_group_size: int = 4096
+) -> None:
+    """Writes the given contractions (including their required symmetrizations) in the columnar binary format"""
+    write_columnar_records(as_records(contractions), out, row_group_size=row_group_size)
+
+
+class ColumnarReader:
+    """Provides access to a file in the columnar format. The file is memory-mapped and columns are exposed as
+    memoryviews into the mapping, so scanning individual columns (e.g. all factors) doesn't require deserializing
+    any contraction. Use contraction(i) to materialize individual contractions."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+
+        # Empty files can't be memory-mapped, so files that are too short to be valid are rejected beforehand
+        trailer_size = 8 + len(columnar_magic)
+        if os.fstat(self._file.fileno()).st_size < len(columnar_magic) + trailer_size:
+            self._file.close()
+            raise ValueError("'{}' is not a columnar contraction file".format(path))
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: Dict[Tuple[int, str], Any] = {}
+
+        if (
+            self._map[: len(columnar_magic)] != columnar_magic
+            or self._map[-len(columnar_magic) :] != columnar_magic
+        ):
+            self.close()
+            raise ValueError("'{}' is not a columnar contraction file".format(path))
+
+        end = len(self._map) - trailer_size
+        (footer_length,) = struct.unpack("<Q", self._map[end : end + 8])
+        footer = json.loads(self._map[end - footer_length : end])
+        if footer["version"] != COLUMNAR_FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                "Unsupported columnar format version {}".format(footer["version"])
+            )
+
+        self._native = footer["byteorder"] == sys.byteorder
+        self.row_groups: List[Dict[str, Any]] = footer["row_groups"]
+        self.strings: List[str] = footer["strings"]
+        self.n_contractions: int = footer["n_contractions"]
+
+        # Index of the first contraction of every row group
+        self._group_starts: List[int] = []
+        start = 0
+        for current in self.row_groups:
+            self._group_starts.append(start)
+            start += current["n_contractions"]
+
+    def __len__(self) -> int:
+        return self.n_contractions
+
+    def __enter__(self) -> "ColumnarReader":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for current in self._views.values():
+            if isinstance(current, memoryview):
+                current.release()
+        self._views.clear()
+        self._map.close()
+        self._file.close()
+
+    def group_column(self, group: int, name: str):
+        """Returns the given column of the given row group as a sequence of numbers (offsets are relative to the
+        row group). The returned object is only valid until the reader is closed."""
+        if not (group, name) in self._views:
+            entry = self.row_groups[group]["columns"][name]
+            start = entry["offset"]
+            size = entry["length"] * array(entry["type"]).itemsize
+            view = memoryview(self._map)[start : start + size].cast(entry["type"])
+
+            if not self._native:
+                swapped = array(entry["type"], view)
+                swapped.byteswap()
+                view.release()
+                self._views[(group, name)] = swapped
+            else:
+                self._views[(group, name)] = view
+
+        return self._views[(group, name)]
+
+    def column(self, name: str) -> Iterator[Any]:
+        """Iterates over the values of the given column in all row groups (only meaningful for columns that don't
+        hold offsets)"""
+        for group in range(len(self.row_groups)):
+            yield from self.group_column(group, name)
+
+    def _indices(self, group: int, prefix: str, begin: int, end: int) -> List[Index]:
+        ids = self.group_column(group, prefix + "_id")
+        spaces = self.group_column(group, prefix + "_space")
+        vertices = self.group_column(group, prefix + "_vertex")
+        types = self.group_column(group, prefix + "_type")
+
+        return [
+            Index(id=ids[i], space=spaces[i], vertex=vertices[i], type=types[i])
+            for i in range(begin, end)
+        ]
+
+    def _arcs(self, group: int, prefix: str, begin: int, end: int) -> List[Arc]:
+        first = self.group_column(group, prefix + "_first")
+        second = self.group_column(group, prefix + "_second")
+        offsets = self.group_column(group, prefix + "_space_offsets")
+        n_creators = self.group_column(group, prefix + "_n_creators")
+        spaces = self.group_column(group, prefix + "_space")
+
+        arcs: List[Arc] = []
+        for i in range(begin, end):
+            values = list(spaces[offsets[i] : offsets[i + 1]])
+            arcs.append(
+                Arc(
+                    first_vertex_idx=first[i],
+                    second_vertex_idx=second[i],
+                    contracted_spaces=IndexSpaces(
+                        creators=values[: n_creators[i]],
+                        annihilators=values[n_creators[i] :],
+                    ),
+                )
+            )
+
+        return arcs
+
+    def _tensor(self, group: int, row: int) -> TensorElement:
+        group_offsets = self.group_column(group, "tensor_group_offsets")
+        index_offsets = self.group_column(group, "group_index_offsets")
+        n_creators = self.group_column(group, "group_n_creators")
+
+        index_groups: List[IndexGroup] = []
+        for x in range(group_offsets[row], group_offsets[row + 1]):
+            indices = self._indices(
+                group, "group_index", index_offsets[x], index_offsets[x + 1]
+            )
+            index_groups.append(
+                IndexGroup(
+                    creators=indices[: n_creators[x]],
+                    annihilators=indices[n_creators[x] :],
+                )
+            )
+
+        return TensorElement(
+            name=self.strings[self.group_column(group, "tensor_name")[row]],
+            vertex_indices=index_groups,
+            transposed=self.group_column(group, "tensor_transposed")[row] != 0,
+        )
+
+    def _locate(self, i: int) -> Tuple[int, int]:
+        """Maps the index of a contraction to its row group and its row within that group"""
+        if i < 0 or i >= self.n_contractions:
+            raise IndexError("Contraction index {} out of range".format(i))
+
+        group = bisect.bisect_right(self._group_starts, i) - 1
+
+        return (group, i - self._group_starts[group])
+
+    def contraction(self, i: int) -> Contraction:
+        group, row = self._locate(i)
+        tensor_offsets = self.group_column(group, "tensor_offsets")
+        arc_offsets = self.group_column(group, "arc_offsets")
+        xarc_offsets = self.group_column(group, "xarc_offsets")
+        index_offsets = self.group_column(group, "index_offsets")
+        n_contraction_indices = self.group_column(group, "n_contraction_indices")[row]
+
+        tensors = [
+            self._tensor(group, x)
+            for x in range(tensor_offsets[row], tensor_offsets[row + 1])
+        ]
+        indices = self._indices(
+            group, "index", index_offsets[row], index_offsets[row + 1]
+        )
+
+        return Contraction(
+            id=self.group_column(group, "id")[row],
+            factor=self.group_column(group, "factor")[row],
+            result=tensors[0],
+            tensors=tensors[1:],
+            contractions=self._arcs(
+                group, "arc", arc_offsets[row], arc_offsets[row + 1]
+            ),
+            external_contractions=self._arcs(
+                group, "xarc", xarc_offsets[row], xarc_offsets[row + 1]
+            ),
+            contraction_indices=indices[:n_contraction_indices],
+            external_indices=indices[n_contraction_indices:],
+        )
+
+    def symmetrizations(self, i: int) -> Symmetrizations:
+        group, row = self._locate(i)
+        offsets = self.group_column(group, "symmetrization_offsets")
+        kinds = self.group_column(group, "symmetrization_kind")
+        index_offsets = self.group_column(group, "symmetrization_index_offsets")
+
+        result: Symmetrizations = ([], [])
+        for x in range(offsets[row], offsets[row + 1]):
+            result[kinds[x]].append(
+                set(
+                    self._indices(
+                        group,
+                        "symmetrization_index",
+                        index_offsets[x],
+                        index_offsets[x + 1],
+                    )
+                )
+            )
+
+        return result
+
+    def __iter__(self) -> Iterator[Contraction]:
+        for i in range(self.n_contractions):
+            yield self.contraction(i)
+
+    def records(self) -> Iterator[ContractionRecord]:
+        """Yields all contractions together with their stored symmetrizations"""
+        for i in range(self.n_contractions):
+            yield (self.contraction(i), self.symmetrizations(i))
+
+
+def serialized_format(path: str) -> Optional[str]:
+    """Returns the structured format the given file is stored in (based on its extension) or None if the file is
+    expected to be a GeCCo export"""
+    # JSON Lines files may be compressed while columnar files have to be uncompressed in order to be memory-mapped
+    for extension, format in serialized_extensions.items():
+        if path.endswith(extension) or (
+            format == "jsonl" and strip_compression_extension(path).endswith(extension)
+        ):
+            return format
+
+    return None
+
+
+def iter_serialized(path: str) -> Iterator[Contraction]:
+    """Lazily reads the contractions stored in the given JSON Lines or columnar file"""
+    format = serialized_format(path)
+
+    if format == "jsonl":
+        with open_export(path) as stream:
+            yield from iter_jsonl(stream)
+    elif format == "columnar":
+        with ColumnarReader(path) as reader:
+            yield from reader
+    else:
+        raise ValueError("'{}' is not a serialized contraction file".format(path))
+
+
+def iter_serialized_records(path: str) -> Iterator[ContractionRecord]:
+    """Like iter_serialized, but yields every contraction together with the symmetrizations stored along with it
+    (None for JSON Lines records that don't contain any), so that they don't have to be determined again
+    """
+    format = serialized_format(path)
+
+    if format == "jsonl":
+        with open_export(path) as stream:
+            yield from iter_jsonl_records(stream)
+    elif format == "columnar":
+        with ColumnarReader(path) as reader:
+            yield from reader.records()
+    else:
+        raise ValueError("'{}' is not a serialized contraction file".format(path))
+
+
+def load_serialized(path: str) -> List[Contraction]:
+    return list(iter_serialized(path))
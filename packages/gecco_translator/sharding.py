@@ -0,0 +1,236 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import re
+
+from .ast import Contraction, TensorElement
+from .serialization import contraction_to_json
+from .translators.symmetry import ContractionRecord, Symmetrizations
+from .translators.tex import contraction_to_tex
+from .translators.sequant import (
+    contraction_to_sequant,
+    tensor_to_sequant,
+    index_to_sequant,
+)
+from .manifest import hash_file
+from .partitions import SpillingPartitions
+from gecco_translator import profiling
+
+SHARD_INDEX_VERSION = 2
+
+# Name of the file listing all shards of a sharded translation
+index_file_name = "index.json"
+
+# Formats that can be sharded together with the function that formats a single term (given its contraction and its
+# symmetrizations, if known) in the respective format
+term_formatters: Dict[str, Callable[[Contraction, Optional[Symmetrizations]], str]] = {
+    "tex": lambda contraction, symmetrizations: contraction_to_tex(
+        contraction, symmetrizations=symmetrizations
+    ),
+    "sequant": contraction_to_sequant,
+    "jsonl": contraction_to_json,
+}
+
+
+@dataclass
+class Shard:
+    # The result tensor in SeQuant notation (e.g. "O2{e1,e2;i1,i2}")
+    result: str
+    # Path of the shard's file, relative to the shard directory
+    file: str
+    n_terms: int
+    # SHA-256 hash of the shard's contents
+    hash: str
+
+
+def shard_name(result: TensorElement) -> str:
+    """Builds a file name (without extension) for the shard of the given result tensor, e.g. "O2_e1e2_i1i2" """
+    name = result.name
+    creators = [x for group in result.vertex_indices for x in group.creators]
+    annihilators = [x for group in result.vertex_indices for x in group.annihilators]
+    if len(creators) > 0 or len(annihilators) > 0:
+        name += "_{}_{}".format(
+            "".join(index_to_sequant(x) for x in creators),
+            "".join(index_to_sequant(x) for x in annihilators),
+        )
+
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+def format_shard(result: str, terms: Iterable[str], format: str) -> Iterator[str]:
+    """Yields the contents of the shard of the given result (in SeQuant notation) piece by piece, so that the terms
+    can be read lazily. For a single result, this produces the same output as the corresponding non-sharded
+    translation."""
+    if format == "sequant":
+        yield result + " = "
+        for current in terms:
+            yield "\n  " + current
+    else:
+        first = True
+        for current in terms:
+            if not first:
+                yield "\n"
+            first = False
+            yield current
+
+    yield "\n"
+
+
+def write_file(path: str, chunks: Iterable[str]) -> str:
+    """Writes the given chunks to the file at the given path and returns the SHA-256 hash of the written contents"""
+    hasher = hashlib.sha256()
+    with open(path, "wb") as out_file:
+        for current in chunks:
+            content = current.encode("utf-8")
+            hasher.update(content)
+            out_file.write(content)
+
+    return hasher.hexdigest()
+
+
+def remove_orphaned_shards(
+    directory: str, previous: List[Shard], shards: List[Shard]
+) -> None:
+    """Removes the files of the given previous shards that are not part of the given current shards (e.g. those of
+    result tensors that no longer appear in the export). Files that weren't listed in the previous index are never
+    touched."""
+    current_files = set(x.file for x in shards)
+    for current in previous:
+        # Only consider plain file names so that a tampered index can't remove files outside the directory
+        if (
+            current.file != os.path.basename(current.file)
+            or current.file in current_files
+        ):
+            continue
+
+        path = os.path.join(directory, current.file)
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def read_previous_index(directory: str) -> List[Shard]:
+    """Returns the shards listed in the index of the given directory or an empty list if there is no (readable)
+    index"""
+    try:
+        return read_index(directory)
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+
+
+def write_shards(
+    records: Iterable[ContractionRecord],
+    directory: str,
+    format: str,
+    max_workers: Optional[int] = None,
+    max_buffered_terms: Optional[int] = None,
+) -> List[Shard]:
+    """Translates the given records into the given format and writes the terms belonging to every result tensor into
+    a file of its own inside the given directory. Additionally, an index file listing all shards (in order of the
+    first appearance of their result), their number of terms and their hashes is written. Shard files from a previous
+    translation (as listed in its index) that don't belong to any of the current results are removed. Terms are
+    formatted as they are read (so only the formatted terms are kept until all records have been processed). If
+    max_buffered_terms is given, at most that many terms are held in memory and the remaining ones are spilled to
+    temporary files. The shard files are written concurrently by a thread pool of the given size."""
+    if not format in term_formatters:
+        raise RuntimeError("Format '{}' doesn't support sharding".format(format))
+
+    format_term = term_formatters[format]
+    n_terms: Dict[TensorElement, int] = dict()
+    results: SpillingPartitions[TensorElement]
+    with SpillingPartitions(max_buffered_terms) as results:
+        for current, symmetrizations in records:
+            with profiling.stage("{} emission".format(format)), profiling.term(current):
+                results.append(current.result, format_term(current, symmetrizations))
+                n_terms[current.result] = n_terms.get(current.result, 0) + 1
+
+        os.makedirs(directory, exist_ok=True)
+        previous = read_previous_index(directory)
+
+        shards: List[Shard] = []
+        futures = []
+        used_names: Dict[str, int] = {}
+        with profiling.stage("writing"), ThreadPoolExecutor(max_workers) as pool:
+            for result, terms in results.items():
+                name = shard_name(result)
+                # Different results might map to the same name (e.g. if they only differ in the used characters)
+                used_names[name] = used_names.get(name, 0) + 1
+                if used_names[name] > 1:
+                    name += "_{}".format(used_names[name])
+
+                file_name = "{}.{}".format(name, format)
+                shards.append(
+                    Shard(
+                        result=tensor_to_sequant(result),
+                        file=file_name,
+                        n_terms=n_terms[result],
+                        hash="",
+                    )
+                )
+                # Every shard's terms are read back (from memory or its spill file) while the shard is written
+                futures.append(
+                    pool.submit(
+                        write_file,
+                        os.path.join(directory, file_name),
+                        format_shard(shards[-1].result, terms, format),
+                    )
+                )
+
+            # Propagate errors that occurred while writing
+            for shard, future in zip(shards, futures):
+                shard.hash = future.result()
+
+            write_index(directory, format, shards)
+            remove_orphaned_shards(directory, previous, shards)
+
+    return shards
+
+
+def write_index(directory: str, format: str, shards: List[Shard]) -> None:
+    contents = {
+        "version": SHARD_INDEX_VERSION,
+        "format": format,
+        "n_terms": sum(x.n_terms for x in shards),
+        "shards": [asdict(x) for x in shards],
+    }
+
+    # Write to a temporary file first so that consumers never see an incomplete index
+    path = os.path.join(directory, index_file_name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as index_file:
+        json.dump(contents, index_file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_index(directory: str) -> List[Shard]:
+    with open(os.path.join(directory, index_file_name), "r") as index_file:
+        contents = json.load(index_file)
+
+    if contents.get("version") != SHARD_INDEX_VERSION:
+        raise ValueError(
+            "Unsupported shard index version {}".format(contents.get("version"))
+        )
+
+    return [Shard(**x) for x in contents["shards"]]
+
+
+def verify_shards(directory: str) -> Optional[str]:
+    """Checks that all shards listed in the index of the given directory exist and are unmodified. Returns None if
+    that is the case and a human-readable reason why the shards are invalid otherwise. Files that aren't listed in
+    the index are ignored.
+    """
+    try:
+        shards = read_index(directory)
+    except (OSError, ValueError, KeyError, TypeError):
+        return "shard index unreadable"
+
+    for current in shards:
+        path = os.path.join(directory, current.file)
+        if not os.path.exists(path):
+            return "shard '{}' missing".format(current.file)
+        if hash_file(path) != current.hash:
+            return "shard '{}' modified".format(current.file)
+
+    return None
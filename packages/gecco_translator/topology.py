@@ -0,0 +1,205 @@
+from typing import Dict, Iterable, List, Tuple
+from dataclasses import dataclass
+
+from .ast import Contraction
+from .headers import read_block_header
+
+# Topology classes of a term. A term is connected if all of its tensors are connected by contraction lines.
+# Disconnected terms are linked if every connected part carries at least one external (open) line and unlinked
+# if at least one part is closed.
+CONNECTED = "connected"
+LINKED = "linked"
+UNLINKED = "unlinked"
+
+topology_classes = [CONNECTED, LINKED, UNLINKED]
+
+# Names that can be used to select multiple classes at once
+topology_aliases: Dict[str, List[str]] = {
+    "disconnected": [LINKED, UNLINKED],
+}
+
+
+@dataclass
+class Topology:
+    # The tensors (as indices into Contraction.tensors) that make up every connected part of the term
+    components: List[List[int]]
+    # Whether the respective component is connected to the result by at least one external line
+    open_components: List[bool]
+
+    @property
+    def classification(self) -> str:
+        if len(self.components) <= 1:
+            return CONNECTED
+        if all(self.open_components):
+            return LINKED
+
+        return UNLINKED
+
+
+def bits(mask: int) -> Iterable[int]:
+    while mask != 0:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def classify(
+    n_tensors: int,
+    vertex_tensors: Dict[int, int],
+    arcs: Iterable[Tuple[int, int]],
+    external_vertices: Iterable[int],
+) -> Topology:
+    """Determines the connected components of a term consisting of n_tensors tensors. vertex_tensors maps (0-based)
+    vertex indices to the tensor the vertex belongs to, arcs are pairs of vertices that are connected by at least
+    one contraction line and external_vertices are the vertices carrying external lines. The adjacency of every
+    tensor is represented as an integer bitmask, so that the components can be found with a few bitwise
+    operations per tensor."""
+    adjacency = [1 << i for i in range(n_tensors)]
+    for first, second in arcs:
+        first_tensor = vertex_tensors[first]
+        second_tensor = vertex_tensors[second]
+        adjacency[first_tensor] |= 1 << second_tensor
+        adjacency[second_tensor] |= 1 << first_tensor
+
+    open_mask = 0
+    for current in external_vertices:
+        open_mask |= 1 << vertex_tensors[current]
+
+    components: List[List[int]] = []
+    open_components: List[bool] = []
+    remaining = (1 << n_tensors) - 1
+    while remaining != 0:
+        # Grow the component of the first remaining tensor until it doesn't change anymore
+        component = remaining & -remaining
+        while True:
+            grown = component
+            for current in bits(component):
+                grown |= adjacency[current]
+            if grown == component:
+                break
+            component = grown
+
+        components.append(list(bits(component)))
+        open_components.append(component & open_mask != 0)
+        remaining &= ~component
+
+    return Topology(components=components, open_components=open_components)
+
+
+def contraction_topology(contraction: Contraction) -> Topology:
+    vertex_tensors: Dict[int, int] = {}
+    for i, tensor in enumerate(contraction.tensors):
+        for group in tensor.vertex_indices:
+            for index in group.creators + group.annihilators:
+                vertex_tensors[index.vertex] = i
+
+    return classify(
+        n_tensors=len(contraction.tensors),
+        vertex_tensors=vertex_tensors,
+        arcs=(
+            (x.first_vertex_idx, x.second_vertex_idx) for x in contraction.contractions
+        ),
+        external_vertices=(
+            x.first_vertex_idx for x in contraction.external_contractions
+        ),
+    )
+
+
+def read_arc_vertices(block: str, tag: str) -> List[Tuple[int, int]]:
+    """Reads the (0-based) vertex pairs of the arcs listed in the given section (e.g. "/ARCS/") of a block"""
+    start = block.find(tag)
+    if start < 0:
+        return []
+
+    pairs: List[Tuple[int, int]] = []
+    for line in block[start + len(tag) :].split("\n")[1:]:
+        parts = line.split()
+        if len(parts) == 0 or parts[0].startswith("/"):
+            break
+
+        pairs.append((int(parts[0]) - 1, int(parts[1]) - 1))
+
+    return pairs
+
+
+def block_topology(block: str) -> Topology:
+    """Determines the topology of the contraction described by the given block text (as produced by
+    parse.iter_blocks) without parsing it. Only the header and the arc sections are read.
+    """
+    header = read_block_header(block)
+
+    # Tensors are ordered by their super vertex
+    positions = {x: i for i, x in enumerate(sorted(set(header.super_vertices)))}
+    vertex_tensors = {i: positions[x] for i, x in enumerate(header.super_vertices)}
+
+    return classify(
+        n_tensors=len(positions),
+        vertex_tensors=vertex_tensors,
+        arcs=read_arc_vertices(block, "/ARCS/"),
+        external_vertices=(x for x, _ in read_arc_vertices(block, "/XARCS/")),
+    )
+
+
+def classify_contractions(contractions: Iterable[Contraction]) -> List[str]:
+    return [contraction_topology(x).classification for x in contractions]
+
+
+def group_by_topology(
+    contractions: Iterable[Contraction],
+) -> Dict[str, List[Contraction]]:
+    """Groups the given contractions by their topology class (retaining their order within every class)"""
+    groups: Dict[str, List[Contraction]] = {x: [] for x in topology_classes}
+    for current in contractions:
+        groups[contraction_topology(current).classification].append(current)
+
+    return groups
+
+
+def expand_topology_classes(names: Iterable[str]) -> List[str]:
+    """Resolves aliases like "disconnected" into the topology classes they stand for"""
+    classes: List[str] = []
+    for current in names:
+        if current in topology_aliases:
+            classes.extend(topology_aliases[current])
+        elif current in topology_classes:
+            classes.append(current)
+        else:
+            raise ValueError("Unknown topology class '{}'".format(current))
+
+    return classes
+
+
+class TopologyStatistics:
+    """Counts the terms of every topology class per result tensor"""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def add(self, result: str, topology: Topology) -> None:
+        if not result in self.counts:
+            self.counts[result] = {x: 0 for x in topology_classes}
+
+        self.counts[result][topology.classification] += 1
+
+    def add_contraction(self, contraction: Contraction) -> None:
+        self.add(contraction.result.name, contraction_topology(contraction))
+
+    def totals(self) -> Dict[str, int]:
+        return {
+            x: sum(counts[x] for counts in self.counts.values())
+            for x in topology_classes
+        }
+
+    def report(self) -> str:
+        lines = [
+            "{:<24}".format("Result")
+            + "".join(" {:>10}".format(x) for x in topology_classes + ["total"])
+        ]
+        for result, counts in list(self.counts.items()) + [("Total", self.totals())]:
+            values = [counts[x] for x in topology_classes]
+            lines.append(
+                "{:<24}".format(result)
+                + "".join(" {:>10}".format(x) for x in values + [sum(values)])
+            )
+
+        return "\n".join(lines)
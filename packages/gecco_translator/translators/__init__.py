@@ -1,3 +1,4 @@
-from .tex import to_tex
-from .sequant import to_sequant
+from .tex import to_tex, records_to_tex
+from .sequant import to_sequant, records_to_sequant
 from .symmetry import get_required_symmetrizations
+from .streaming import write_translation, write_translation_records
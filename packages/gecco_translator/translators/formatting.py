@@ -0,0 +1,67 @@
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+from fractions import Fraction
+from functools import lru_cache
+
+from gecco_translator.ast import Index, TensorElement
+
+# Maximum number of entries kept in every formatting cache
+cache_size = 4096
+
+# The properties of an index that are relevant for formatting: (space, id)
+Label = Tuple[int, int]
+# The properties of a tensor that are relevant for formatting: its name and the labels of the creators and
+# annihilators of every vertex
+TensorKey = Tuple[str, Tuple[Tuple[Tuple[Label, ...], Tuple[Label, ...]], ...]]
+
+Function = TypeVar("Function", bound=Callable)
+
+_caches: List[Any] = []
+
+
+def memoized(function: Function) -> Function:
+    """Wraps the given formatting function in a cache of bounded size. As the arguments are used as cache keys, they
+    have to be immutable (use the keys produced by tensor_key and index_label instead of AST objects).
+    """
+    cached = lru_cache(maxsize=cache_size)(function)
+    _caches.append(cached)
+
+    return cached  # type: ignore
+
+
+def index_label(index: Index) -> Label:
+    return (index.space, index.id)
+
+
+def tensor_key(tensor: TensorElement) -> TensorKey:
+    # This is called for every tensor occurrence, so it has to be cheap (list comprehensions are considerably
+    # faster than generator expressions here)
+    return (
+        tensor.name,
+        tuple(
+            [
+                (
+                    tuple([(x.space, x.id) for x in group.creators]),
+                    tuple([(x.space, x.id) for x in group.annihilators]),
+                )
+                for group in tensor.vertex_indices
+            ]
+        ),
+    )
+
+
+@memoized
+def factor_to_fraction(factor: float) -> Fraction:
+    return Fraction(str(factor)).limit_denominator()
+
+
+def clear_caches() -> None:
+    for current in _caches:
+        current.cache_clear()
+
+
+def cache_statistics() -> Dict[str, Any]:
+    """Returns the hit and miss counts of all formatting caches, keyed by the name of the cached function"""
+    return {
+        "{}.{}".format(x.__module__, x.__qualname__): x.cache_info()._asdict()
+        for x in _caches
+    }
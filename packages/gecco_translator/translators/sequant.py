@@ -1,34 +1,41 @@
 from typing import List, Set, Optional, Dict
 
-from fractions import Fraction
 import math
 from copy import deepcopy
 
-from .symmetry import get_required_symmetrizations
+from .symmetry import (
+    ContractionRecord,
+    Symmetrizations,
+    as_records,
+    get_required_symmetrizations,
+)
+from . import formatting
+from .formatting import TensorKey
 from gecco_translator.ast import Index, TensorElement, Contraction, IndexGroup
+from gecco_translator import profiling
 
 
-def index_to_sequant(index: Index) -> str:
+@formatting.memoized
+def label_to_sequant(space: int, id: int) -> str:
     # Labels for occupied, virtual and active indices
-    base_label = ["i", "e", "u"][index.space]
-    return "{}{}".format(base_label, index.id + 1)
+    base_label = ["i", "e", "u"][space]
+    return "{}{}".format(base_label, id + 1)
 
 
-def tensor_to_sequant(tensor: TensorElement) -> str:
-    creators = [
-        index_to_sequant(x) for group in tensor.vertex_indices for x in group.creators
-    ]
-    annihilators = [
-        index_to_sequant(x)
-        for group in tensor.vertex_indices
-        for x in group.annihilators
-    ]
+def index_to_sequant(index: Index) -> str:
+    return label_to_sequant(index.space, index.id)
+
+
+@formatting.memoized
+def tensor_key_to_sequant(key: TensorKey) -> str:
+    name, groups = key
+    creators = [label_to_sequant(*x) for group in groups for x in group[0]]
+    annihilators = [label_to_sequant(*x) for group in groups for x in group[1]]
 
     if len(creators) == 0 and len(annihilators) == 0:
         # This "tensor" has no indices, i.e. it is a scalar
-        return tensor.name
+        return name
 
-    name = tensor.name
     if name == "H":
         if len(creators) == 1:
             name = "f"
@@ -38,6 +45,30 @@ def tensor_to_sequant(tensor: TensorElement) -> str:
     return "{}{{{};{}}}".format(name, ",".join(creators), ",".join(annihilators))
 
 
+def tensor_to_sequant(tensor: TensorElement) -> str:
+    return tensor_key_to_sequant(formatting.tensor_key(tensor))
+
+
+@formatting.memoized
+def factor_to_sequant(factor: float) -> str:
+    """Formats the sign and (if it isn't one) the absolute value of the given factor"""
+    fraction = formatting.factor_to_fraction(factor)
+    formatted = ""
+    if fraction < 0:
+        formatted += "- "
+        fraction *= -1
+    else:
+        formatted += "+ "
+
+    if fraction != 1:
+        if fraction.denominator == 1:
+            formatted += "{} ".format(fraction.numerator)
+        else:
+            formatted += "{}/{} ".format(fraction.numerator, fraction.denominator)
+
+    return formatted
+
+
 def merge_index_groups(groups: List[IndexGroup]) -> IndexGroup:
     creators: List[Index] = []
     annihilators: List[Index] = []
@@ -113,50 +144,59 @@ def symmetrizations_to_sequant(
     return formatted
 
 
-def to_sequant(contractions: List[Contraction]) -> str:
-    if len(contractions) == 0:
-        return ""
+def contraction_to_sequant(
+    contraction: Contraction, symmetrizations: Optional[Symmetrizations] = None
+) -> str:
+    """Translates a single contraction into a SeQuant term (including its leading sign). The required
+    symmetrizations are determined unless they are given."""
+    formatted = factor_to_sequant(contraction.factor)
 
-    results: Dict[TensorElement, List[Contraction]] = dict()
-    for current in contractions:
-        if not current.result in results:
-            results[current.result] = []
+    creator_symm, annihilator_symm = get_required_symmetrizations(
+        contraction, symmetrizations
+    )
+    symm_op = symmetrizations_to_sequant(
+        creator_symm, annihilator_symm, contraction.result.vertex_indices
+    )
+    if symm_op is not None:
+        formatted += symm_op + " "
 
-        results[current.result].append(current)
+    for current_tensor in contraction.tensors:
+        formatted += tensor_to_sequant(current_tensor) + " "
 
-    formatted = ""
+    return formatted
 
-    for result, associated_contractions in results.items():
-        if len(formatted) > 0:
-            formatted += "\n\n"
 
-        formatted += tensor_to_sequant(result) + " = "
+def records_to_sequant(records: List[ContractionRecord]) -> str:
+    """Like to_sequant, but reuses the symmetrizations of the given records that are known already"""
+    if len(records) == 0:
+        return ""
 
-        for current in associated_contractions:
-            assert current.result == result
-            formatted += "\n  "
+    with profiling.stage("sequant emission"):
+        results: Dict[TensorElement, List[ContractionRecord]] = dict()
+        for record in records:
+            contraction = record[0]
+            if not contraction.result in results:
+                results[contraction.result] = []
 
-            factor = Fraction(str(current.factor)).limit_denominator()
-            if factor < 0:
-                formatted += "- "
-                factor *= -1
-            else:
-                formatted += "+ "
+            results[contraction.result].append(record)
 
-            if factor != 1:
-                if factor.denominator == 1:
-                    formatted += "{} ".format(factor.numerator)
-                else:
-                    formatted += "{}/{} ".format(factor.numerator, factor.denominator)
+        formatted = ""
 
-            creator_symm, annihilator_symm = get_required_symmetrizations(current)
-            symm_op = symmetrizations_to_sequant(
-                creator_symm, annihilator_symm, current.result.vertex_indices
-            )
-            if symm_op is not None:
-                formatted += symm_op + " "
+        for result, associated_records in results.items():
+            if len(formatted) > 0:
+                formatted += "\n\n"
 
-            for current_tensor in current.tensors:
-                formatted += tensor_to_sequant(current_tensor) + " "
+            formatted += tensor_to_sequant(result) + " = "
 
-    return formatted
+            for current, symmetrizations in associated_records:
+                assert current.result == result
+                with profiling.term(current):
+                    formatted += "\n  " + contraction_to_sequant(
+                        current, symmetrizations
+                    )
+
+        return formatted
+
+
+def to_sequant(contractions: List[Contraction]) -> str:
+    return records_to_sequant(list(as_records(contractions)))
@@ -0,0 +1,94 @@
+from typing import Iterable, Optional, TextIO
+
+from .tex import contraction_to_tex
+from .sequant import contraction_to_sequant, tensor_to_sequant
+from .symmetry import ContractionRecord, as_records
+from gecco_translator.ast import Contraction, TensorElement
+from gecco_translator.partitions import SpillingPartitions
+from gecco_translator import profiling, serialization
+
+
+def write_tex(
+    records: Iterable[ContractionRecord], out: TextIO, factorize: bool = False
+) -> None:
+    """Writes the TeX translation of the given records to out as they are produced. The output is identical to that
+    of to_tex."""
+    first = True
+    for current, symmetrizations in records:
+        with profiling.stage("tex emission"), profiling.term(current):
+            line = contraction_to_tex(
+                current, factorize=factorize, symmetrizations=symmetrizations
+            )
+
+        with profiling.stage("writing"):
+            if not first:
+                out.write("\n")
+            out.write(line)
+        first = False
+
+
+def write_sequant(
+    records: Iterable[ContractionRecord],
+    out: TextIO,
+    max_buffered_terms: Optional[int] = None,
+) -> None:
+    """Writes the SeQuant translation of the given records to out. The output is identical to that of to_sequant.
+    As terms have to be grouped by their result tensor, the formatted terms (not the contractions themselves) are
+    kept until all records have been processed. If max_buffered_terms is given, at most that many terms are held in
+    memory and the remaining ones are spilled to temporary files.
+    """
+    results: SpillingPartitions[TensorElement]
+    with SpillingPartitions(max_buffered_terms) as results:
+        for current, symmetrizations in records:
+            with profiling.stage("sequant emission"), profiling.term(current):
+                results.append(
+                    current.result, contraction_to_sequant(current, symmetrizations)
+                )
+
+        with profiling.stage("writing"):
+            first = True
+            for result, terms in results.items():
+                if not first:
+                    out.write("\n\n")
+                first = False
+
+                out.write(tensor_to_sequant(result) + " = ")
+                for current in terms:
+                    out.write("\n  " + current)
+
+
+def write_translation_records(
+    records: Iterable[ContractionRecord],
+    format: str,
+    out: TextIO,
+    factorize: bool = False,
+    max_buffered_terms: Optional[int] = None,
+) -> None:
+    """Like write_translation, but reuses the symmetrizations of the given records that are known already"""
+    if format == "tex":
+        write_tex(records, out, factorize=factorize)
+    elif format == "sequant":
+        write_sequant(records, out, max_buffered_terms=max_buffered_terms)
+    elif format == "jsonl":
+        serialization.write_jsonl_records(records, out)
+    else:
+        raise RuntimeError("Unsupported target format '{}'".format(format))
+
+
+def write_translation(
+    contractions: Iterable[Contraction],
+    format: str,
+    out: TextIO,
+    factorize: bool = False,
+    max_buffered_terms: Optional[int] = None,
+) -> None:
+    """Translates the given (possibly lazily produced) contractions into the given format and writes the result to
+    out, without keeping all contractions in memory at the same time. factorize only affects the TeX output (see
+    to_tex) and max_buffered_terms only the SeQuant output (see write_sequant)."""
+    write_translation_records(
+        as_records(contractions),
+        format=format,
+        out=out,
+        factorize=factorize,
+        max_buffered_terms=max_buffered_terms,
+    )
@@ -1,9 +1,22 @@
-from typing import List, Tuple, Optional, Set
+from typing import Iterable, Iterator, List, Tuple, Optional, Set
 
 from itertools import product
-import copy
+import dataclasses
 
-from gecco_translator.ast import Contraction, Index, TensorElement
+from gecco_translator.ast import Contraction, Index, IndexGroup, TensorElement
+from gecco_translator import profiling
+
+# The sets of creator and annihilator indices that have to be antisymmetrized
+Symmetrizations = Tuple[List[Set[Index]], List[Set[Index]]]
+
+# A contraction together with its required symmetrizations (None if they haven't been determined yet)
+ContractionRecord = Tuple[Contraction, Optional[Symmetrizations]]
+
+
+def as_records(contractions: Iterable[Contraction]) -> Iterator[ContractionRecord]:
+    """Pairs the given contractions with unknown symmetrizations, which are determined when they are needed"""
+    for current in contractions:
+        yield (current, None)
 
 
 def strip_index(idx: Index) -> Index:
@@ -11,23 +24,27 @@ def strip_index(idx: Index) -> Index:
 
 
 def strip_tensor(tensor: TensorElement) -> TensorElement:
-    for i in range(len(tensor.vertex_indices)):
-        current = tensor.vertex_indices[i]
-        current.creators = [strip_index(x) for x in current.creators]
-        current.annihilators = [strip_index(x) for x in current.annihilators]
-        tensor.vertex_indices[i] = current
-
-    return tensor
+    return TensorElement(
+        name=tensor.name,
+        vertex_indices=[
+            IndexGroup(
+                creators=[strip_index(x) for x in current.creators],
+                annihilators=[strip_index(x) for x in current.annihilators],
+            )
+            for current in tensor.vertex_indices
+        ],
+        transposed=tensor.transposed,
+    )
 
 
 def strip_contraction(contr: Contraction) -> Contraction:
-    contr_copy = copy.deepcopy(contr)
-
-    contr_copy.result = strip_tensor(contr_copy.result)
-    for i in range(len(contr_copy.tensors)):
-        contr_copy.tensors[i] = strip_tensor(contr_copy.tensors[i])
-
-    return contr_copy
+    # Only the tensors are replaced by stripped copies - all other (shared) members are never modified, so there is
+    # no need for a (costly) deep copy of the entire contraction
+    return dataclasses.replace(
+        contr,
+        result=strip_tensor(contr.result),
+        tensors=[strip_tensor(x) for x in contr.tensors],
+    )
 
 
 def find_index(idx: Index, tensors: List[TensorElement]) -> Tuple[int, int]:
@@ -103,6 +120,25 @@ def condense_symmetrizations(symmetrizations: List[Set[Index]]) -> List[Set[Inde
 
 
 def get_required_symmetrizations(
+    orig_contraction: Contraction, known: Optional[Symmetrizations] = None
+) -> Symmetrizations:
+    """Determines the symmetrizations required by the given contraction. If they are known already (e.g. because
+    they have been read from the block cache), they are passed as known and are not determined again.
+    """
+    if known is not None:
+        creator_symms, annihilator_symms = known
+    else:
+        with profiling.stage("symmetrization"):
+            creator_symms, annihilator_symms = determine_required_symmetrizations(
+                orig_contraction
+            )
+
+    profiling.note_symmetrizations(creator_symms, annihilator_symms)
+
+    return (creator_symms, annihilator_symms)
+
+
+def determine_required_symmetrizations(
     orig_contraction: Contraction,
 ) -> Tuple[List[Set[Index]], List[Set[Index]]]:
     # Ensure all indices only differ in relevant properties
@@ -1,25 +1,38 @@
 from typing import List, Optional, Set
 
-from fractions import Fraction
-
-from .symmetry import get_required_symmetrizations
+from .symmetry import (
+    ContractionRecord,
+    Symmetrizations,
+    as_records,
+    get_required_symmetrizations,
+)
+from . import formatting
+from .formatting import TensorKey
 
 from gecco_translator.ast import Index, TensorElement, Contraction
+from gecco_translator.topology import contraction_topology
+from gecco_translator import profiling
+
+
+@formatting.memoized
+def label_to_tex(space: int, id: int) -> str:
+    base_label = ["o", "v", "a"][space]
+    return "{}_{}".format(base_label, id + 1)
 
 
 def index_to_tex(index: Index) -> str:
-    base_label = ["o", "v", "a"][index.space]
-    return "{}_{}".format(base_label, index.id + 1)
+    return label_to_tex(index.space, index.id)
 
 
-def tensor_to_tex(tensor: TensorElement) -> str:
-    tex = tensor.name
+@formatting.memoized
+def tensor_key_to_tex(key: TensorKey) -> str:
+    tex, groups = key
 
     creators: List[str] = []
     annihilators: List[str] = []
-    for current_idx_group in tensor.vertex_indices:
-        creators.extend([index_to_tex(x) for x in current_idx_group.creators])
-        annihilators.extend([index_to_tex(x) for x in current_idx_group.annihilators])
+    for current_creators, current_annihilators in groups:
+        creators.extend([label_to_tex(*x) for x in current_creators])
+        annihilators.extend([label_to_tex(*x) for x in current_annihilators])
 
     if len(creators) > 0 or len(annihilators) > 0:
         tex += "^{" + " ".join(annihilators) + "}"
@@ -28,6 +41,31 @@ def tensor_to_tex(tensor: TensorElement) -> str:
     return tex
 
 
+def tensor_to_tex(tensor: TensorElement) -> str:
+    return tensor_key_to_tex(formatting.tensor_key(tensor))
+
+
+@formatting.memoized
+def factor_to_tex(factor: float) -> str:
+    """Formats the sign and (if it isn't one) the absolute value of the given factor"""
+    fraction = formatting.factor_to_fraction(factor)
+    tex = ""
+    if fraction < 0:
+        fraction *= -1
+        tex += " - "
+    else:
+        tex += " + "
+
+    if fraction != 1:
+        if fraction.denominator == 1:
+            tex += str(fraction.numerator)
+        else:
+            tex += r"\frac{{{}}}{{{}}}".format(fraction.numerator, fraction.denominator)
+        tex += " "
+
+    return tex
+
+
 def symmetrization_to_idx_seq(symms: List[Set[Index]]) -> List[str]:
     seq: List[str] = []
     for current_set in symms:
@@ -50,36 +88,58 @@ def symmetrizations_to_tex(
     )
 
 
-def to_tex(contractions: List[Contraction]) -> str:
-    tex = ""
+def records_to_tex(records: List[ContractionRecord], factorize: bool = False) -> str:
+    """Like to_tex, but reuses the symmetrizations of the given records that are known already"""
+    with profiling.stage("tex emission"):
+        lines: List[str] = []
+        for current, symmetrizations in records:
+            with profiling.term(current):
+                lines.append(
+                    contraction_to_tex(
+                        current, factorize=factorize, symmetrizations=symmetrizations
+                    )
+                )
 
-    for current in contractions:
-        if len(tex) > 0:
-            tex += "\n"
+        return "\n".join(lines)
 
-        tex += tensor_to_tex(current.result)
 
-        factor = Fraction(str(current.factor)).limit_denominator()
-        tex += r" \leftarrow "
-        if factor < 0:
-            factor *= -1
-            tex += " - "
-        else:
-            tex += " + "
-
-        if factor != 1:
-            if factor.denominator == 1:
-                tex += str(factor.numerator)
-            else:
-                tex += r"\frac{{{}}}{{{}}}".format(factor.numerator, factor.denominator)
-            tex += " "
-
-        creator_symm, annihilator_symm = get_required_symmetrizations(current)
-        symm_op = symmetrizations_to_tex(creator_symm, annihilator_symm)
-        if symm_op is not None:
-            tex += symm_op + " "
-
-        for current_tensor in current.tensors:
-            tex += tensor_to_tex(current_tensor) + " "
+def to_tex(contractions: List[Contraction], factorize: bool = False) -> str:
+    return records_to_tex(list(as_records(contractions)), factorize=factorize)
+
+
+def contraction_to_tex(
+    contraction: Contraction,
+    factorize: bool = False,
+    symmetrizations: Optional[Symmetrizations] = None,
+) -> str:
+    """Translates a single contraction into a line of TeX code. If factorize is set, disconnected terms are written
+    as a product of their connected parts. The required symmetrizations are determined unless they are given.
+    """
+    tex = tensor_to_tex(contraction.result)
+
+    tex += r" \leftarrow "
+    tex += factor_to_tex(contraction.factor)
+
+    creator_symm, annihilator_symm = get_required_symmetrizations(
+        contraction, symmetrizations
+    )
+    symm_op = symmetrizations_to_tex(creator_symm, annihilator_symm)
+    if symm_op is not None:
+        tex += symm_op + " "
+
+    components = (
+        contraction_topology(contraction).components
+        if factorize
+        else [list(range(len(contraction.tensors)))]
+    )
+    for current_component in components:
+        if len(components) > 1:
+            tex += r"\left( "
+
+        for i in current_component:
+            tex += tensor_to_tex(contraction.tensors[i]) + " "
+
+        if len(components) > 1:
+            tex += r"\right) "
 
     return tex
@@ -0,0 +1,159 @@
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from collections import Counter
+
+from .ast import Contraction, Index
+from .filters import space_signature, tensor_signature
+from .headers import BlockHeader, VertexHeader
+from .translators.formatting import factor_to_fraction
+
+# The histograms collected by WorkloadStatistics together with the titles under which they are reported
+histogram_titles: Dict[str, str] = {
+    "results": "Terms per result tensor",
+    "tensors": "Tensor names",
+    "ranks": "Tensor ranks (creators,annihilators)",
+    "signatures": "Index-space signatures",
+    "vertices": "Vertices per term",
+    "symmetrizers": "Symmetrizer group sizes",
+    "factors": "Factors",
+}
+
+# Histograms whose keys are numbers (and are thus reported in the order of their keys instead of by count)
+numeric_histograms = {"vertices", "symmetrizers"}
+
+# The properties of a tensor that are counted: name, rank and index-space signature
+TensorProperties = Tuple[str, str, str]
+
+
+def header_tensors(header: BlockHeader) -> List[TensorProperties]:
+    """Determines the properties of the tensors of the term described by the given header. As in the parsed
+    contraction, all vertices belonging to the same super vertex form a single tensor.
+    """
+    groups: Dict[int, List[VertexHeader]] = {}
+    for super_vertex, vertex in zip(header.super_vertices, header.vertices):
+        groups.setdefault(super_vertex, []).append(vertex)
+
+    return [
+        (
+            vertices[0].name,
+            "{},{}".format(
+                sum(len(x.creator_spaces) for x in vertices),
+                sum(len(x.annihilator_spaces) for x in vertices),
+            ),
+            space_signature((x.creator_spaces, x.annihilator_spaces) for x in vertices),
+        )
+        for _, vertices in sorted(groups.items())
+    ]
+
+
+class WorkloadStatistics:
+    """Collects histograms describing the workload represented by a sequence of terms. Every term is only looked at
+    once, so that the statistics of a streamed export are determined in a single pass with memory proportional to
+    the number of distinct histogram keys (rather than the number of terms). All histograms except for the
+    symmetrizer sizes can be determined from the block headers alone. The symmetrizer sizes require parsing and
+    symmetry analysis and are thus only collected (via add_symmetrizations) if symmetrizers is set.
+    """
+
+    def __init__(self, symmetrizers: bool = False) -> None:
+        self.n_terms = 0
+        self.n_tensors = 0
+        self.histograms: Dict[str, Counter] = {
+            x: Counter()
+            for x in histogram_titles
+            if symmetrizers or x != "symmetrizers"
+        }
+
+    def _add_term(
+        self,
+        result: str,
+        tensors: List[TensorProperties],
+        n_vertices: int,
+        factor: float,
+    ) -> None:
+        self.n_terms += 1
+        self.n_tensors += len(tensors)
+
+        self.histograms["results"][result] += 1
+        for name, rank, signature in tensors:
+            self.histograms["tensors"][name] += 1
+            self.histograms["ranks"][rank] += 1
+            self.histograms["signatures"][signature] += 1
+        self.histograms["vertices"][n_vertices] += 1
+        self.histograms["factors"][str(factor_to_fraction(factor))] += 1
+
+    def add_header(self, header: BlockHeader) -> None:
+        self._add_term(
+            result="{}[{}]".format(
+                header.result,
+                space_signature(
+                    (x.creator_spaces, x.annihilator_spaces)
+                    for x in header.result_spaces
+                ),
+            ),
+            tensors=header_tensors(header),
+            n_vertices=len(header.vertices),
+            factor=header.factor,
+        )
+
+    def add(self, contraction: Contraction) -> None:
+        result = contraction.result
+        self._add_term(
+            result="{}[{}]".format(result.name, tensor_signature(result)),
+            tensors=[
+                (
+                    x.name,
+                    "{},{}".format(
+                        sum(len(group.creators) for group in x.vertex_indices),
+                        sum(len(group.annihilators) for group in x.vertex_indices),
+                    ),
+                    tensor_signature(x),
+                )
+                for x in contraction.tensors
+            ],
+            n_vertices=sum(len(x.vertex_indices) for x in contraction.tensors),
+            factor=contraction.factor,
+        )
+
+    def add_symmetrizations(
+        self, creator_symms: List[Set[Index]], annihilator_symms: List[Set[Index]]
+    ) -> None:
+        for current in creator_symms + annihilator_symms:
+            self.histograms["symmetrizers"][len(current)] += 1
+
+    def add_all(self, contractions: Iterable[Contraction]) -> None:
+        for current in contractions:
+            self.add(current)
+
+    def sorted_histogram(self, name: str) -> List[Tuple[Any, int]]:
+        if name in numeric_histograms:
+            return sorted(self.histograms[name].items())
+
+        # Most frequent first (ties are kept in order of appearance)
+        return self.histograms[name].most_common()
+
+    def to_json(self) -> Dict[str, Any]:
+        contents: Dict[str, Any] = {
+            "n_terms": self.n_terms,
+            "n_tensors": self.n_tensors,
+        }
+        for name in self.histograms:
+            contents[name] = {
+                str(key): count for key, count in self.sorted_histogram(name)
+            }
+
+        return contents
+
+    def report(self) -> str:
+        lines = [
+            "Terms: {}".format(self.n_terms),
+            "Tensors: {}".format(self.n_tensors),
+        ]
+        for name in self.histograms:
+            histogram = self.sorted_histogram(name)
+            lines.append("")
+            lines.append(
+                "{} ({} distinct)".format(histogram_titles[name], len(histogram))
+            )
+            for key, count in histogram:
+                lines.append("  {:<32} {:>10}".format(str(key), count))
+
+        return "\n".join(lines)
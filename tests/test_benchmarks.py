@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+import dataclasses
+import os
+import sys
+from importlib.util import find_spec, module_from_spec, spec_from_file_location
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.parse import parse
+
+# The benchmark script is not part of the package and is thus loaded from its file
+spec = spec_from_file_location(
+    "run_benchmarks",
+    os.path.join(script_dir, "..", "benchmarks", "run_benchmarks.py"),
+)
+assert spec is not None and spec.loader is not None
+run_benchmarks = module_from_spec(spec)
+spec.loader.exec_module(run_benchmarks)
+
+
+def results(timings):
+    return {"results": {"input": {"timings": timings}}}
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_find_regressions(self):
+        baseline = results({"parsing": 1.0, "to_tex": 0.001, "removed": 1.0})
+
+        def find(timings, threshold=0.25, min_difference=0.01):
+            return run_benchmarks.find_regressions(
+                results(timings),
+                baseline,
+                threshold=threshold,
+                min_difference=min_difference,
+            )
+
+        self.assertEqual(find({"parsing": 1.2, "to_tex": 0.001}), [])
+        self.assertEqual(len(find({"parsing": 1.3})), 1)
+        self.assertIn("input [parsing]", find({"parsing": 1.3})[0])
+        self.assertEqual(find({"parsing": 1.3}, threshold=0.5), [])
+
+        # Doubling a tiny timing is below the minimum difference
+        self.assertEqual(find({"to_tex": 0.002}), [])
+        self.assertEqual(len(find({"to_tex": 0.002}, min_difference=0.0)), 1)
+
+        # Measurements without a counterpart in the baseline are ignored
+        self.assertEqual(find({"added": 10.0}), [])
+        self.assertEqual(
+            run_benchmarks.find_regressions(
+                {"results": {"other": {"timings": {"parsing": 10.0}}}},
+                baseline,
+                threshold=0.25,
+                min_difference=0.01,
+            ),
+            [],
+        )
+
+    def test_scale_export(self):
+        path = os.path.join(script_dir, "single_reference", "CCD_RES.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        scaled = parse(run_benchmarks.scale_export(Path(path).read_text(), 3))
+        self.assertEqual([x.id for x in scaled], list(range(3 * len(contractions))))
+        self.assertEqual(
+            [dataclasses.replace(x, id=0) for x in scaled],
+            [dataclasses.replace(x, id=0) for x in contractions] * 3,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
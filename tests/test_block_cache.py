@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+import io
+import os
+import pickle
+import sys
+import tempfile
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.block_cache import BlockCache, parse_blocks_cached
+from gecco_translator.parse import parse, iter_blocks
+from gecco_translator.translators.symmetry import determine_required_symmetrizations
+
+
+def renumber(blocks):
+    """Assembles an export from the given blocks, assigning consecutive IDs"""
+    return (
+        "".join(
+            "[CONTR] #{:>9}\n".format(i + 1) + block[block.index("\n") + 1 :]
+            for i, block in enumerate(blocks)
+        )
+        + "[END]\n"
+    )
+
+
+class TestBlockCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES1.EXPORT")
+        self.contents = Path(path).read_text()
+        self.blocks = list(iter_blocks(io.StringIO(self.contents)))
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_cold_and_warm(self):
+        expected = parse(self.contents)
+
+        for n_hits in [0, len(expected)]:
+            with self.subTest(n_hits=n_hits):
+                cache = BlockCache(self.cache_dir.name)
+                records = list(parse_blocks_cached(self.blocks, cache, batch_size=16))
+                self.assertEqual([x for x, _ in records], expected)
+                self.assertEqual(cache.hits, n_hits)
+                self.assertEqual(cache.misses, len(expected) - n_hits)
+
+                for current, symmetrizations in records:
+                    self.assertEqual(
+                        symmetrizations, determine_required_symmetrizations(current)
+                    )
+
+    def test_edited_export(self):
+        list(parse_blocks_cached(self.blocks, BlockCache(self.cache_dir.name)))
+
+        # Dropping the first term shifts the IDs of all others
+        edited = renumber(self.blocks[1:])
+        cache = BlockCache(self.cache_dir.name)
+        contractions = [
+            x for x, _ in parse_blocks_cached(iter_blocks(io.StringIO(edited)), cache)
+        ]
+        self.assertEqual(contractions, parse(edited))
+        self.assertEqual(cache.misses, 0)
+
+        # Only the changed term is parsed again
+        changed = self.blocks[0].replace("/FACTOR/         1.0", "/FACTOR/         2.0")
+        self.assertNotEqual(changed, self.blocks[0])
+        edited = renumber([changed] + self.blocks[1:])
+        cache = BlockCache(self.cache_dir.name)
+        contractions = [
+            x for x, _ in parse_blocks_cached(iter_blocks(io.StringIO(edited)), cache)
+        ]
+        self.assertEqual(contractions, parse(edited))
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(contractions[0].factor, 2 * parse(self.contents)[0].factor)
+
+    def test_corrupt_entries_are_misses(self):
+        expected = parse(self.contents)
+        list(parse_blocks_cached(self.blocks, BlockCache(self.cache_dir.name)))
+
+        cache = BlockCache(self.cache_dir.name)
+        corrupted = [
+            b"garbage",
+            b"",
+            # A truncated entry (as left behind by an interrupted write)
+            pickle.dumps((expected[1], ([], [])))[:20],
+            # Valid pickles of the wrong shape
+            pickle.dumps("entry"),
+            pickle.dumps((1, 2, 3)),
+        ]
+        paths = [cache._path(cache.key(x)) for x in self.blocks[: len(corrupted)]]
+        for path, contents in zip(paths, corrupted):
+            Path(path).write_bytes(contents)
+
+        records = list(parse_blocks_cached(self.blocks, cache))
+        self.assertEqual([x for x, _ in records], expected)
+        self.assertEqual(cache.misses, len(corrupted))
+
+        # The corrupt entries were replaced by valid ones
+        cache = BlockCache(self.cache_dir.name)
+        list(parse_blocks_cached(self.blocks, cache))
+        self.assertEqual(cache.misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from unittest import mock
+import io
+import os
+import shutil
+import sys
+import tempfile
+from typing import List
+from importlib.util import find_spec, module_from_spec, spec_from_file_location
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.sharding import index_file_name, verify_shards
+from gecco_translator.translators import symmetry
+
+# The command-line script is not part of the package and is thus loaded from its file
+spec = spec_from_file_location(
+    "gecco_export_translator",
+    os.path.join(script_dir, "..", "bin", "gecco_export_translator.py"),
+)
+assert spec is not None and spec.loader is not None
+gecco_export_translator = module_from_spec(spec)
+spec.loader.exec_module(gecco_export_translator)
+
+
+def run(*argv: str) -> str:
+    """Runs the command-line script with the given arguments and returns what it printed to stderr"""
+    stderr = io.StringIO()
+    with mock.patch.object(sys, "argv", ["gecco_export_translator.py", *argv]):
+        with redirect_stderr(stderr):
+            gecco_export_translator.main()
+
+    return stderr.getvalue()
+
+
+def rebuilt(stderr: str) -> List[str]:
+    """Extracts the rebuilt outputs (with the reason for the rebuild) from the output of an incremental run"""
+    return sorted(
+        x[len("Rebuilt ") :] for x in stderr.splitlines() if x.startswith("Rebuilt ")
+    )
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmp_dir.name, "out")
+        self.export_path = os.path.join(self.tmp_dir.name, "CCD_EN.EXPORT")
+        shutil.copy(
+            os.path.join(script_dir, "single_reference", "CCD_EN.EXPORT"),
+            self.export_path,
+        )
+        self.other_path = os.path.join(self.tmp_dir.name, "CCD_RES.EXPORT")
+        shutil.copy(
+            os.path.join(script_dir, "single_reference", "CCD_RES.EXPORT"),
+            self.other_path,
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_output_must_not_overwrite_input(self):
+        run(
+            self.export_path,
+            "--format",
+            "jsonl",
+            "--format",
+            "columnar",
+            "--output-dir",
+            self.output_dir,
+        )
+
+        for format, extra in [("jsonl", ["--bounded-memory"]), ("columnar", [])]:
+            with self.subTest(format=format):
+                path = os.path.join(self.output_dir, "CCD_EN." + format)
+                contents = Path(path).read_bytes()
+                with self.assertRaisesRegex(RuntimeError, "overwrite the input"):
+                    run(
+                        path,
+                        "--format",
+                        format,
+                        "--output-dir",
+                        self.output_dir,
+                        *extra,
+                    )
+                self.assertEqual(Path(path).read_bytes(), contents)
+
+    def output(self, name: str) -> str:
+        return os.path.join(self.output_dir, name)
+
+    def run_incremental(self, *argv: str) -> str:
+        return run(
+            self.export_path,
+            self.other_path,
+            "--output-dir",
+            self.output_dir,
+            "--incremental",
+            *argv,
+        )
+
+    def test_incremental_rebuild(self):
+        formats = ["--format", "tex", "--format", "sequant"]
+        stderr = self.run_incremental(*formats)
+        self.assertEqual(len(rebuilt(stderr)), 4)
+        self.assertIn("Skipped 0 up-to-date output(s)", stderr)
+        contents = Path(self.output("CCD_EN.tex")).read_text()
+
+        stderr = self.run_incremental(*formats)
+        self.assertEqual(rebuilt(stderr), [])
+        self.assertIn("Skipped 4 up-to-date output(s)", stderr)
+
+        # Only the outputs of the changed input are rebuilt
+        with open(self.other_path, "a") as export_file:
+            export_file.write("\n")
+        stderr = self.run_incremental(*formats)
+        self.assertEqual(
+            rebuilt(stderr),
+            [
+                "{} (input changed)".format(self.output("CCD_RES.{}".format(x)))
+                for x in ["sequant", "tex"]
+            ],
+        )
+        self.assertIn("Skipped 2 up-to-date output(s)", stderr)
+        self.assertEqual(Path(self.output("CCD_EN.tex")).read_text(), contents)
+
+        # Staleness is tracked per format
+        with open(self.output("CCD_EN.sequant"), "a") as out_file:
+            out_file.write("edited")
+        stderr = self.run_incremental(*formats, "--format", "jsonl")
+        self.assertEqual(
+            rebuilt(stderr),
+            [
+                "{} (not built before)".format(self.output("CCD_EN.jsonl")),
+                "{} (output modified)".format(self.output("CCD_EN.sequant")),
+                "{} (not built before)".format(self.output("CCD_RES.jsonl")),
+            ],
+        )
+        self.assertIn("Skipped 3 up-to-date output(s)", stderr)
+
+        # Changed options invalidate all outputs
+        stderr = self.run_incremental(*formats, "--factorize")
+        self.assertEqual(len(rebuilt(stderr)), 4)
+        self.assertTrue(all(x.endswith("(options changed)") for x in rebuilt(stderr)))
+
+    def test_incremental_shards(self):
+        stderr = self.run_incremental("--format", "sequant", "--shard-by-result")
+        self.assertEqual(len(rebuilt(stderr)), 2)
+
+        stderr = self.run_incremental("--format", "sequant", "--shard-by-result")
+        self.assertEqual(rebuilt(stderr), [])
+
+        # Modifying a shard doesn't change the index, but still requires a rebuild
+        shard_dir = self.output("CCD_RES.sequant.shards")
+        shard = sorted(x for x in os.listdir(shard_dir) if x != index_file_name)[0]
+        with open(os.path.join(shard_dir, shard), "a") as shard_file:
+            shard_file.write("edited")
+        stderr = self.run_incremental("--format", "sequant", "--shard-by-result")
+        self.assertEqual(
+            rebuilt(stderr),
+            [
+                "{} (shard '{}' modified)".format(
+                    os.path.join(shard_dir, index_file_name), shard
+                )
+            ],
+        )
+        self.assertIsNone(verify_shards(shard_dir))
+
+    def test_manifest_location(self):
+        manifest_path = os.path.join(self.tmp_dir.name, "manifest.json")
+        self.run_incremental("--manifest", manifest_path)
+        self.assertTrue(os.path.exists(manifest_path))
+        self.assertEqual(rebuilt(self.run_incremental("--manifest", manifest_path)), [])
+
+    def test_invalid_arguments(self):
+        for argv in [
+            [self.export_path, "--incremental"],
+            [self.export_path, "--output-dir", self.output_dir, "--manifest", "x"],
+        ]:
+            with self.subTest(argv=argv), self.assertRaises(SystemExit):
+                run(*argv)
+
+    def test_output_collision(self):
+        other_dir = os.path.join(self.tmp_dir.name, "other")
+        os.makedirs(other_dir)
+        shutil.copy(self.export_path, other_dir)
+
+        with self.assertRaisesRegex(RuntimeError, "would both be translated"):
+            run(
+                self.export_path,
+                os.path.join(other_dir, "CCD_EN.EXPORT"),
+                "--output-dir",
+                self.output_dir,
+            )
+
+    def test_stats_reuse_stored_symmetrizations(self):
+        run(
+            self.other_path,
+            "--format",
+            "jsonl",
+            "--format",
+            "columnar",
+            "--output-dir",
+            self.output_dir,
+        )
+        expected = gecco_export_translator.workload_statistics(
+            self.other_path, symmetrizers=True
+        ).to_json()
+        self.assertGreater(sum(expected["symmetrizers"].values()), 0)
+
+        for format in ["jsonl", "columnar"]:
+            with self.subTest(format=format), mock.patch.object(
+                symmetry, "determine_required_symmetrizations"
+            ) as determine, mock.patch.object(
+                gecco_export_translator, "determine_required_symmetrizations"
+            ) as determine_in_script:
+                statistics = gecco_export_translator.workload_statistics(
+                    self.output("CCD_RES." + format), symmetrizers=True
+                )
+                determine.assert_not_called()
+                determine_in_script.assert_not_called()
+                self.assertEqual(statistics.to_json(), expected)
+
+    def test_topology_stats_of_serialized_input(self):
+        export_path = os.path.join(self.tmp_dir.name, "icMRCC_RES2.EXPORT")
+        shutil.copy(
+            os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT"),
+            export_path,
+        )
+        run(export_path, "--format", "jsonl", "--output-dir", self.output_dir)
+        jsonl_path = self.output("icMRCC_RES2.jsonl")
+
+        def topology_report(path: str, *argv: str) -> str:
+            stderr = run(
+                path,
+                "--format",
+                "tex",
+                "--output-dir",
+                os.path.join(self.tmp_dir.name, "tex"),
+                "--topology-stats",
+                *argv,
+            )
+            # The report follows the heading and ends where the screening summary starts
+            report = stderr.split("Topology of {}:\n".format(path))[1]
+            return report.split("Screening of")[0]
+
+        for argv in [
+            [],
+            ["--topology", "connected"],
+            ["--dims", "H=10,P=100,V=0"],
+            ["--min-factor", "0.3", "--result", "O2g"],
+        ]:
+            with self.subTest(argv=argv):
+                expected = topology_report(jsonl_path, *argv)
+                self.assertEqual(topology_report(export_path, *argv), expected)
+
+        # The selection actually changes the statistics
+        self.assertNotEqual(
+            topology_report(export_path, "--dims", "H=10,P=100,V=0"),
+            topology_report(export_path),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+from dataclasses import replace
+from unittest import mock
+import io
+import os
+import random
+import sys
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.ast import Contraction, IndexGroup, TensorElement
+from gecco_translator.canonical import (
+    canonical_hash,
+    canonical_key,
+    result_labels,
+    index_label,
+)
+from gecco_translator import diff as diff_module
+from gecco_translator.diff import (
+    diff_blocks,
+    diff_contractions,
+    format_diff,
+    group_terms,
+)
+from gecco_translator.parse import iter_blocks, parse
+
+
+def load(name: str):
+    return parse(Path(os.path.join(script_dir, "multi_reference", name)).read_text())
+
+
+def load_blocks(name: str):
+    return list(
+        iter_blocks(
+            io.StringIO(
+                Path(os.path.join(script_dir, "multi_reference", name)).read_text()
+            )
+        )
+    )
+
+
+def renumber(blocks):
+    """Assigns consecutive IDs to the given blocks"""
+    return [
+        "[CONTR] # {:8d}\n{}".format(i + 1, x[x.index("\n") + 1 :])
+        for i, x in enumerate(blocks)
+    ]
+
+
+def shift_dummies(contraction: Contraction, offset: int) -> Contraction:
+    """Renames all dummy indices of the given contraction"""
+    externals = result_labels(contraction)
+
+    def rename(group: IndexGroup) -> IndexGroup:
+        return IndexGroup(
+            creators=[
+                x if index_label(x) in externals else replace(x, id=x.id + offset)
+                for x in group.creators
+            ],
+            annihilators=[
+                x if index_label(x) in externals else replace(x, id=x.id + offset)
+                for x in group.annihilators
+            ],
+        )
+
+    tensors = [
+        TensorElement(
+            name=x.name,
+            vertex_indices=[rename(group) for group in x.vertex_indices],
+            transposed=x.transposed,
+        )
+        for x in contraction.tensors
+    ]
+
+    return replace(contraction, tensors=tensors)
+
+
+class TestDiff(unittest.TestCase):
+    def test_identical(self):
+        contractions = load("icMRCC_RES2.EXPORT")
+        diff = diff_contractions(contractions, load("icMRCC_RES2.EXPORT"))
+        self.assertTrue(diff.is_empty())
+        self.assertEqual(diff.n_unchanged, len(contractions))
+
+    def test_canonical_key_invariance(self):
+        for contraction in load("icMRCC_RES2.EXPORT"):
+            with self.subTest(contraction=contraction.id):
+                key = canonical_key(contraction)
+                reordered = replace(
+                    contraction,
+                    id=contraction.id + 1000,
+                    tensors=list(reversed(contraction.tensors)),
+                )
+                self.assertEqual(canonical_key(reordered), key)
+                self.assertEqual(canonical_key(shift_dummies(contraction, 50)), key)
+
+                digest = canonical_hash(contraction)
+                self.assertEqual(canonical_hash(reordered), digest)
+                self.assertEqual(canonical_hash(shift_dummies(contraction, 50)), digest)
+
+    def test_group_terms(self):
+        contractions = load("icMRCC_RES2.EXPORT")
+        grouped = group_terms(contractions + [shift_dummies(contractions[0], 5)])
+
+        # Hashes tell apart exactly the contractions that have different canonical keys
+        self.assertEqual(len(grouped), len(set(canonical_key(x) for x in contractions)))
+        self.assertEqual(
+            grouped[canonical_hash(contractions[0])].factor,
+            2 * contractions[0].factor,
+        )
+
+    def test_reordered_terms(self):
+        old = load("icMRCC_RES2.EXPORT")
+        new = [shift_dummies(x, 7) for x in old]
+        random.Random(42).shuffle(new)
+        new = [replace(x, id=i) for i, x in enumerate(new)]
+
+        self.assertTrue(diff_contractions(old, new).is_empty())
+
+    def test_added_and_removed(self):
+        old = load("icMRCC_RES2.EXPORT")
+        new = old[1:] + load("NEVPT2_RES1.EXPORT")[:1]
+
+        diff = diff_contractions(old, new)
+        self.assertFalse(diff.is_empty())
+        self.assertEqual(diff.removed, old[:1])
+        self.assertEqual(len(diff.added), 1)
+        self.assertEqual(len(diff.changed), 0)
+
+        lines = format_diff(diff).splitlines()
+        self.assertTrue(lines[0].startswith("- "))
+        self.assertTrue(lines[1].startswith("+ "))
+
+    def test_changed_factor(self):
+        old = load("icMRCC_RES2.EXPORT")
+        new = [replace(old[0], factor=2 * old[0].factor)] + old[1:]
+
+        diff = diff_contractions(old, new)
+        self.assertEqual(len(diff.changed), 1)
+        self.assertEqual(diff.changed[0].old.factor, old[0].factor)
+        self.assertEqual(diff.changed[0].new.factor, 2 * old[0].factor)
+        self.assertEqual(len(diff.added) + len(diff.removed), 0)
+
+    def test_split_terms(self):
+        # A term that is split into two terms with the same structure is equivalent to the original term
+        old = load("icMRCC_RES2.EXPORT")
+        half = replace(old[0], factor=old[0].factor / 2)
+        new = [half, shift_dummies(half, 3)] + old[1:]
+
+        self.assertTrue(diff_contractions(old, new).is_empty())
+
+    def test_blocks_match_contractions(self):
+        blocks = load_blocks("icMRCC_RES2.EXPORT")
+        changed = blocks[0].replace("/FACTOR/         1.0", "/FACTOR/         2.0", 1)
+        self.assertNotEqual(changed, blocks[0])
+
+        for old, new in [
+            (blocks, list(reversed(blocks))),
+            (blocks, renumber(blocks[1:] + load_blocks("NEVPT2_RES1.EXPORT")[:3])),
+            (blocks, renumber([changed] + blocks[1:])),
+            # Splitting a term changes the factor of the block that stays in place
+            (blocks, renumber(blocks + blocks[:1])),
+            (load_blocks("NEVPT2_RES1.EXPORT"), blocks),
+        ]:
+            with self.subTest(n_old=len(old), n_new=len(new)):
+                expected = diff_contractions(
+                    parse("".join(old) + "[END]\n"), parse("".join(new) + "[END]\n")
+                )
+                diff = diff_blocks(old, new)
+                self.assertEqual(diff.added, expected.added)
+                self.assertEqual(diff.removed, expected.removed)
+                self.assertEqual(diff.changed, expected.changed)
+                self.assertEqual(diff.n_unchanged, expected.n_unchanged)
+
+    def test_identical_blocks_are_not_parsed(self):
+        blocks = load_blocks("icMRCC_RES2.EXPORT")
+        with mock.patch.object(diff_module, "parse_blocks") as parse_blocks:
+            diff = diff_blocks(blocks, renumber(list(reversed(blocks))))
+        parse_blocks.assert_not_called()
+        self.assertTrue(diff.is_empty())
+        self.assertEqual(diff.n_unchanged, len(blocks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+import glob
+import io
+import os
+import sys
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.filters import (
+    ContractionFilter,
+    filter_contractions,
+    parse_id_ranges,
+    parse_result_signature,
+    tensor_signature,
+    space_signature,
+)
+from gecco_translator.headers import read_block_header
+from gecco_translator.parse import parse, iter_blocks, iter_contractions
+
+
+class TestFilters(unittest.TestCase):
+    def test_headers_match_contractions(self):
+        for path in glob.glob(os.path.join(script_dir, "*", "*.EXPORT")):
+            contents = Path(path).read_text()
+            blocks = list(iter_blocks(io.StringIO(contents)))
+            contractions = parse(contents)
+            self.assertEqual(len(blocks), len(contractions))
+
+            for block, contraction in zip(blocks, contractions):
+                with self.subTest(file=path, contraction=contraction.id):
+                    header = read_block_header(block)
+                    self.assertEqual(header.id, contraction.id)
+                    self.assertEqual(header.result, contraction.result.name)
+                    self.assertEqual(header.factor, contraction.factor)
+                    self.assertEqual(
+                        sorted(set(x.name for x in header.vertices)),
+                        sorted(set(x.name for x in contraction.tensors)),
+                    )
+                    self.assertEqual(
+                        space_signature(
+                            (x.creator_spaces, x.annihilator_spaces)
+                            for x in header.result_spaces
+                        ),
+                        tensor_signature(contraction.result),
+                    )
+
+    def test_pushdown_matches_filtering_afterwards(self):
+        contents = Path(
+            os.path.join(script_dir, "multi_reference", "NEVPT2_RES2.EXPORT")
+        ).read_text()
+        contractions = parse(contents)
+
+        filters = [
+            ContractionFilter(results={"O2g"}),
+            ContractionFilter(results={"unknown"}),
+            ContractionFilter(tensors={"T1s"}),
+            ContractionFilter(tensors={"T2g", "GAM0"}),
+            ContractionFilter(id_ranges=parse_id_ranges("3-17,40,100-200")),
+            ContractionFilter(result_signatures={",;VP,HH"}),
+            ContractionFilter(tensors={"T1s"}, result_signatures={",;P,H"}),
+        ]
+
+        for current in filters:
+            with self.subTest(filter=current):
+                pushed_down = list(
+                    iter_contractions(io.StringIO(contents), contraction_filter=current)
+                )
+                self.assertEqual(
+                    pushed_down, list(filter_contractions(contractions, current))
+                )
+
+        self.assertEqual(len(list(filter_contractions(contractions, filters[1]))), 0)
+        self.assertEqual(
+            len(list(filter_contractions(contractions, filters[4]))), 15 + 1
+        )
+
+    def test_parse_id_ranges(self):
+        self.assertEqual(parse_id_ranges("1-3, 7"), [(0, 2), (6, 6)])
+
+        for spec in ["3-", "a", "0", "5-2", "1-2-3", ""]:
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_id_ranges(spec)
+
+    def test_parse_result_signature(self):
+        self.assertEqual(parse_result_signature("HP,PP"), "HP,PP")
+        self.assertEqual(parse_result_signature("PH, PP"), "HP,PP")
+        self.assertEqual(parse_result_signature("P,H;,P"), "P,H;,P")
+
+        for spec in ["PP", "PP,HH,HH", "PX,HH", "PP,HH;H", ""]:
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_result_signature(spec)
+
+
+if __name__ == "__main__":
+    unittest.main()
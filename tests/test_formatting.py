@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+import os
+import sys
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.ast import Index, IndexGroup, TensorElement
+from gecco_translator.parse import parse
+from gecco_translator.translators import formatting, to_tex, to_sequant
+from gecco_translator.translators.tex import tensor_to_tex, factor_to_tex
+from gecco_translator.translators.sequant import tensor_to_sequant, factor_to_sequant
+
+
+class TestFormatting(unittest.TestCase):
+    def setUp(self):
+        formatting.clear_caches()
+
+    def test_tensor_formatting(self):
+        tensor = TensorElement(
+            name="H",
+            vertex_indices=[
+                IndexGroup(
+                    creators=[Index(id=0, space=1, vertex=0, type=0)],
+                    annihilators=[Index(id=2, space=0, vertex=0, type=1)],
+                )
+            ],
+            transposed=False,
+        )
+        self.assertEqual(tensor_to_tex(tensor), "H^{o_3}_{v_1}")
+        self.assertEqual(tensor_to_sequant(tensor), "f{e1;i3}")
+
+        # Only the labels of the indices are relevant for formatting
+        other = TensorElement(
+            name="H",
+            vertex_indices=[
+                IndexGroup(
+                    creators=[Index(id=0, space=1, vertex=3, type=0)],
+                    annihilators=[Index(id=2, space=0, vertex=3, type=1)],
+                )
+            ],
+            transposed=True,
+        )
+        self.assertEqual(formatting.tensor_key(other), formatting.tensor_key(tensor))
+
+    def test_factor_formatting(self):
+        self.assertEqual(factor_to_tex(1.0), " + ")
+        self.assertEqual(factor_to_tex(-0.5), r" - \frac{1}{2} ")
+        self.assertEqual(factor_to_tex(2.0), " + 2 ")
+        self.assertEqual(factor_to_sequant(-1.0), "- ")
+        self.assertEqual(factor_to_sequant(1.0 / 6), "+ 1/6 ")
+
+    def test_caches_are_reused(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        tex = to_tex(contractions)
+        sequant = to_sequant(contractions)
+
+        statistics = formatting.cache_statistics()
+        for name, info in statistics.items():
+            with self.subTest(cache=name):
+                self.assertLessEqual(info["currsize"], formatting.cache_size)
+        tensor_cache = statistics["gecco_translator.translators.tex.tensor_key_to_tex"]
+        self.assertGreater(tensor_cache["hits"], tensor_cache["misses"])
+
+        # Cached results must not differ from freshly formatted ones
+        formatting.clear_caches()
+        self.assertEqual(to_tex(contractions), tex)
+        self.assertEqual(to_sequant(contractions), sequant)
+
+
+if __name__ == "__main__":
+    unittest.main()
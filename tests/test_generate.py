@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import unittest
+import itertools
+import os
+import sys
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.generate import GeneratorSettings, generate_export
+from gecco_translator.parse import parse
+from gecco_translator.translators import to_tex, to_sequant
+
+
+class TestGenerate(unittest.TestCase):
+    def test_deterministic(self):
+        settings = GeneratorSettings(n_contractions=50, seed=42, active_fraction=0.2)
+        self.assertEqual(generate_export(settings), generate_export(settings))
+
+        other = GeneratorSettings(n_contractions=50, seed=43, active_fraction=0.2)
+        self.assertNotEqual(generate_export(settings), generate_export(other))
+
+    def test_round_trip(self):
+        for max_vertices, max_rank, active_fraction in itertools.product(
+            [1, 3, 6], [1, 2, 4], [0.0, 0.3]
+        ):
+            settings = GeneratorSettings(
+                n_contractions=25,
+                max_vertices=max_vertices,
+                max_rank=max_rank,
+                active_fraction=active_fraction,
+                n_results=3,
+            )
+            with self.subTest(settings=settings):
+                contractions = parse(generate_export(settings))
+
+                self.assertEqual(len(contractions), settings.n_contractions)
+                self.assertLessEqual(len(set(x.result for x in contractions)), 3)
+                for current in contractions:
+                    self.assertLessEqual(len(current.tensors), max_vertices)
+                    if active_fraction == 0:
+                        self.assertTrue(
+                            all(x.space != 2 for x in current.contraction_indices)
+                        )
+
+                # The generated terms must also be translatable
+                to_tex(contractions)
+                to_sequant(contractions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import tempfile
+import types
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.manifest import BuildManifest, hash_file, source_version
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmp_dir.name, "TEST.EXPORT")
+        self.output_path = os.path.join(self.tmp_dir.name, "TEST.tex")
+        self.manifest_path = os.path.join(self.tmp_dir.name, "manifest.json")
+
+        with open(self.input_path, "w") as file:
+            file.write("[END]\n")
+        with open(self.output_path, "w") as file:
+            file.write("\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def record(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record(
+            output_path=self.output_path,
+            input_path=self.input_path,
+            input_hash=hash_file(self.input_path),
+            format="tex",
+        )
+        manifest.save()
+
+    def stale_reason(self, format: str = "tex"):
+        return BuildManifest(self.manifest_path).stale_reason(
+            output_path=self.output_path,
+            input_path=self.input_path,
+            input_hash=hash_file(self.input_path),
+            format=format,
+        )
+
+    def test_unchanged_is_up_to_date(self):
+        self.assertIsNotNone(self.stale_reason())
+        self.record()
+        self.assertIsNone(self.stale_reason())
+
+    def test_changed_input_is_stale(self):
+        self.record()
+        with open(self.input_path, "a") as file:
+            file.write("\n")
+        self.assertEqual(self.stale_reason(), "input changed")
+
+    def test_changed_settings_are_stale(self):
+        self.record()
+        self.assertEqual(self.stale_reason(format="sequant"), "format changed")
+
+        for attribute, reason in [
+            ("grammar_version", "grammar changed"),
+            ("translator_version", "translator changed"),
+        ]:
+            manifest = BuildManifest(self.manifest_path)
+            setattr(manifest, attribute, "other")
+            self.assertEqual(
+                manifest.stale_reason(
+                    output_path=self.output_path,
+                    input_path=self.input_path,
+                    input_hash=hash_file(self.input_path),
+                    format="tex",
+                ),
+                reason,
+            )
+
+    def test_changed_extra_source_is_stale(self):
+        source_path = os.path.join(self.tmp_dir.name, "script.py")
+        with open(source_path, "w") as file:
+            file.write("x = 1\n")
+
+        manifest = BuildManifest(self.manifest_path, extra_sources=[source_path])
+        manifest.record(
+            output_path=self.output_path,
+            input_path=self.input_path,
+            input_hash=hash_file(self.input_path),
+            format="tex",
+        )
+        manifest.save()
+
+        def stale_reason():
+            return BuildManifest(
+                self.manifest_path, extra_sources=[source_path]
+            ).stale_reason(
+                output_path=self.output_path,
+                input_path=self.input_path,
+                input_hash=hash_file(self.input_path),
+                format="tex",
+            )
+
+        self.assertIsNone(stale_reason())
+        with open(source_path, "w") as file:
+            file.write("x = 2\n")
+        self.assertEqual(stale_reason(), "translator changed")
+
+    def test_modified_or_missing_output_is_stale(self):
+        self.record()
+        with open(self.output_path, "a") as file:
+            file.write("edited")
+        self.assertEqual(self.stale_reason(), "output modified")
+
+        os.remove(self.output_path)
+        self.assertEqual(self.stale_reason(), "output missing")
+
+    def test_source_version(self):
+        module = types.ModuleType("module")
+        module.__file__ = os.path.join(self.tmp_dir.name, "module.py")
+        with open(module.__file__, "w") as file:
+            file.write("x = 1\n")
+
+        version = source_version([module])
+        self.assertEqual(source_version([module]), version)
+
+        with open(module.__file__, "w") as file:
+            file.write("x = 2\n")
+        self.assertNotEqual(source_version([module]), version)
+
+
+if __name__ == "__main__":
+    unittest.main()
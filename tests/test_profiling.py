@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+from unittest import mock
+import json
+import os
+import sys
+import time
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.translators import to_tex
+from gecco_translator.parse import parse
+from gecco_translator import parse as parse_module
+from gecco_translator import profiling
+
+
+class TestProfiling(unittest.TestCase):
+    def test_stages_and_terms_are_recorded(self):
+        contents = Path(
+            os.path.join(script_dir, "multi_reference", "NEVPT2_RES1.EXPORT")
+        ).read_text()
+        expected_output = to_tex(parse(contents))
+
+        finished_stages = []
+        profiler = profiling.Profiler(
+            callback=lambda name, time, blocks: finished_stages.append(name)
+        )
+        with profiling.profile(profiler):
+            output = to_tex(parse(contents))
+
+        self.assertEqual(output, expected_output)
+        self.assertIsNone(profiling.active_profiler())
+
+        for stage in [
+            "grammar compilation",
+            "lexing",
+            "parsing",
+            "transformation",
+            "symmetrization",
+            "tex emission",
+        ]:
+            self.assertIn(stage, profiler.stages)
+            self.assertIn(stage, finished_stages)
+
+        # The tokens created by the lexer are kept in the parse tree
+        self.assertGreater(profiler.stages["lexing"].block_delta, 0)
+
+        self.assertEqual(profiler.n_terms, contents.count("[CONTR]"))
+        self.assertEqual(profiler.stages["symmetrization"].calls, profiler.n_terms)
+
+        slowest = profiler.slowest_terms(3)
+        self.assertEqual(len(slowest), 3)
+        self.assertGreaterEqual(slowest[0].wall_time, slowest[-1].wall_time)
+
+        summary = json.loads(profiler.to_json())
+        self.assertEqual(summary["n_terms"], profiler.n_terms)
+        self.assertIn("Slowest", profiler.report())
+
+    def test_only_slowest_terms_are_kept(self):
+        contractions = parse(
+            Path(
+                os.path.join(script_dir, "multi_reference", "NEVPT2_RES1.EXPORT")
+            ).read_text()
+        )
+        durations = [(i * 7) % len(contractions) for i in range(len(contractions))]
+
+        # Every term starts at time 0 and takes the given (distinct) duration
+        times = [x for duration in durations for x in [0.0, float(duration)]]
+        profiler = profiling.Profiler(n_slowest=3)
+        with mock.patch.object(profiling.time, "perf_counter", side_effect=times):
+            for current in contractions:
+                with profiler.term(current):
+                    pass
+
+        self.assertEqual(profiler.n_terms, len(contractions))
+        self.assertEqual(
+            [x.wall_time for x in profiler.slowest_terms()],
+            sorted(durations, reverse=True)[:3],
+        )
+        self.assertEqual(len(profiler.slowest_terms(10)), 3)
+        self.assertEqual(
+            [x.wall_time for x in profiler.slowest_terms(1)], [max(durations)]
+        )
+
+    def test_without_lexer_thread(self):
+        contents = Path(
+            os.path.join(script_dir, "multi_reference", "NEVPT2_RES1.EXPORT")
+        ).read_text()
+        expected = parse(contents)
+
+        # Without access to the lexer, lexing is attributed to the parsing stage
+        with mock.patch.object(
+            parse_module, "supports_lexer_thread", return_value=False
+        ), mock.patch.object(parse_module.Lark, "parse_interactive") as interactive:
+            with profiling.profile(profiling.Profiler()) as profiler:
+                self.assertEqual(parse(contents), expected)
+
+        interactive.assert_not_called()
+        self.assertNotIn("lexing", profiler.stages)
+        self.assertIn("parsing", profiler.stages)
+
+    def test_memory_tracing(self):
+        contents = Path(
+            os.path.join(script_dir, "single_reference", "CCD_RES.EXPORT")
+        ).read_text()
+
+        with profiling.profile(profiling.Profiler(trace_memory=True)) as profiler:
+            self.assertGreater(len(parse(contents)), 0)
+            with profiling.stage("allocation"):
+                data = bytearray(10 * 2**20)
+            del data
+
+        self.assertGreater(profiler.stages["parsing"].peak_memory, 0)
+        self.assertGreaterEqual(profiler.stages["allocation"].peak_memory, 10 * 2**20)
+        self.assertLess(profiler.stages["transformation"].peak_memory, 10 * 2**20)
+        self.assertEqual(profiler.peak_memory, profiler.to_dict()["peak_memory"])
+        self.assertIn("Peak", profiler.report())
+
+    def test_nested_stages_are_exclusive(self):
+        profiler = profiling.Profiler()
+        with profiling.profile(profiler):
+            with profiling.stage("outer"):
+                with profiling.stage("inner"):
+                    pass
+                start = time.perf_counter()
+                time.sleep(0.05)
+                profiler.record(name="external", wall_time=time.perf_counter() - start)
+
+        self.assertGreaterEqual(profiler.stages["external"].wall_time, 0.05)
+        self.assertLess(profiler.stages["outer"].wall_time, 0.05)
+        self.assertEqual(profiler.stages["inner"].calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+import glob
+import io
+import os
+import sys
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.headers import read_block_header
+from gecco_translator.parse import parse, iter_blocks, iter_contractions
+from gecco_translator.screening import (
+    EMPTY_SPACE,
+    SMALL_FACTOR,
+    Screening,
+    TermSummary,
+    contraction_summary,
+    header_summary,
+    parse_dimensions,
+)
+
+
+class TestScreening(unittest.TestCase):
+    def test_parse_dimensions(self):
+        self.assertEqual(parse_dimensions("H=10,p=100, V=0"), {0: 10, 1: 100, 2: 0})
+
+        for spec in ["X=1", "H=-1", "H", "H=ten"]:
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_dimensions(spec)
+
+    def test_header_and_contraction_summaries_agree(self):
+        for path in sorted(glob.glob(os.path.join(script_dir, "*", "*.EXPORT"))):
+            contents = Path(path).read_text()
+            blocks = list(iter_blocks(io.StringIO(contents)))
+            contractions = parse(contents)
+
+            for block, contraction in zip(blocks, contractions):
+                with self.subTest(file=path, contraction=contraction.id):
+                    self.assertEqual(
+                        header_summary(read_block_header(block)),
+                        contraction_summary(contraction),
+                    )
+
+    def test_estimated_flops(self):
+        term = TermSummary(
+            id=0, result="O2", factor=1.0, n_tensors=2, index_counts={0: 2, 1: 3}
+        )
+        self.assertEqual(
+            Screening({0: 10, 1: 100}).estimated_flops(term), 2 * 10**2 * 100**3
+        )
+        # Dimension of P is unknown
+        self.assertIsNone(Screening({0: 10}).estimated_flops(term))
+
+    def test_empty_space(self):
+        single_reference = os.path.join(
+            script_dir, "single_reference", "CCSD_RES2.EXPORT"
+        )
+        multi_reference = os.path.join(
+            script_dir, "multi_reference", "icMRCC_RES2.EXPORT"
+        )
+        dimensions = parse_dimensions("H=10,P=100,V=0")
+
+        for path in [single_reference, multi_reference]:
+            with self.subTest(file=path):
+                contents = Path(path).read_text()
+                screening = Screening(dimensions)
+                kept = list(
+                    iter_contractions(io.StringIO(contents), screening=screening)
+                )
+
+                expected = [
+                    x
+                    for x in parse(contents)
+                    if contraction_summary(x).index_counts.get(2, 0) == 0
+                ]
+                self.assertEqual(kept, expected)
+                self.assertEqual(
+                    screening.report.n_screened,
+                    len(kept) + screening.report.n_pruned,
+                )
+
+                if path == single_reference:
+                    self.assertEqual(screening.report.n_pruned, 0)
+                    self.assertEqual(screening.report.pruned, [])
+                else:
+                    self.assertGreater(screening.report.n_pruned, 0)
+                    self.assertEqual(
+                        screening.report.count(EMPTY_SPACE),
+                        screening.report.n_pruned,
+                    )
+                    self.assertTrue(
+                        all(x.estimated_flops is None for x in screening.report.pruned)
+                    )
+                    self.assertIn(
+                        "{} involving empty spaces".format(screening.report.n_pruned),
+                        screening.report.summary(),
+                    )
+
+    def test_min_factor(self):
+        path = os.path.join(script_dir, "single_reference", "CCSD_RES2.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        screening = Screening({0: 10, 1: 100}, min_factor=0.3)
+        kept = list(screening.screen_contractions(contractions))
+        self.assertEqual(kept, [x for x in contractions if abs(x.factor) >= 0.3])
+        pruned_ids = [x.id for x in contractions if abs(x.factor) < 0.3]
+        self.assertEqual([x.id for x in screening.report.pruned], pruned_ids)
+        self.assertEqual(screening.report.n_pruned, len(pruned_ids))
+        self.assertEqual(screening.report.count(SMALL_FACTOR), len(pruned_ids))
+        self.assertEqual(
+            screening.report.pruned_flops,
+            sum(
+                screening.estimated_flops(contraction_summary(x)) or 0
+                for x in contractions
+                if abs(x.factor) < 0.3
+            ),
+        )
+        self.assertGreater(screening.report.pruned_flops, 0)
+        self.assertIn("Estimated FLOPs saved", screening.report.summary())
+
+        # Without dimensions, the cost can't be estimated
+        screening = Screening({}, min_factor=0.3)
+        list(screening.screen_contractions(contractions))
+        self.assertTrue(all(x.estimated_flops is None for x in screening.report.pruned))
+
+    def test_report_keeps_sample(self):
+        path = os.path.join(script_dir, "single_reference", "CCSD_RES2.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        # Prune every term, but only keep a few of them in the report
+        screening = Screening({0: 10, 1: 100}, min_factor=100)
+        screening.report.max_samples = 3
+        self.assertEqual(list(screening.screen_contractions(contractions)), [])
+
+        self.assertEqual(screening.report.n_pruned, len(contractions))
+        self.assertEqual(
+            [x.id for x in screening.report.pruned], [x.id for x in contractions[:3]]
+        )
+        self.assertEqual(
+            screening.report.pruned_flops,
+            sum(
+                screening.estimated_flops(contraction_summary(x)) or 0
+                for x in contractions
+            ),
+        )
+        self.assertIn(
+            "... and {} more".format(len(contractions) - 2),
+            screening.report.summary(max_terms=2),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+import unittest
+from itertools import product
+from pathlib import Path
+import glob
+import io
+import os
+import sys
+import tempfile
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.parse import parse
+from gecco_translator.serialization import (
+    ColumnarReader,
+    iter_jsonl,
+    iter_jsonl_records,
+    iter_serialized,
+    iter_serialized_records,
+    serialized_format,
+    write_columnar,
+    write_jsonl,
+)
+from gecco_translator.translators import (
+    to_tex,
+    to_sequant,
+    get_required_symmetrizations,
+)
+
+
+def export_files():
+    return sorted(glob.glob(os.path.join(script_dir, "*", "*.EXPORT")))
+
+
+class TestSerialization(unittest.TestCase):
+    def test_jsonl_roundtrip(self):
+        for path in export_files():
+            with self.subTest(file=path):
+                contractions = parse(Path(path).read_text())
+
+                buffer = io.StringIO()
+                write_jsonl(contractions, buffer)
+                buffer.seek(0)
+                records = list(iter_jsonl_records(buffer))
+
+                self.assertEqual([x for x, _ in records], contractions)
+                for contraction, symmetrizations in records:
+                    self.assertEqual(
+                        symmetrizations, get_required_symmetrizations(contraction)
+                    )
+
+    def test_columnar_roundtrip(self):
+        for path, row_group_size in product(export_files(), [1, 7, 4096]):
+            with self.subTest(
+                file=path, row_group_size=row_group_size
+            ), tempfile.TemporaryDirectory() as tmp_dir:
+                contractions = parse(Path(path).read_text())
+
+                out_path = os.path.join(tmp_dir, "out.columnar")
+                with open(out_path, "wb") as out_file:
+                    write_columnar(
+                        contractions, out_file, row_group_size=row_group_size
+                    )
+
+                with ColumnarReader(out_path) as reader:
+                    self.assertEqual(len(reader), len(contractions))
+                    self.assertEqual(
+                        len(reader.row_groups),
+                        -(-len(contractions) // row_group_size),
+                    )
+                    self.assertEqual(list(reader), contractions)
+                    for i, contraction in enumerate(contractions):
+                        self.assertEqual(
+                            reader.symmetrizations(i),
+                            get_required_symmetrizations(contraction),
+                        )
+
+                    # Columns can be scanned without materializing any contraction
+                    self.assertEqual(
+                        list(reader.column("factor")), [x.factor for x in contractions]
+                    )
+                    self.assertEqual(
+                        list(reader.column("id")), [x.id for x in contractions]
+                    )
+
+    def test_translation_of_loaded_contractions(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            jsonl_path = os.path.join(tmp_dir, "icMRCC_RES2.jsonl")
+            with open(jsonl_path, "w") as out_file:
+                write_jsonl(contractions, out_file)
+            columnar_path = os.path.join(tmp_dir, "icMRCC_RES2.columnar")
+            with open(columnar_path, "wb") as out_file:
+                write_columnar(contractions, out_file)
+
+            for current in [jsonl_path, columnar_path]:
+                with self.subTest(file=current):
+                    loaded = list(iter_serialized(current))
+                    self.assertEqual(to_tex(loaded), to_tex(contractions))
+                    self.assertEqual(to_sequant(loaded), to_sequant(contractions))
+
+                    records = list(iter_serialized_records(current))
+                    self.assertEqual([x for x, _ in records], loaded)
+                    self.assertEqual(
+                        [x for _, x in records],
+                        [get_required_symmetrizations(x) for x in loaded],
+                    )
+
+    def test_format_detection(self):
+        self.assertEqual(serialized_format("a/b.jsonl"), "jsonl")
+        self.assertEqual(serialized_format("a/b.jsonl.gz"), "jsonl")
+        self.assertEqual(serialized_format("a/b.columnar"), "columnar")
+        self.assertIsNone(serialized_format("a/b.EXPORT"))
+        self.assertIsNone(serialized_format("a/b.EXPORT.gz"))
+
+    def test_invalid_columnar_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "invalid.columnar")
+            Path(path).write_bytes(b"[CONTR] #  1\n" * 4)
+
+            with self.assertRaises(ValueError):
+                ColumnarReader(path)
+
+            # Files too short to be memory-mapped or to hold a header
+            for contents in [b"", b"GCCOLUMN"]:
+                Path(path).write_bytes(contents)
+                with self.assertRaisesRegex(ValueError, "not a columnar"):
+                    ColumnarReader(path)
+
+    def test_empty(self):
+        buffer = io.StringIO()
+        write_jsonl([], buffer)
+        self.assertEqual(list(iter_jsonl(io.StringIO(buffer.getvalue()))), [])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "empty.columnar")
+            with open(path, "wb") as out_file:
+                write_columnar([], out_file)
+
+            with ColumnarReader(path) as reader:
+                self.assertEqual(list(reader), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
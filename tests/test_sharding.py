@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+import glob
+import os
+import sys
+import tempfile
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.parse import parse
+from gecco_translator.sharding import (
+    index_file_name,
+    read_index,
+    verify_shards,
+    write_shards,
+)
+from gecco_translator.translators import to_tex, to_sequant
+from gecco_translator.translators.symmetry import as_records
+
+
+class TestSharding(unittest.TestCase):
+    def test_shards_match_translation(self):
+        for path in sorted(glob.glob(os.path.join(script_dir, "*", "*.EXPORT"))):
+            contractions = parse(Path(path).read_text())
+
+            # Spilling all terms to temporary files doesn't change the shards
+            for max_buffered_terms in [None, 1]:
+                with self.subTest(
+                    file=path, max_buffered_terms=max_buffered_terms
+                ), tempfile.TemporaryDirectory() as tmp_dir:
+                    shards = write_shards(
+                        as_records(contractions),
+                        directory=tmp_dir,
+                        format="sequant",
+                        max_workers=4,
+                        max_buffered_terms=max_buffered_terms,
+                    )
+                    self.assertEqual(read_index(tmp_dir), shards)
+                    self.assertEqual(sum(x.n_terms for x in shards), len(contractions))
+                    self.assertEqual(len(set(x.file for x in shards)), len(shards))
+
+                    # Concatenating the shards in the order given by the index reproduces the unsharded output
+                    contents = [
+                        Path(os.path.join(tmp_dir, x.file)).read_text() for x in shards
+                    ]
+                    self.assertEqual(
+                        "\n".join(contents), to_sequant(contractions) + "\n"
+                    )
+
+    def test_tex_shards(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shards = write_shards(
+                as_records(contractions), directory=tmp_dir, format="tex"
+            )
+            self.assertEqual(len(shards), len(set(x.result for x in contractions)))
+
+            lines = []
+            for current in shards:
+                shard_lines = (
+                    Path(os.path.join(tmp_dir, current.file)).read_text().splitlines()
+                )
+                self.assertEqual(len(shard_lines), current.n_terms)
+                lines.extend(shard_lines)
+
+            self.assertEqual(sorted(lines), sorted(to_tex(contractions).splitlines()))
+
+    def test_verification_and_orphans(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shards = write_shards(
+                as_records(contractions), directory=tmp_dir, format="sequant"
+            )
+            self.assertIsNone(verify_shards(tmp_dir))
+
+            shard_path = os.path.join(tmp_dir, shards[0].file)
+            with open(shard_path, "a") as shard_file:
+                shard_file.write("edited")
+            self.assertIn("modified", verify_shards(tmp_dir) or "")
+
+            os.remove(shard_path)
+            self.assertIn("missing", verify_shards(tmp_dir) or "")
+
+            Path(shard_path).write_text("")
+            self.assertIn("modified", verify_shards(tmp_dir) or "")
+
+            # Shards of results that disappeared are removed
+            remaining = [x for x in contractions if x.result != contractions[0].result]
+            new_shards = write_shards(
+                as_records(remaining), directory=tmp_dir, format="sequant"
+            )
+            self.assertIsNone(verify_shards(tmp_dir))
+            self.assertEqual(
+                sorted(os.listdir(tmp_dir)),
+                sorted([x.file for x in new_shards] + [index_file_name]),
+            )
+
+            # Files that aren't listed in the index are ignored
+            Path(os.path.join(tmp_dir, "stray.sequant")).write_text("")
+            self.assertIsNone(verify_shards(tmp_dir))
+
+    def test_unrelated_files_survive(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            unrelated = os.path.join(tmp_dir, "my_paper.tex")
+            Path(unrelated).write_text("\\documentclass{article}\n")
+
+            write_shards(as_records(contractions), directory=tmp_dir, format="tex")
+            remaining = [x for x in contractions if x.result != contractions[0].result]
+            write_shards(as_records(remaining), directory=tmp_dir, format="tex")
+
+            self.assertEqual(
+                Path(unrelated).read_text(), "\\documentclass{article}\n"
+            )
+            self.assertIsNone(verify_shards(tmp_dir))
+
+    def test_unsupported_format(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(RuntimeError):
+                write_shards([], directory=tmp_dir, format="columnar")
+
+
+if __name__ == "__main__":
+    unittest.main()
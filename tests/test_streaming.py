@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+from typing import List
+
+import unittest
+from unittest import mock
+from pathlib import Path
+import bz2
+import glob
+import gzip
+import io
+import lzma
+import os
+import sys
+import tempfile
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.ast import Contraction
+from gecco_translator.compression import (
+    open_export,
+    open_export_stream,
+    detect_compression,
+)
+from gecco_translator.parse import parse, iter_blocks, iter_contractions
+from gecco_translator.partitions import SpillingPartitions
+from gecco_translator.translators import to_tex, to_sequant, write_translation
+
+
+class TestStreaming(unittest.TestCase):
+    def test_block_parsing_matches_parse(self):
+        for path in glob.glob(os.path.join(script_dir, "*", "*.EXPORT")):
+            contents = Path(path).read_text()
+            expected: List[Contraction] = parse(contents)
+
+            for batch_size in [1, 7, 1000]:
+                with self.subTest(file=path, batch_size=batch_size):
+                    streamed = list(
+                        iter_contractions(io.StringIO(contents), batch_size=batch_size)
+                    )
+                    self.assertEqual(streamed, expected)
+
+    def test_compressed_input(self):
+        contents = Path(
+            os.path.join(script_dir, "single_reference", "CCD_RES.EXPORT")
+        ).read_bytes()
+        expected = parse(contents.decode())
+
+        for name, compress in [
+            (None, lambda x: x),
+            ("gzip", gzip.compress),
+            ("bz2", bz2.compress),
+            ("xz", lzma.compress),
+        ]:
+            with self.subTest(compression=name):
+                compressed = compress(contents)
+                self.assertEqual(detect_compression(compressed[:6]), name)
+
+                raw = io.BytesIO(compressed)
+                stream = open_export_stream(raw)
+                self.assertEqual(list(iter_contractions(stream)), expected)
+
+                # Closing the text stream also closes the underlying binary stream
+                stream.close()
+                self.assertTrue(raw.closed)
+
+    def test_export_file_is_closed(self):
+        contents = Path(
+            os.path.join(script_dir, "single_reference", "CCD_RES.EXPORT")
+        ).read_bytes()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "CCD_RES.EXPORT.gz")
+            Path(path).write_bytes(gzip.compress(contents))
+
+            opened = []
+
+            def tracking_open(*args, **kwargs):
+                opened.append(open(*args, **kwargs))
+                return opened[-1]
+
+            with mock.patch(
+                "gecco_translator.compression.open", tracking_open, create=True
+            ):
+                with open_export(path) as stream:
+                    self.assertEqual(stream.read(), contents.decode())
+
+            self.assertEqual(len(opened), 1)
+            self.assertTrue(opened[0].closed)
+
+    def test_streamed_translation_matches_translators(self):
+        for path in glob.glob(os.path.join(script_dir, "*", "*.EXPORT")):
+            contents = Path(path).read_text()
+            contractions = parse(contents)
+
+            for format, translator in [("tex", to_tex), ("sequant", to_sequant)]:
+                with self.subTest(file=path, format=format):
+                    out = io.StringIO()
+                    write_translation(
+                        iter_contractions(io.StringIO(contents), batch_size=2),
+                        format=format,
+                        out=out,
+                    )
+                    self.assertEqual(out.getvalue(), translator(contractions))
+
+    def test_spilled_sequant_translation(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        contents = Path(path).read_text()
+        expected = to_sequant(parse(contents))
+
+        for max_buffered_terms in [1, 10, 1000]:
+            with self.subTest(max_buffered_terms=max_buffered_terms):
+                out = io.StringIO()
+                write_translation(
+                    iter_contractions(io.StringIO(contents)),
+                    format="sequant",
+                    out=out,
+                    max_buffered_terms=max_buffered_terms,
+                )
+                self.assertEqual(out.getvalue(), expected)
+
+    def test_spilling_partitions(self):
+        with SpillingPartitions(max_buffered=2) as partitions:
+            partitions.append("b", "1")
+            partitions.append("a", "2")
+            self.assertIsNone(partitions.directory)
+
+            partitions.append("b", "3")
+            partitions.append("c", "4")
+            self.assertEqual(partitions.n_spills, 1)
+
+            directory = partitions.directory
+            assert directory is not None
+            self.assertTrue(os.path.isdir(directory))
+            self.assertEqual(
+                [(key, list(values)) for key, values in partitions.items()],
+                [("b", ["1", "3"]), ("a", ["2"]), ("c", ["4"])],
+            )
+
+        self.assertFalse(os.path.exists(directory))
+
+    def test_malformed_block_structure(self):
+        with self.assertRaises(ValueError):
+            list(iter_blocks(io.StringIO("[CONTR] #  1\n  /RESULT/\n")))
+        with self.assertRaises(ValueError):
+            list(iter_blocks(io.StringIO("garbage\n[END]\n")))
+
+        self.assertEqual(list(iter_blocks(io.StringIO("\n[END]\n\n"))), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
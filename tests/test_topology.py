@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import unittest
+from pathlib import Path
+import glob
+import io
+import os
+import sys
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.filters import ContractionFilter
+from gecco_translator.parse import parse, iter_blocks, iter_contractions
+from gecco_translator.topology import (
+    CONNECTED,
+    LINKED,
+    UNLINKED,
+    TopologyStatistics,
+    block_topology,
+    classify,
+    contraction_topology,
+    group_by_topology,
+)
+from gecco_translator.translators import to_tex
+
+
+class TestTopology(unittest.TestCase):
+    def test_classify(self):
+        # Three tensors with one vertex each
+        vertex_tensors = {0: 0, 1: 1, 2: 2}
+
+        chain = classify(
+            3, vertex_tensors, arcs=[(0, 1), (2, 1)], external_vertices=[0]
+        )
+        self.assertEqual(chain.components, [[0, 1, 2]])
+        self.assertEqual(chain.classification, CONNECTED)
+
+        linked = classify(3, vertex_tensors, arcs=[(0, 1)], external_vertices=[1, 2])
+        self.assertEqual(linked.components, [[0, 1], [2]])
+        self.assertEqual(linked.open_components, [True, True])
+        self.assertEqual(linked.classification, LINKED)
+
+        unlinked = classify(3, vertex_tensors, arcs=[(0, 1)], external_vertices=[2])
+        self.assertEqual(unlinked.open_components, [False, True])
+        self.assertEqual(unlinked.classification, UNLINKED)
+
+        # Vertices belonging to the same tensor are always connected
+        super_vertex = classify(
+            2, {0: 0, 1: 1, 2: 0}, arcs=[(2, 1)], external_vertices=[]
+        )
+        self.assertEqual(super_vertex.classification, CONNECTED)
+
+    def test_block_and_contraction_topology_agree(self):
+        for path in sorted(glob.glob(os.path.join(script_dir, "*", "*.EXPORT"))):
+            contents = Path(path).read_text()
+            blocks = list(iter_blocks(io.StringIO(contents)))
+            contractions = parse(contents)
+
+            for block, contraction in zip(blocks, contractions):
+                with self.subTest(file=path, contraction=contraction.id):
+                    self.assertEqual(
+                        block_topology(block), contraction_topology(contraction)
+                    )
+
+    def test_filter(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        contents = Path(path).read_text()
+        groups = group_by_topology(parse(contents))
+        self.assertGreater(len(groups[LINKED]), 0)
+
+        for selection, expected in [
+            ({"connected"}, groups[CONNECTED]),
+            ({"disconnected"}, groups[LINKED] + groups[UNLINKED]),
+        ]:
+            with self.subTest(selection=selection):
+                contraction_filter = ContractionFilter(topologies=selection)
+                selected = list(
+                    iter_contractions(
+                        io.StringIO(contents), contraction_filter=contraction_filter
+                    )
+                )
+                self.assertEqual(selected, expected)
+                self.assertTrue(all(contraction_filter.matches(x) for x in selected))
+
+        statistics = TopologyStatistics()
+        for current in parse(contents):
+            statistics.add_contraction(current)
+        self.assertEqual(
+            statistics.totals(),
+            {key: len(value) for key, value in groups.items()},
+        )
+
+    def test_factorize(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        groups = group_by_topology(parse(Path(path).read_text()))
+
+        # Connected terms are not affected
+        self.assertEqual(
+            to_tex(groups[CONNECTED], factorize=True), to_tex(groups[CONNECTED])
+        )
+
+        for line in to_tex(groups[LINKED], factorize=True).splitlines():
+            self.assertGreaterEqual(line.count(r"\left("), 2)
+            self.assertEqual(line.count(r"\left("), line.count(r"\right)"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import unittest
+from collections import Counter
+from pathlib import Path
+import glob
+import io
+import os
+import sys
+from importlib.util import find_spec
+
+script_dir: str = os.path.dirname(os.path.realpath(__file__))
+
+if find_spec("gecco_translator") is None:
+    sys.path.append(os.path.join(script_dir, "..", "packages"))
+
+from gecco_translator.headers import read_block_header
+from gecco_translator.parse import parse, iter_blocks
+from gecco_translator.serialization import iter_jsonl, to_jsonl
+from gecco_translator.translators.symmetry import determine_required_symmetrizations
+from gecco_translator.workload import WorkloadStatistics
+
+
+class TestWorkload(unittest.TestCase):
+    def test_headers_match_contractions(self):
+        for path in sorted(glob.glob(os.path.join(script_dir, "*", "*.EXPORT"))):
+            with self.subTest(file=path):
+                contents = Path(path).read_text()
+
+                from_headers = WorkloadStatistics()
+                for block in iter_blocks(io.StringIO(contents)):
+                    from_headers.add_header(read_block_header(block))
+
+                from_contractions = WorkloadStatistics()
+                from_contractions.add_all(parse(contents))
+
+                self.assertEqual(from_headers.to_json(), from_contractions.to_json())
+
+    def test_statistics(self):
+        path = os.path.join(script_dir, "multi_reference", "icMRCC_RES2.EXPORT")
+        contractions = parse(Path(path).read_text())
+
+        statistics = WorkloadStatistics(symmetrizers=True)
+        for current in contractions:
+            statistics.add(current)
+            statistics.add_symmetrizations(*determine_required_symmetrizations(current))
+
+        self.assertEqual(statistics.n_terms, len(contractions))
+        self.assertEqual(
+            statistics.n_tensors, sum(len(x.tensors) for x in contractions)
+        )
+        self.assertEqual(
+            statistics.histograms["tensors"],
+            Counter(x.name for c in contractions for x in c.tensors),
+        )
+        for name in ["results", "vertices", "factors"]:
+            with self.subTest(histogram=name):
+                self.assertEqual(
+                    sum(statistics.histograms[name].values()), len(contractions)
+                )
+        for name in ["ranks", "signatures"]:
+            with self.subTest(histogram=name):
+                self.assertEqual(
+                    sum(statistics.histograms[name].values()), statistics.n_tensors
+                )
+        self.assertEqual(statistics.histograms["factors"]["-1/2"], 21)
+        self.assertGreater(statistics.histograms["symmetrizers"][2], 0)
+
+        # Loading a serialized translation yields the same statistics
+        serialized = WorkloadStatistics()
+        serialized.add_all(iter_jsonl(io.StringIO(to_jsonl(contractions))))
+        without_symmetrizers = statistics.to_json()
+        del without_symmetrizers["symmetrizers"]
+        self.assertEqual(serialized.to_json(), without_symmetrizers)
+
+        self.assertIn("Symmetrizer group sizes", statistics.report())
+        self.assertNotIn("Symmetrizer group sizes", serialized.report())
+        self.assertIn("Terms: {}".format(len(contractions)), serialized.report())
+
+
+if __name__ == "__main__":
+    unittest.main()